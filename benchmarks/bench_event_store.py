@@ -0,0 +1,81 @@
+"""Memory of the parsed events: legacy list of dicts vs. ``EventTable``.
+
+All representations are built from the same loaded JSON and measured with
+``tracemalloc`` (retained allocations after the build).  ``EventTable`` also
+stores the argument block, so it is compared both with the legacy dicts
+(trigger/label fields only) and with legacy dicts carrying the same argument
+fields.
+
+Usage:
+    python benchmarks/bench_event_store.py --file data/processed/agentA/tokenized_data_1000.json
+"""
+import argparse
+import gc
+import json
+import sys
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from src.core.event_store import build_table, extract_all_trigger_tokens  # noqa: E402
+
+
+def legacy_events(json_data: dict) -> list:
+    """The per-event dict layout ``parse_events`` produced before ``EventTable``."""
+    return [
+        {
+            "doc_id": doc_id,
+            "event_id": e["id"],
+            "tokens": extract_all_trigger_tokens(e["trigger"]),
+            "type": e["event_type"],
+            "subtype": e["event_subtype"],
+            "modality": e["factuality"]["modality"],
+            "polarity": e["factuality"]["polarity"],
+        }
+        for doc_id, doc in json_data.items()
+        for e in doc["event_mentions"]
+    ]
+
+
+def legacy_events_with_arguments(json_data: dict) -> list:
+    """Legacy dicts plus the argument fields ``EventTable`` keeps."""
+    events = legacy_events(json_data)
+    mentions = (e for doc in json_data.values() for e in doc["event_mentions"])
+    for event, mention in zip(events, mentions):
+        event["arguments"] = [
+            {"text": a["text"], "role": a["role"], "argument_type": a.get("argument_type"),
+             "canonical_coreference": a.get("canonical_coreference")}
+            for a in mention.get("arguments", [])
+        ]
+    return events
+
+
+def retained_bytes(build, json_data) -> tuple:
+    gc.collect()
+    tracemalloc.start()
+    events = build(json_data)
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(events), current
+
+
+def main(path: str):
+    json_data = json.loads(Path(path).read_text(encoding="utf-8"))
+    n_dicts, dict_bytes = retained_bytes(legacy_events, json_data)
+    _, args_bytes = retained_bytes(legacy_events_with_arguments, json_data)
+    n_table, table_bytes = retained_bytes(build_table, json_data)
+    print(f"File: {path}")
+    print(f"list of dicts            : {n_dicts:,} events, {dict_bytes / 1024:,.1f} KiB")
+    print(f"list of dicts + arguments: {n_dicts:,} events, {args_bytes / 1024:,.1f} KiB")
+    print(f"EventTable (+ arguments) : {n_table:,} events, {table_bytes / 1024:,.1f} KiB")
+    print(f"reduction vs dicts + arguments: {args_bytes / table_bytes:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--file", default="data/processed/agentA/tokenized_data_1000.json")
+    args = parser.parse_args()
+    main(args.file)
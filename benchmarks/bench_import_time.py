@@ -0,0 +1,79 @@
+"""Cold-start time of the CLI commands, with a budget for ``update-gold``.
+
+Each command's backend is imported in a fresh interpreter (``python -c``),
+``--repeat`` times; the best wall time (interpreter start + imports) is kept.
+``-X importtime`` is not used for the budget because it slows imports down;
+it is only run once per command to list the slowest top-level modules.
+
+``update-gold`` must stay under ``--budget`` seconds and must not load any of
+``HEAVY_MODULES`` (see ``src/core/gold_update.py``).  The exit code is 1 when
+either check fails.
+
+Usage:
+    python benchmarks/bench_import_time.py --budget 0.15
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+COMMANDS = {
+    "cli": "src.core.cli",
+    "update-gold": "src.core.gold_update",
+    "qc-sample / evaluate": "src.core.qc",
+    "score": "src.core.metrics_v2",
+}
+HEAVY_MODULES = ("numpy", "scipy", "sklearn", "yaml", "tqdm")
+
+
+def _cold_start(module: str) -> dict:
+    code = (f"import sys, json; import {module}; "
+            f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))")
+    start = time.perf_counter()
+    out = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True, cwd=ROOT).stdout
+    return {"seconds": time.perf_counter() - start, "heavy": json.loads(out)}
+
+
+def _slowest_imports(module: str, top: int = 3) -> list:
+    err = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                         check=True, capture_output=True, text=True, cwd=ROOT).stderr
+    rows = []
+    for line in err.splitlines()[1:]:  # "import time: self [us] | cumulative | <indent>name"
+        _, cumulative_us, name = line.split("|")
+        if len(name) - len(name.lstrip()) == 3:  # imported directly by the command module
+            rows.append((int(cumulative_us), name.strip()))
+    return [f"{name} {us / 1000:.0f}ms" for us, name in sorted(rows, reverse=True)[:top]]
+
+
+def main(repeat: int, budget: float) -> int:
+    baseline = min(_cold_start("sys")["seconds"] for _ in range(repeat))
+    print(f"Interpreter start: {baseline * 1000:.0f} ms (best of {repeat})")
+    print(f"{'command':22s} {'cold start':>11s} {'imports':>9s}  heavy modules / slowest imports")
+    failed = False
+    for command, module in COMMANDS.items():
+        runs = [_cold_start(module) for _ in range(repeat)]
+        best = min(r["seconds"] for r in runs)
+        heavy = runs[0]["heavy"]
+        print(f"{command:22s} {best * 1000:9.0f}ms {(best - baseline) * 1000:7.0f}ms  "
+              f"{', '.join(heavy) or '-'} | {', '.join(_slowest_imports(module))}")
+        if command == "update-gold":
+            if best > budget:
+                print(f"   ✗ update-gold cold start {best:.3f}s exceeds the {budget:.3f}s budget")
+                failed = True
+            if heavy:
+                print(f"   ✗ update-gold loads {', '.join(heavy)}")
+                failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per command (best kept)")
+    parser.add_argument("--budget", type=float, default=0.15, help="Cold-start budget of update-gold (seconds)")
+    args = parser.parse_args()
+
+    sys.exit(main(args.repeat, args.budget))
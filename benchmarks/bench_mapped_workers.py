@@ -0,0 +1,100 @@
+"""Worker memory of mapped vs. copied columnar event tables as the worker count grows.
+
+The corpus (``synth_corpus`` layout: gold, system, agentA, agentB) is exported
+once with ``columnar.export_columnar``; then, for each ``--workers`` entry,
+``columnar.mapped_statistics``-style pools score every system with the file
+
+    mmap   mapped read-only by every worker (``open_columnar(mmap=True)``)
+    copy   read into private memory by every worker (``mmap=False``, what
+           unpickling or re-reading a table per worker amounts to)
+
+Each task reports its worker's memory from ``/proc/self/smaps_rollup`` (Linux
+only); the table shows sums over the workers.  PSS splits shared pages between
+the processes that map them, so its sum is the real footprint.  The table
+pages are file-backed with ``mmap`` (``Pss_File``: flat, about one file size
+whatever the worker count) and anonymous with ``copy`` (``Pss_Anon``: one copy
+per worker); the rest of ``Pss_Anon`` is each worker's interpreter, imports and
+per-slice temporaries, which every pool pays in either mode.
+
+Usage:
+    python benchmarks/bench_mapped_workers.py --corpus /tmp/corpus_10000 --workers 1 2 4
+"""
+import argparse
+import multiprocessing as mp
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from src.core import columnar  # noqa: E402
+
+SYSTEMS = ("system", "agentA", "agentB")
+
+
+def _memory_kb() -> dict:
+    values = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            key, _, rest = line.partition(":")
+            if key in ("Rss", "Pss", "Pss_Anon", "Pss_File"):
+                values[key] = int(rest.split()[0])
+    return values
+
+
+def _measured(lo, hi, systems, threshold, matching):
+    columnar._slice_statistics(lo, hi, systems, threshold, matching)
+    return os.getpid(), _memory_kb()
+
+
+def _run(path: str, workers: int, mmap: bool) -> dict:
+    tables = columnar.open_columnar(path)
+    ranges = columnar.doc_ranges(tables, workers * columnar.SLICES_PER_WORKER)
+    systems = [name for name in tables if name != columnar.GOLD]
+    columns = [[lo for lo, _ in ranges], [hi for _, hi in ranges], [systems] * len(ranges),
+               [0.0] * len(ranges), ["id"] * len(ranges)]
+    start = time.perf_counter()
+    with ProcessPoolExecutor(workers, mp_context=mp.get_context("fork"), initializer=columnar._init_worker,
+                             initargs=(path, mmap)) as pool:
+        reports = list(pool.map(_measured, *columns))
+    seconds = time.perf_counter() - start
+    last = {pid: memory for pid, memory in reports}  # final reading of each worker
+    return {"seconds": seconds, "workers_seen": len(last),
+            **{key: sum(m[key] for m in last.values()) / 1024 for key in ("Pss", "Pss_Anon", "Pss_File", "Rss")}}
+
+
+def main(corpus: str, workers_list, cache_dir: str):
+    from src.core.cache import load_events
+
+    gold = load_events(f"{corpus}/gold.json", cache_dir)
+    tables = {columnar.GOLD: gold}
+    tables.update({name: load_events(f"{corpus}/{name}.json", cache_dir).recode(gold.vocabs) for name in SYSTEMS})
+    fd, path = tempfile.mkstemp(suffix=".cols")
+    os.close(fd)
+    try:
+        columnar.export_columnar(tables, path)
+        del tables, gold
+        print(f"Corpus: {corpus} ({os.path.getsize(path) / 2**20:.1f} MB columnar file)")
+        print(f"{'mode':6s} {'workers':>7s} {'time (s)':>9s} {'Σ PSS':>8s} {'Σ PSS anon':>11s} {'Σ PSS file':>11s} "
+              f"{'Σ RSS':>8s}  (MB)")
+        for mode in ("mmap", "copy"):
+            for workers in workers_list:
+                r = _run(path, workers, mode == "mmap")
+                print(f"{mode:6s} {r['workers_seen']:7d} {r['seconds']:9.2f} {r['Pss']:8.1f} {r['Pss_Anon']:11.1f} "
+                      f"{r['Pss_File']:11.1f} {r['Rss']:8.1f}")
+    finally:
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--corpus", required=True, help="Directory with gold/system/agentA/agentB .json")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--cache-dir", default=".cache/events", help="Parsed-event cache directory")
+    args = parser.parse_args()
+
+    main(args.corpus, args.workers, args.cache_dir)
@@ -0,0 +1,88 @@
+"""Peak-RSS benchmark: ``json.load`` + ``parse_events`` vs. streaming ingestion.
+
+Each mode runs in a fresh child process so ``ru_maxrss`` reflects only that
+mode.  ``--repeat N`` writes a temporary file with the input's paragraphs
+repeated N times (pids suffixed) to show how each mode scales with file size.
+
+Usage:
+    python benchmarks/bench_streaming.py \
+        --file data/processed/agentA/tokenized_data_1000.json --repeat 20
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+
+def _child(mode: str, path: str):
+    from src.core.metrics_v2 import parse_events
+    from src.core.streaming import iter_paragraphs
+
+    base_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        if mode == "load":
+            with open(path, "r", encoding="utf-8") as f:
+                events = parse_events(json.load(f))
+        else:
+            events = parse_events(iter_paragraphs(path))
+    elapsed = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({"mode": mode, "events": len(events), "seconds": elapsed,
+                      "peak_rss_mb": peak_kb / 1024, "delta_rss_mb": (peak_kb - base_kb) / 1024}))
+
+
+def _replicate(src: str, repeat: int) -> str:
+    """Write ``src`` repeated ``repeat`` times to a temp file, one paragraph at a time."""
+    from src.core.streaming import iter_paragraphs
+
+    fd, out = tempfile.mkstemp(suffix=".json")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write("{")
+        first = True
+        for r in range(repeat):
+            for pid, para in iter_paragraphs(src):
+                f.write(("" if first else ",") + json.dumps(f"{pid}_r{r}") + ":")
+                json.dump(para, f, indent=2, ensure_ascii=False)
+                first = False
+        f.write("}")
+    return out
+
+
+def main(path: str, repeat: int):
+    target = _replicate(path, repeat) if repeat > 1 else path
+    try:
+        size_mb = os.path.getsize(target) / 2**20
+        print(f"File: {path} x{repeat} ({size_mb:.1f} MB)")
+        print(f"{'mode':8s} {'events':>9s} {'time (s)':>9s} {'peak RSS (MB)':>14s} {'Δ RSS (MB)':>11s}")
+        for mode in ("load", "stream"):
+            out = subprocess.run([sys.executable, __file__, "--child", mode, target],
+                                 check=True, capture_output=True, text=True, cwd=ROOT).stdout
+            r = json.loads(out.strip().splitlines()[-1])
+            print(f"{r['mode']:8s} {r['events']:9,d} {r['seconds']:9.2f} {r['peak_rss_mb']:14.1f} {r['delta_rss_mb']:11.1f}")
+    finally:
+        if target != path:
+            os.unlink(target)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--file", default="data/processed/agentA/tokenized_data_1000.json")
+    parser.add_argument("--repeat", type=int, default=1, help="Replicate the input N times")
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(*args.child)
+    else:
+        main(args.file, args.repeat)
@@ -0,0 +1,173 @@
+"""Time and peak memory per pipeline stage on synthetic corpora, vs. a baseline.
+
+For every ``--sizes`` entry a corpus is generated once with
+``synth_corpus.write_corpus`` (kept under ``--corpus-dir``) and benchmarked in a
+fresh child process.  Stages:
+
+    parse               build_table of gold, system, agentA and agentB
+    mention_mapping     metrics_v2.mention_mapping(gold, system)
+    metrics             metric_kernel.compute_all over the mapping
+    paragraph_kappa     utils.compute_paragraph_kappa(agentA, agentB)
+    agreement           agreement.agreement_kappas([agentA, agentB])
+    per_type_precision  metrics.per_type_precision(system, gold)
+
+Each stage is timed ``--repeat`` times (best wall/CPU time kept) through
+``telemetry.Telemetry``, then run once more under ``tracemalloc`` for its peak
+allocation, so tracing never distorts the timings.
+
+``--save-baseline`` stores the results; later runs compare against it and
+flag a stage whose time or memory grew by more than ``--tolerance`` (and by
+more than ``--min-seconds`` / ``--min-mb``, to ignore noise on tiny stages).
+The exit code is 1 when a regression is flagged.
+
+Usage:
+    python benchmarks/run_benchmarks.py --sizes 1000 10000 --save-baseline
+    python benchmarks/run_benchmarks.py --sizes 1000 10000
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.synth_corpus import write_corpus  # noqa: E402
+
+STAGES = ("parse", "mention_mapping", "metrics", "paragraph_kappa", "agreement", "per_type_precision")
+DEFAULT_BASELINE = ROOT / "benchmarks" / "baseline.json"
+
+
+def _child(corpus: str, repeat: int):
+    from src.core import metric_kernel as kernel
+    from src.core.agreement import agreement_kappas
+    from src.core.event_store import build_table
+    from src.core.metrics import per_type_precision
+    from src.core.metrics_v2 import mention_mapping
+    from src.core.streaming import iter_paragraphs
+    from src.core.telemetry import Telemetry, peak_rss_kb
+    from src.core.utils import compute_paragraph_kappa
+
+    state = {}
+
+    def parse():
+        gold = build_table(iter_paragraphs(f"{corpus}/gold.json"))
+        state.update(gold=gold,
+                     system=build_table(iter_paragraphs(f"{corpus}/system.json"), vocabs=gold.vocabs),
+                     agent_a=build_table(iter_paragraphs(f"{corpus}/agentA.json")),
+                     agent_b=build_table(iter_paragraphs(f"{corpus}/agentB.json")))
+
+    def mapping():
+        state["mapping"] = mention_mapping(state["gold"], state["system"], threshold=0.0)
+
+    def metrics():
+        gold_cols, sys_cols = kernel.encode_attributes(state["gold"], state["system"])
+        kernel.compute_all(gold_cols, sys_cols, kernel.pair_columns(state["mapping"]),
+                           len(state["gold"]), len(state["system"]))
+
+    stages = {
+        "parse": parse,
+        "mention_mapping": mapping,
+        "metrics": metrics,
+        "paragraph_kappa": lambda: compute_paragraph_kappa(state["agent_a"], state["agent_b"]),
+        "agreement": lambda: agreement_kappas([state["agent_a"], state["agent_b"]]),
+        "per_type_precision": lambda: per_type_precision(state["system"], state["gold"]),
+    }
+    result = {}
+    for name in STAGES:
+        timed = Telemetry()
+        for _ in range(repeat):
+            with timed.phase(name):
+                stages[name]()
+        traced = Telemetry(trace_memory=True)
+        with traced.phase(name):
+            stages[name]()
+        result[name] = {"wall_s": min(r["wall_s"] for r in timed.records),
+                        "cpu_s": min(r["cpu_s"] for r in timed.records),
+                        "peak_mb": traced.records[0]["traced_peak_bytes"] / 2**20}
+    result["_process"] = {"peak_rss_mb": (peak_rss_kb() or 0) / 1024, "gold_events": len(state["gold"]),
+                          "system_events": len(state["system"])}
+    print(json.dumps(result))
+
+
+def run(sizes, seed: int, disagreement: float, repeat: int, corpus_dir: Path) -> dict:
+    results = {}
+    for size in sizes:
+        corpus = corpus_dir / f"{size}-s{seed}-d{disagreement}"
+        if not (corpus / "system.json").exists():
+            print(f"Generating {size:,} paragraphs → {corpus}")
+            write_corpus(corpus, size, seed=seed, disagreement=disagreement)
+        out = subprocess.run([sys.executable, __file__, "--child", str(corpus), str(repeat)],
+                             check=True, capture_output=True, text=True, cwd=ROOT).stdout
+        results[str(size)] = json.loads(out.strip().splitlines()[-1])
+    return {
+        "meta": {"python": platform.python_version(), "machine": platform.machine(),
+                 "seed": seed, "disagreement": disagreement, "repeat": repeat},
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float, min_seconds: float, min_mb: float) -> list:
+    """Print current vs. baseline per stage; return the flagged ``(size, stage, metric)``."""
+    flagged = []
+    print(f"{'size':>9s} {'stage':20s} {'time (s)':>10s} {'base':>10s} {'peak (MB)':>10s} {'base':>10s}")
+    for size, stages in current["results"].items():
+        base_stages = baseline.get("results", {}).get(size, {})
+        for stage in STAGES:
+            cur, base = stages[stage], base_stages.get(stage)
+            marks = []
+            if base:
+                if cur["wall_s"] > base["wall_s"] * (1 + tolerance) and cur["wall_s"] - base["wall_s"] > min_seconds:
+                    marks.append("TIME")
+                    flagged.append((size, stage, "wall_s"))
+                if cur["peak_mb"] > base["peak_mb"] * (1 + tolerance) and cur["peak_mb"] - base["peak_mb"] > min_mb:
+                    marks.append("MEMORY")
+                    flagged.append((size, stage, "peak_mb"))
+            base_t = f"{base['wall_s']:10.3f}" if base else f"{'-':>10s}"
+            base_m = f"{base['peak_mb']:10.1f}" if base else f"{'-':>10s}"
+            note = f"  REGRESSION ({', '.join(marks)})" if marks else ""
+            print(f"{int(size):9,d} {stage:20s} {cur['wall_s']:10.3f} {base_t} {cur['peak_mb']:10.1f} {base_m}{note}")
+    return flagged
+
+
+def main(args):
+    current = run(args.sizes, args.seed, args.disagreement, args.repeat, Path(args.corpus_dir))
+    baseline_path = Path(args.baseline)
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8")) if baseline_path.exists() else {}
+    if not baseline:
+        print(f"No baseline at {baseline_path}")
+    flagged = compare(current, baseline, args.tolerance, args.min_seconds, args.min_mb)
+
+    if args.out:
+        Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.out).write_text(json.dumps(current, indent=2), encoding="utf-8")
+    if args.save_baseline:
+        baseline_path.write_text(json.dumps(current, indent=2), encoding="utf-8")
+        print(f"Baseline saved to: {baseline_path}")
+    elif flagged:
+        print(f"{len(flagged)} regression(s) beyond {args.tolerance:.0%} of the baseline")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000], help="Paragraphs per corpus")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--disagreement", type=float, default=0.1)
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per stage (best is kept)")
+    parser.add_argument("--corpus-dir", default=str(ROOT / ".cache" / "synth"))
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE))
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative growth")
+    parser.add_argument("--min-seconds", type=float, default=0.005, help="Ignore smaller time differences")
+    parser.add_argument("--min-mb", type=float, default=1.0, help="Ignore smaller memory differences")
+    parser.add_argument("--out", default=None, help="Also write this run's results as JSON")
+    parser.add_argument("--child", nargs=2, metavar=("CORPUS", "REPEAT"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(args.child[0], int(args.child[1]))
+    else:
+        main(args)
@@ -0,0 +1,211 @@
+"""Seeded synthetic ViFinEE corpora in the ``event_mentions`` schema.
+
+One "truth" paragraph is drawn per pid, then four views are derived from it:
+
+*   ``gold.json``   — the truth itself;
+*   ``agentA.json`` / ``agentB.json`` — independent perturbations at rate
+    ``disagreement`` (dropped or spurious events, changed type / subtype /
+    realis, shifted trigger tokens, changed or dropped argument roles), so
+    paragraph κ and corpus κ vary realistically;
+*   ``system.json`` — another perturbation, plus with probability
+    ``multi_map`` an extra mention sharing a gold ``(doc_id, event_id)`` and
+    overlapping trigger tokens, which exercises the one-gold-to-many mapping.
+
+A fraction ``discontiguous`` of triggers carry ``extra_trigger_spans``.  Label
+inventories and their skew follow the shipped batches; the words are
+synthetic Vietnamese-looking syllables.  Paragraphs are generated and written
+one at a time, so 1M-paragraph corpora need no more memory than 1k ones.
+
+Usage:
+    python benchmarks/synth_corpus.py --paragraphs 100000 --seed 0 --out .cache/synth/100k
+"""
+import argparse
+import json
+import random
+import sys
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+VIEWS = ("gold", "agentA", "agentB", "system")
+PREFIXES = (("taichinhnganhang", 6), ("chungkhoan", 3), ("batdongsan", 1))
+EVENT_TYPES = {
+    "SecurityValue": ("Increase", "Decrease", "Stable", None), "CSR/Brand": (None,),
+    "Macroeconomics": ("Increase", "Decrease", None), "Expense": ("Increase", "Decrease", "Payment"),
+    "Legal": ("Proceeding", "Conviction/Settlement"), "Financing": (None, "Payment"),
+    "Product/Service": ("Launch", None), "Investment": ("Start", None), "Employment": ("Start", "End"),
+    "SalesVolume": ("Increase", "Decrease"), "Deal": (None,), "Dividend": ("Payment", None),
+    "Facility": ("Open", None), "Profit/Loss": ("Increase", "Decrease"), "Merger/Acquisition": (None,),
+    "Rating": (None,), "Revenue": ("Increase", "Decrease"), "FinancialReport": (None,),
+}
+TYPE_WEIGHTS = (1214, 548, 489, 424, 349, 340, 323, 190, 121, 120, 100, 99, 83, 72, 49, 45, 38, 34)
+ROLES = (("TIME", "FILLER", 19), ("Company", "Participant", 14), ("Security", "Participant", 13),
+         ("Amount", "Participant", 6), ("Price", "Participant", 4), ("PLACE", "FILLER", 3),
+         ("ProductService", "Participant", 3), ("Financee", "Participant", 3), ("Sector", "Participant", 3),
+         ("Defendant", "Participant", 3), ("Investor", "Participant", 2), ("Allegation", "FILLER", 1))
+EVENTS_PER_PARAGRAPH = (64, 90, 133, 162, 131, 96, 83, 62, 50, 34, 32, 14, 13, 10, 8)  # P(n events), n = 0..14
+SYLLABLES = ("ngân", "hàng", "cổ", "phiếu", "tăng", "giảm", "lãi", "suất", "vốn", "đầu", "tư", "giá", "thị",
+             "trường", "công", "ty", "lợi", "nhuận", "doanh", "thu", "nợ", "xấu", "phát", "hành", "trái",
+             "khởi", "tố", "bắt", "mua", "bán", "niêm", "yết", "tín", "dụng", "kinh", "tế", "quý", "năm")
+
+
+def _vocabulary(rng: random.Random, size: int = 4000) -> List[str]:
+    words = {"_".join(rng.choice(SYLLABLES) for _ in range(rng.choice((1, 1, 2, 2, 3)))) for _ in range(size * 2)}
+    return sorted(words)[:size]
+
+
+class CorpusGenerator:
+    def __init__(self, seed: int = 0, disagreement: float = 0.1, discontiguous: float = 0.05,
+                 multi_map: float = 0.05):
+        self.rng = random.Random(seed)
+        self.words = _vocabulary(self.rng)
+        self.disagreement = disagreement
+        self.discontiguous = discontiguous
+        self.multi_map = multi_map
+        self.types = list(EVENT_TYPES)
+        self.prefixes = [p for p, _ in PREFIXES]
+        self.prefix_weights = [w for _, w in PREFIXES]
+
+    # ----- Truth -----
+    def _text(self, lo: int, hi: int) -> str:
+        return " ".join(self.rng.choices(self.words, k=self.rng.randint(lo, hi)))
+
+    def _trigger(self) -> Dict:
+        discontiguous = self.rng.random() < self.discontiguous
+        return {"text": self._text(1, 2), "is_discontiguous": discontiguous,
+                "extra_trigger_spans": [self._text(1, 1)] if discontiguous else []}
+
+    def _argument(self) -> Dict:
+        role, argument_type, _ = self.rng.choices(ROLES, weights=[w for *_, w in ROLES])[0]
+        return {"text": self._text(1, 5), "role": role, "argument_type": argument_type,
+                "canonical_coreference": self._text(2, 4) if self.rng.random() < 0.1 else ""}
+
+    def _event(self, eid: str) -> Dict:
+        rng = self.rng
+        event_type = rng.choices(self.types, weights=TYPE_WEIGHTS)[0]
+        return {
+            "id": eid,
+            "event_type": event_type,
+            "event_subtype": rng.choice(EVENT_TYPES[event_type]),
+            "trigger": self._trigger(),
+            "factuality": {"modality": "Certain" if rng.random() < 0.84 else "Other",
+                           "polarity": "Positive" if rng.random() < 0.98 else "Negative"},
+            "arguments": [self._argument() for _ in range(rng.choices((0, 1, 2, 3, 4, 5), (5, 20, 30, 25, 15, 5))[0])],
+            "coreferent_event_triggers": [],
+        }
+
+    def _paragraph(self) -> Dict:
+        n = self.rng.choices(range(len(EVENTS_PER_PARAGRAPH)), weights=EVENTS_PER_PARAGRAPH)[0]
+        events = [self._event(f"e{i + 1}") for i in range(n)]
+        # Coreference: some events join the previous event's cluster
+        clusters: List[List[str]] = []
+        for i, event in enumerate(events):
+            if i and self.rng.random() < 0.3:
+                clusters[-1].append(event["id"])
+            else:
+                clusters.append([event["id"]])
+        for cluster in clusters:
+            for eid in cluster:
+                events[int(eid[1:]) - 1]["coreferent_event_triggers"] = [c for c in cluster if c != eid]
+        return {"event_mentions": events}
+
+    # ----- Views -----
+    def _copy(self, event: Dict) -> Dict:
+        return json.loads(json.dumps(event))
+
+    def _perturb(self, paragraph: Dict, rate: float) -> Dict:
+        rng, out = self.rng, []
+        events = paragraph["event_mentions"]
+        for event in events:
+            if rng.random() >= rate:
+                out.append(event)
+                continue
+            event = self._copy(event)
+            change = rng.randrange(6)
+            if change == 0:
+                continue  # missed event
+            elif change == 1:
+                event["event_type"] = rng.choices(self.types, weights=TYPE_WEIGHTS)[0]
+                event["event_subtype"] = rng.choice(EVENT_TYPES[event["event_type"]])
+            elif change == 2:  # trigger boundary shift: keep one token, add another
+                tokens = event["trigger"]["text"].split()
+                event["trigger"]["text"] = " ".join(tokens[:1] + [rng.choice(self.words)])
+            elif change == 3:
+                event["trigger"] = self._trigger()  # disjoint trigger, Dice usually 0
+            elif change == 4:
+                factuality = event["factuality"]
+                if rng.random() < 0.7:
+                    factuality["modality"] = "Other" if factuality["modality"] == "Certain" else "Certain"
+                else:
+                    factuality["polarity"] = "Negative" if factuality["polarity"] == "Positive" else "Positive"
+            elif event["arguments"]:
+                args = event["arguments"]
+                if rng.random() < 0.5:
+                    args.pop(rng.randrange(len(args)))
+                else:
+                    args[rng.randrange(len(args))]["role"] = rng.choices(ROLES, weights=[w for *_, w in ROLES])[0][0]
+            out.append(event)
+        if rng.random() < rate:  # spurious event
+            out.append(self._event(f"e{len(events) + 1}"))
+        return {"event_mentions": out}
+
+    def _system(self, paragraph: Dict) -> Dict:
+        system = self._perturb(paragraph, self.disagreement)
+        extra = []
+        for event in system["event_mentions"]:
+            if self.rng.random() < self.multi_map:
+                dup = self._copy(event)
+                dup["trigger"]["text"] = " ".join(event["trigger"]["text"].split()[:1] + [self.rng.choice(self.words)])
+                extra.append(dup)
+        system["event_mentions"].extend(extra)
+        return system
+
+    def paragraphs(self, n: int) -> Iterator[Tuple[str, Dict[str, Dict]]]:
+        """Yield ``(pid, {view: paragraph})`` for ``n`` paragraphs."""
+        for i in range(n):
+            pid = f"{self.rng.choices(self.prefixes, weights=self.prefix_weights)[0]}_{i}"
+            truth = self._paragraph()
+            yield pid, {"gold": truth,
+                        "agentA": self._perturb(truth, self.disagreement),
+                        "agentB": self._perturb(truth, self.disagreement),
+                        "system": self._system(truth)}
+
+
+def write_corpus(out_dir, n: int, seed: int = 0, disagreement: float = 0.1, discontiguous: float = 0.05,
+                 multi_map: float = 0.05) -> Dict[str, Path]:
+    """Write ``<out_dir>/{gold,agentA,agentB,system}.json``; returns the paths."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    paths = {view: out_dir / f"{view}.json" for view in VIEWS}
+    files = {view: open(fp, "w", encoding="utf-8") for view, fp in paths.items()}
+    try:
+        for f in files.values():
+            f.write("{")
+        gen = CorpusGenerator(seed, disagreement, discontiguous, multi_map)
+        for i, (pid, views) in enumerate(gen.paragraphs(n)):
+            key = ("," if i else "") + json.dumps(pid) + ":"
+            for view, f in files.items():
+                f.write(key + json.dumps(views[view], ensure_ascii=False))
+        for f in files.values():
+            f.write("}")
+    finally:
+        for f in files.values():
+            f.close()
+    return paths
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--paragraphs", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--disagreement", type=float, default=0.1, help="Per-event perturbation rate")
+    parser.add_argument("--discontiguous", type=float, default=0.05, help="Share of discontiguous triggers")
+    parser.add_argument("--multi-map", type=float, default=0.05, help="Share of system events duplicated")
+    parser.add_argument("--out", default=".cache/synth/corpus")
+    args = parser.parse_args()
+
+    written = write_corpus(args.out, args.paragraphs, args.seed, args.disagreement, args.discontiguous, args.multi_map)
+    for view, fp in written.items():
+        print(f"{view:7s} {fp} ({fp.stat().st_size / 2**20:.1f} MB)")
@@ -0,0 +1,7 @@
+import sys
+from src.core.significance import compare_systems  # noqa: F401  (kept importable from here)
+
+if __name__ == "__main__":
+    # Same flags as `python -m src compare-systems`
+    from src.core.cli import main as cli
+    cli(["compare-systems", *sys.argv[1:]])
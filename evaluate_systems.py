@@ -0,0 +1,7 @@
+import sys
+from src.core.multi_eval import evaluate_systems  # noqa: F401  (kept importable from here)
+
+if __name__ == "__main__":
+    # Same flags as `python -m src evaluate-systems`
+    from src.core.cli import main as cli
+    cli(["evaluate-systems", *sys.argv[1:]])
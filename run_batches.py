@@ -0,0 +1,7 @@
+import sys
+from src.core.runner import run_batches  # noqa: F401  (kept importable from here)
+
+if __name__ == "__main__":
+    # Same flags as `python -m src run-batches`
+    from src.core.cli import main as cli
+    cli(["run-batches", *sys.argv[1:]])
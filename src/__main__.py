@@ -0,0 +1,4 @@
+"""``python -m src <command>``: see ``src/core/cli.py``."""
+from src.core.cli import main
+
+main()
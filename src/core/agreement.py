@@ -0,0 +1,137 @@
+#src/core/agreement.py
+# -------------------------------------------------------------
+"""Corpus-level inter-annotator agreement on integer-coded label matrices.
+
+Each annotator's ``EventTable`` is reduced to *items* and *labels*:
+
+*   trigger units: item = ``(paragraph, trigger.lower())``,
+    label = ``event_type``;
+*   argument units: item = ``(paragraph, trigger.lower(), argument.lower())``,
+    label = ``role``.
+
+Items are the union over annotators, restricted to paragraphs every annotator
+saw; an annotator who did not mark an item gives it label ``0`` (NONE), real
+labels are ``1..K``.  The result is an ``(n_items, n_annotators)`` int matrix,
+built with ``np.unique`` / ``searchsorted`` only — no per-item Python loop.
+
+*   2 annotators → Cohen's κ from a ``bincount`` contingency table;
+*   3+ annotators → Fleiss' κ from per-item category counts.
+"""
+from __future__ import annotations
+
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.core.event_store import EventTable, Vocab, lookup_table
+
+UNITS = ("trigger", "argument")
+
+
+def cohen_kappa(matrix: np.ndarray, n_categories: int) -> float:
+    """Cohen's κ of a two-column label matrix."""
+    if len(matrix) == 0:
+        return float("nan")
+    k = max(n_categories, 1)
+    table = np.bincount(matrix[:, 0] * k + matrix[:, 1], minlength=k * k).reshape(k, k)
+    n = table.sum()
+    p_o = np.trace(table) / n
+    p_e = float(table.sum(axis=1) @ table.sum(axis=0)) / (n * n)
+    if p_e == 1.0:  # both annotators used a single, identical category
+        return 1.0 if p_o == 1.0 else 0.0
+    return float((p_o - p_e) / (1.0 - p_e))
+
+
+def fleiss_kappa(matrix: np.ndarray, n_categories: int) -> float:
+    """Fleiss' κ of an ``(n_items, n_raters)`` label matrix."""
+    n_items, n_raters = matrix.shape
+    if n_items == 0 or n_raters < 2:
+        return float("nan")
+    k = max(n_categories, 1)
+    rows = np.repeat(np.arange(n_items), n_raters)
+    counts = np.bincount(rows * k + matrix.ravel(), minlength=n_items * k).reshape(n_items, k)
+    p_item = ((counts * counts).sum(axis=1) - n_raters) / (n_raters * (n_raters - 1))
+    p_cat = counts.sum(axis=0) / (n_items * n_raters)
+    p_bar, p_e = p_item.mean(), float(p_cat @ p_cat)
+    if p_e == 1.0:
+        return 1.0 if p_bar == 1.0 else 0.0
+    return float((p_bar - p_e) / (1.0 - p_e))
+
+
+def _dense(*columns: np.ndarray) -> np.ndarray:
+    """Collision-free int64 key of several code columns (re-densified after each step)."""
+    key = np.zeros(len(columns[0]), dtype=np.int64)
+    for col in columns:
+        width = np.int64(int(col.max()) + 1 if len(col) else 1)
+        _, key = np.unique(key * width + col, return_inverse=True)
+        key = key.astype(np.int64).ravel()
+    return key
+
+
+def _lower(s: Optional[str]) -> Optional[str]:
+    return None if s is None else s.lower()  # an argument without "text" stays None
+
+
+def label_matrix(tables: Sequence[EventTable], unit: str = "trigger") -> Tuple[np.ndarray, int]:
+    """``(matrix, n_categories)`` for ``unit`` in ``UNITS``; category 0 = NONE."""
+    if unit not in UNITS:
+        raise ValueError(f"unknown unit {unit!r}, expected one of {UNITS}")
+
+    # One shared code space per key field, without touching the tables' vocabs.
+    docs, triggers, labels, args = Vocab(), Vocab(), Vocab(), Vocab()
+    label_field = "type" if unit == "trigger" else "role"
+    per_table = []
+    for t in tables:
+        doc = lookup_table(t.vocabs["doc_id"], docs)[t.columns["doc_id"]]
+        trig = lookup_table(t.vocabs["trigger"], triggers, str.lower)[t.columns["trigger"]]
+        if unit == "trigger":
+            cols = [doc, trig]
+            label = lookup_table(t.vocabs["type"], labels)[t.columns["type"]]
+        else:
+            owner = t.event_of_arg()
+            arg = lookup_table(t.vocabs["arg_text"], args, _lower)[t.arg_columns["arg_text"]]
+            cols = [doc[owner], trig[owner], arg]
+            label = lookup_table(t.vocabs[label_field], labels)[t.arg_columns[label_field]]
+        present = lookup_table(t.vocabs["doc_id"], docs)[t.doc_codes]
+        per_table.append((cols, label, present))
+
+    # Paragraphs seen by every annotator.
+    shared = per_table[0][2]
+    for _, _, present in per_table[1:]:
+        shared = np.intersect1d(shared, present)
+
+    # Item keys computed jointly so equal items get equal keys across annotators.
+    sizes = [len(label) for _, label, _ in per_table]
+    stacked = [np.concatenate([cols[i] for cols, _, _ in per_table]).astype(np.int64)
+               for i in range(len(per_table[0][0]))]
+    all_keys = _dense(*stacked) if stacked[0].size else np.zeros(0, dtype=np.int64)
+    bounds = np.cumsum([0] + sizes)
+
+    keyed = []
+    for j, (cols, label, _) in enumerate(per_table):
+        keys = all_keys[bounds[j]:bounds[j + 1]]
+        keep = np.isin(cols[0], shared)
+        keys, first = np.unique(keys[keep], return_index=True)  # first occurrence wins
+        keyed.append((keys, label[keep][first].astype(np.int64) + 1))
+
+    items = np.unique(np.concatenate([k for k, _ in keyed])) if keyed else np.zeros(0, np.int64)
+    matrix = np.zeros((len(items), len(tables)), dtype=np.int64)
+    for j, (keys, label) in enumerate(keyed):
+        matrix[np.searchsorted(items, keys), j] = label
+    return matrix, len(labels) + 1
+
+
+def agreement_kappas(tables: Sequence[EventTable]) -> Dict[str, object]:
+    """Trigger and argument κ across ``tables`` (Cohen for two annotators, Fleiss for more)."""
+    if len(tables) < 2:
+        raise ValueError("agreement needs at least two annotators")
+    kappa = cohen_kappa if len(tables) == 2 else fleiss_kappa
+    result: Dict[str, object] = {"kappa_method": "cohen" if len(tables) == 2 else "fleiss",
+                                 "n_annotators": len(tables)}
+    for unit, name in (("trigger", "trigger_kappa"), ("argument", "arg_kappa")):
+        matrix, n_categories = label_matrix(tables, unit)
+        value = kappa(matrix, n_categories)
+        result[name] = None if np.isnan(value) else value
+        result[f"n_{unit}_items"] = int(len(matrix))
+    return result
+
@@ -0,0 +1,108 @@
+#src/core/cache.py
+# -------------------------------------------------------------
+"""On-disk cache of parsed ``EventTable``s.
+
+The same gold file is evaluated against many system files, and every run used
+to re-parse it from JSON.  ``load_events(path)`` stores the parsed table as a
+flat binary file (``event_store.write_arrays``: a JSON header followed by
+64-byte aligned raw NumPy buffers, no pickle) under
+
+    <cache_dir>/<sha256 of file content>-v<PARSER_VERSION>.evt
+
+(for a sharded ``.shards`` directory, the hash of its shards in manifest order)
+
+Loading is a single read plus ``np.frombuffer`` views, with no JSON decoding.
+
+*   editing the source file changes its hash → a new entry is built;
+*   bumping ``PARSER_VERSION`` (any change to ``EventTable`` layout or to
+    ``build_table`` semantics) orphans every old entry; orphans are removed on
+    the next write, together with the least recently used entries beyond
+    ``MAX_ENTRIES``.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+from pathlib import Path
+from typing import Optional, Union
+
+from src.core.event_store import EventTable, build_table, from_arrays, read_arrays, to_arrays, write_arrays
+from src.core.gold_store import atomic_write
+from src.core.shards import build_sharded_table, is_sharded, shard_files
+from src.core.streaming import iter_paragraphs
+
+LOGGER = logging.getLogger(__name__)
+
+PARSER_VERSION = 3
+DEFAULT_CACHE_DIR = ".cache/events"
+MAX_ENTRIES = 256
+
+
+def file_digest(path: Union[str, Path], chunk_size: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    for fp in shard_files(path) if is_sharded(path) else [path]:
+        with open(fp, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                h.update(chunk)
+    return h.hexdigest()
+
+
+def cache_path(path: Union[str, Path], cache_dir: Union[str, Path] = DEFAULT_CACHE_DIR) -> Path:
+    return Path(cache_dir) / f"{file_digest(path)}-v{PARSER_VERSION}.evt"
+
+
+def load_events(path: Union[str, Path], cache_dir: Optional[Union[str, Path]] = DEFAULT_CACHE_DIR) -> EventTable:
+    """Return the ``EventTable`` of a ``{pid: {event_mentions: [...]}}`` file.
+
+    ``cache_dir=None`` disables the cache (always parse).
+    """
+    if cache_dir is None:
+        return _build(path)
+
+    fp = cache_path(path, cache_dir)
+    if fp.exists():
+        try:
+            table = from_arrays(read_arrays(fp))
+            os.utime(fp)  # LRU bookkeeping
+            LOGGER.debug("Event cache hit for %s → %s", path, fp)
+            return table
+        except (OSError, ValueError, KeyError) as exc:
+            LOGGER.warning("Ignoring unreadable event cache %s (%s)", fp, exc)
+
+    table = _build(path)
+    _write(table, fp)
+    LOGGER.debug("Event cache miss for %s → wrote %s", path, fp)
+    return table
+
+
+def _build(path: Union[str, Path]) -> EventTable:
+    if is_sharded(path):
+        return build_sharded_table(path)  # one shard per worker process
+    return build_table(iter_paragraphs(str(path)))
+
+
+def _write(table: EventTable, fp: Path):
+    # atomic: concurrent readers never see a partial file; no fsync, an entry can always be rebuilt
+    atomic_write(fp, lambda f: write_arrays(f, to_arrays(table)), fsync=False)
+    prune(fp.parent)
+
+
+def _mtime(entry: Path) -> float:
+    try:
+        return entry.stat().st_mtime
+    except OSError:  # removed concurrently
+        return 0.0
+
+
+def prune(cache_dir: Union[str, Path], max_entries: int = MAX_ENTRIES):
+    """Drop entries from other parser versions and the least recently used beyond ``max_entries``."""
+    current = []
+    for entry in Path(cache_dir).glob("*.evt"):
+        if entry.name.endswith(f"-v{PARSER_VERSION}.evt"):
+            current.append(entry)
+        else:
+            entry.unlink(missing_ok=True)
+    current.sort(key=_mtime, reverse=True)
+    for entry in current[max_entries:]:
+        entry.unlink(missing_ok=True)
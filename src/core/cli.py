@@ -0,0 +1,389 @@
+#src/core/cli.py
+# -------------------------------------------------------------
+"""Single entry point for the pipeline: ``python -m src <command> ...``.
+
+    qc-sample         lowest-κ paragraphs of a batch for human QC   (prepare_QC_samples.py)
+    update-gold       merge a QC'd sample into the gold set          (update_gold_from_human.py)
+    evaluate          agreement + QA gates of a reviewed batch       (evaluate_batch.py)
+    run-batches       evaluate many batches in parallel              (run_batches.py)
+    score             metrics_v2 scores of a system file vs. gold (``--errors``: error analysis)
+    evaluate-systems  several system files against one gold file     (evaluate_systems.py)
+    compare-systems   bootstrap CIs and significance tests           (compare_systems.py)
+    incremental       re-score only the paragraphs that changed
+    gold              versions of the gold set: log, diff, checkout
+    shards            split / join sharded NDJSON files
+    columnar          export / score memory-mapped columnar tables
+    serve             local evaluation service with a warm gold set
+
+Only ``argparse`` is imported up front; each command imports its backend
+when it runs, so ``update-gold`` never loads NumPy and ``--help`` is instant.
+The root scripts are thin wrappers around the same commands.
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+from pathlib import Path
+from typing import List, Optional
+
+
+def _qc_sample(args):
+    from src.core.qc import prepare_qc_sample
+
+    selected_pids, qc_outfile = prepare_qc_sample(args.batch, args.config, mode=args.mode, strata=args.strata)
+    print(f"Selected {len(selected_pids)} worst-agreement samples for Human QC ({args.mode})")
+    print(f"QC file saved to: {qc_outfile}")
+
+
+def _update_gold(args):
+    from src.core.gold_update import GoldFileChanged, update_gold
+
+    try:
+        done = update_gold(args.qc_file, args.gold_file, args.store, export=not args.no_export, compact=args.compact,
+                           message=args.message or Path(args.qc_file).name, reseed_from_gold=args.reseed)
+    except GoldFileChanged as exc:
+        raise SystemExit(f"❌ {exc}") from None
+    if done["seeded"] is not None:
+        print(f"Khởi tạo gold store từ {args.gold_file} ({done['seeded']} đoạn).")
+    if done["reseeded"] is not None:
+        print(f"Nhập lại {args.gold_file} đã sửa tay vào gold store ({done['reseeded']} đoạn thay đổi).")
+    print(f"Cập nhật {done['updated']} đoạn vào gold set.")
+    print(f"Gold store: {done['store']} ({done['paragraphs']} đoạn)")
+    if done["gold"]:
+        print(f"Đã lưu tại: {done['gold']}")
+    print(f"Phiên bản gold: {done['version'][:12]} (#{done['versions']})")
+
+
+def _evaluate(args):
+    from src.core.qc import review_batch
+
+    done = review_batch(args.review, args.config, args.batch, gold_version=args.gold_version)
+    if done["qa_failures"]:
+        print(f"Batch '{args.batch}' failed QA: {'; '.join(done['qa_failures'])}")
+    else:
+        print(f"Batch '{args.batch}' passed QA.")
+    if done["error_paths"]:
+        print(f"Error analysis saved to: {', '.join(done['error_paths'])}")
+
+
+def _run_batches(args):
+    from src.core.runner import run_batches
+    from src.core.utils import load_config, save_json
+
+    report = run_batches(args.batches, load_config(args.config), workers=args.workers, qc_mode=args.mode,
+                         strata=args.strata)
+    save_json(report, args.out)
+    for tag, batch in report["batches"].items():
+        if "error" in batch:
+            print(f"Batch '{tag}' error: {batch['error']}")
+        elif batch["passed"]:
+            print(f"Batch '{tag}' passed QA ({batch['seconds']['total']:.2f}s).")
+        else:
+            print(f"Batch '{tag}' failed QA: {'; '.join(batch['qa_failures'])} ({batch['seconds']['total']:.2f}s)")
+    print(f"{len(report['batches'])} batches in {report['total_seconds']:.2f}s with {report['workers']} workers")
+    print(f"Report saved to: {args.out}")
+
+
+def _score(args):
+    from src.core.metrics_v2 import evaluate, print_results
+    from src.core.telemetry import ConsoleSink, Telemetry
+    from src.core.utils import save_json
+
+    results = evaluate(args.gold, args.system, threshold=args.threshold, stream=args.stream,
+                       cache_dir=None if args.no_cache else args.cache_dir, telemetry=Telemetry(ConsoleSink()),
+                       arguments=args.arguments, coreference=args.coreference, matching=args.matching,
+                       errors=args.errors, gold_version=args.gold_version, positions=args.positions)
+    print_results(results)
+    if args.errors:
+        from src.core.error_analysis import write_error_report
+
+        paths = write_error_report(results.pop("Errors"), args.reports_dir, Path(args.system).stem)
+        print(f"Error analysis saved to: {', '.join(paths)}")
+    if args.out:
+        save_json(results, args.out)
+        print(f"Results saved to: {args.out}")
+
+
+def _cache_dir(args) -> str:
+    """``paths.cache_root`` of ``--config``, where compute_agreement and the runner keep the event cache."""
+    from src.core.cache import DEFAULT_CACHE_DIR
+    from src.core.utils import load_config
+
+    return load_config(args.config).get("paths", {}).get("cache_root", DEFAULT_CACHE_DIR)
+
+
+def _evaluate_systems(args):
+    from src.core.multi_eval import evaluate_systems, print_comparison
+    from src.core.telemetry import LoggingSink, Telemetry
+    from src.core.utils import save_json
+
+    report = evaluate_systems(args.gold, args.systems, threshold=args.threshold, workers=args.workers,
+                              cache_dir=_cache_dir(args), arguments=args.arguments, coreference=args.coreference,
+                              telemetry=Telemetry(LoggingSink()), matching=args.matching)
+    save_json(report, args.out)
+    print_comparison(report)
+    print(f"{len(report['systems'])} systems in {report['total_seconds']:.2f}s with {report['workers']} workers")
+    print(f"Report saved to: {args.out}")
+
+
+def _compare_systems(args):
+    from src.core.cache import load_events
+    from src.core.multi_eval import system_names
+    from src.core.significance import METRICS, compare_systems
+    from src.core.telemetry import LoggingSink, Telemetry
+    from src.core.utils import save_json
+
+    cache_dir = _cache_dir(args)
+    gold = load_events(args.gold, cache_dir)
+    systems = {name: load_events(path, cache_dir) for name, path in zip(system_names(args.systems), args.systems)}
+    report = compare_systems(gold, systems, n_resamples=args.resamples, confidence=args.confidence, seed=args.seed,
+                             workers=args.workers, telemetry=Telemetry(LoggingSink()))
+    report["gold"] = args.gold
+    report["system_files"] = dict(zip(systems, args.systems))
+    save_json(report, args.out)
+
+    for pair, comparison in report["comparisons"].items():
+        print(f"\n📊 {pair} ({report['n_documents']:,} documents, {args.resamples:,} resamples, "
+              f"{args.confidence:.0%} CI)")
+        print(f"   {'Metric':20s} {'Δ':>6s} {'CI':>15s} {'p boot':>8s} {'p AR':>8s}")
+        for metric in METRICS:
+            c = comparison[metric]
+            mark = " *" if max(c["p_bootstrap"], c["p_randomization"]) < 1 - args.confidence else ""
+            print(f"   {metric:20s} {c['delta']:6.1f} [{c['low']:6.1f}, {c['high']:6.1f}] "
+                  f"{c['p_bootstrap']:8.4f} {c['p_randomization']:8.4f}{mark}")
+    print(f"\nReport saved to: {args.out}")
+
+
+def _incremental(args):
+    from src.core.incremental import evaluate_incremental
+    from src.core.metrics_v2 import print_results
+    from src.core.telemetry import ConsoleSink, Telemetry
+
+    print_results(evaluate_incremental(args.gold, args.system, args.store, args.threshold,
+                                       telemetry=Telemetry(ConsoleSink())))
+
+
+def _gold(args):
+    from src.core.gold_versions import versions_for
+
+    versions = versions_for(args.gold_file, args.store)
+    if args.action == "log":
+        print(f"{'#':>3s}  {'version':12s}  {'created':19s}  {'changed':>7s}  {'deleted':>7s}  {'paragraphs':>10s}  message")
+        for number, record in enumerate(versions.history, start=1):
+            print(f"{number:3d}  {record['version'][:12]}  {record['created']:19s}  {len(record['changed']):7d}  "
+                  f"{len(record['deleted']):7d}  {record['paragraphs']:10d}  {record['message']}")
+    elif args.action == "diff":
+        diff = versions.diff(args.old, args.new)
+        paragraphs, events = diff["paragraphs"], diff["events"]
+        print(f"Gold {diff['from'][:12]} → {diff['to'][:12]}")
+        print(f"   Paragraphs: +{len(paragraphs['added'])} -{len(paragraphs['removed'])} "
+              f"~{paragraphs['changed']} (unchanged {paragraphs['unchanged']})")
+        print(f"   Events    : +{events['added']} -{events['removed']} ~{events['changed']}")
+        for attr, n in diff["attributes"].items():
+            print(f"      {attr:14s}: {n}")
+        if args.out:
+            from src.core.utils import save_json
+
+            save_json(diff, args.out)
+            print(f"Diff saved to: {args.out}")
+    else:
+        from src.core.utils import save_json
+
+        save_json(versions.load(args.version), args.out)
+        print(f"Gold {versions.version_id(args.version)[:12]} saved to: {args.out}")
+
+
+def _shards(args):
+    from src.core.shards import SHARD_SUFFIX, join, read_manifest, split
+
+    if args.action == "split":
+        target = args.target or Path(args.source).with_suffix(SHARD_SUFFIX)
+        manifest = split(args.source, target, n_shards=args.shards, workers=args.workers)
+        print(f"{manifest['paragraphs']} paragraphs -> {len(manifest['shards'])} shards in {target}")
+    else:
+        target = args.target or Path(args.source).with_suffix(".json")
+        join(args.source, target)
+        print(f"{read_manifest(args.source)['paragraphs']} paragraphs -> {target}")
+
+
+def _columnar(args):
+    from src.core.columnar import GOLD, export_columnar, score_mapped
+
+    if args.action == "export":
+        from src.core.cache import load_events
+        from src.core.multi_eval import system_names
+
+        cache_dir = _cache_dir(args)
+        gold = load_events(args.gold, cache_dir)
+        tables = {GOLD: gold}
+        for name, fp in zip(system_names(args.systems), args.systems):
+            tables[name] = load_events(fp, cache_dir).recode(gold.vocabs)
+        out = export_columnar(tables, args.out)
+        print(f"Exported {', '.join(tables)} ({out.stat().st_size / 2**20:.1f} MB) to {out}")
+    else:
+        import json
+
+        print(json.dumps(score_mapped(args.path, workers=args.workers, threshold=args.threshold,
+                                      matching=args.matching), indent=2, ensure_ascii=False))
+
+
+def _serve(args):
+    from src.core.service import serve
+
+    serve(args.config, args.gold, args.host, args.port)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m src", description="Post-annotation QC and evaluation pipeline.")
+    sub = parser.add_subparsers(dest="command", required=True, metavar="command")
+
+    p = sub.add_parser("qc-sample", help="Select the lowest-agreement paragraphs of a batch for human QC")
+    p.add_argument("--batch", required=True, help="Batch tag (e.g. tokenized_data_500)")
+    p.add_argument("--config", default="config/pipeline.yaml", help="Path to config.yaml")
+    p.add_argument("--mode", choices=["worst", "stratified"], default="worst",
+                   help="worst: lowest kappa overall; stratified: lowest kappa per stratum")
+    p.add_argument("--strata", choices=["event_type", "prefix"], default="event_type",
+                   help="Stratum key for --mode stratified (dominant event_type or pid source prefix)")
+    p.set_defaults(run=_qc_sample)
+
+    p = sub.add_parser("update-gold", help="Cập nhật master.json từ mẫu đã human QC")
+    p.add_argument("--qc_file", required=True, help="Đường dẫn tới file QC đã sửa (json).")
+    p.add_argument("--gold_file", required=True, help="Đường dẫn tới master.json.")
+    p.add_argument("--store", default=None, help="Thư mục gold store (mặc định: <thư mục gold_file>/store).")
+    p.add_argument("--no-export", action="store_true", help="Chỉ cập nhật gold store, không ghi lại master.json.")
+    p.add_argument("--compact", action="store_true", help="Nén log của gold store sau khi cập nhật.")
+    p.add_argument("--message", default=None, help="Ghi chú cho phiên bản gold mới (mặc định: tên file QC).")
+    p.add_argument("--reseed", action="store_true",
+                   help="master.json đã bị sửa ngoài update-gold: nhập lại nó vào gold store trước khi cập nhật.")
+    p.set_defaults(run=_update_gold)
+
+    p = sub.add_parser("evaluate", help="Agreement and QA gates of a reviewed batch")
+    p.add_argument("--review", required=True, help="Path to reviewed Agent B JSON (or .shards directory)")
+    p.add_argument("--config", default="config/pipeline.yaml", help="Path to config file (YAML or JSON)")
+    p.add_argument("--batch", required=True, help="Batch tag (e.g., tokenized_data_500)")
+    p.add_argument("--gold-version", default=None, help="Gold version to check against (latest, number or hash prefix)")
+    p.set_defaults(run=_evaluate, log=True)
+
+    p = sub.add_parser("run-batches", help="Evaluate many batches in parallel with a shared gold set")
+    p.add_argument("--batches", required=True, help="Glob of batch tags (e.g. 'tokenized_data_*')")
+    p.add_argument("--config", default="config/pipeline.yaml", help="Path to config file (YAML or JSON)")
+    p.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    p.add_argument("--mode", choices=["worst", "stratified"], default="worst",
+                   help="QC selection, as in qc-sample: lowest kappa overall or per stratum")
+    p.add_argument("--strata", choices=["event_type", "prefix"], default="event_type",
+                   help="Stratum key for --mode stratified (dominant event_type or pid source prefix)")
+    p.add_argument("--out", default="reports/batches_report.json", help="Consolidated report path")
+    p.set_defaults(run=_run_batches, log=True)
+
+    p = sub.add_parser("score", help="metrics_v2 span / attribute / combined scores of a system file")
+    p.add_argument("--gold", default="data/gold/master.json", help="Gold file")
+    p.add_argument("--system", required=True, help="System / reviewed file")
+    p.add_argument("--gold-version", default=None, help="Score against this gold version (latest, number or hash prefix)")
+    p.add_argument("--threshold", type=float, default=0.0, help="Minimum Dice for a mapped pair")
+    # Literals rather than matching.MATCHING_MODES / cache.DEFAULT_CACHE_DIR: importing those loads NumPy
+    p.add_argument("--matching", choices=["id", "overlap"], default="id",
+                   help="Map events by (doc_id, event_id) or by trigger overlap within the document")
+    p.add_argument("--positions", action="store_true",
+                   help="Score triggers by token positions where both files carry offsets or paragraph text")
+    p.add_argument("--arguments", action="store_true", help="Also score arguments")
+    p.add_argument("--coreference", action="store_true", help="Also score event coreference")
+    p.add_argument("--stream", action="store_true", help="Read the files paragraph by paragraph (no cache)")
+    p.add_argument("--cache-dir", default=".cache/events", help="Parsed-event cache directory")
+    p.add_argument("--no-cache", action="store_true", help="Always re-parse the files")
+    p.add_argument("--errors", action="store_true",
+                   help="Also write confusion matrices and worst documents (<system>_errors.json / _confusion.csv)")
+    p.add_argument("--reports-dir", default="reports", help="Directory of the --errors report")
+    p.add_argument("--out", default=None, help="Also save the results as JSON")
+    p.set_defaults(run=_score)
+
+    p = sub.add_parser("evaluate-systems", help="Evaluate several system files against one gold file in one pass")
+    p.add_argument("--gold", default="data/gold/master.json", help="Gold file")
+    p.add_argument("--systems", nargs="+", required=True, help="System / annotator files")
+    p.add_argument("--threshold", type=float, default=0.0, help="Minimum Dice for a mapped pair")
+    p.add_argument("--matching", choices=["id", "overlap"], default="id",
+                   help="Map events by (doc_id, event_id) or by trigger overlap within the document")
+    p.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    p.add_argument("--arguments", action="store_true", help="Also score arguments")
+    p.add_argument("--coreference", action="store_true", help="Also score event coreference")
+    p.add_argument("--config", default="config/pipeline.yaml", help="Config file (paths.cache_root: event cache)")
+    p.add_argument("--out", default="reports/systems_report.json", help="Report path")
+    p.set_defaults(run=_evaluate_systems, log=True)
+
+    p = sub.add_parser("compare-systems", help="Bootstrap CIs and paired significance tests between systems")
+    p.add_argument("--gold", default="data/gold/master.json", help="Gold file")
+    p.add_argument("--systems", nargs="+", required=True, help="System / annotator files to compare")
+    p.add_argument("--resamples", type=int, default=1000, help="Bootstrap and randomization rounds")
+    p.add_argument("--confidence", type=float, default=0.95, help="Confidence level of the intervals")
+    p.add_argument("--seed", type=int, default=0, help="Seed (results do not depend on --workers)")
+    p.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    p.add_argument("--config", default="config/pipeline.yaml", help="Config file (paths.cache_root: event cache)")
+    p.add_argument("--out", default="reports/significance_report.json", help="Report path")
+    p.set_defaults(run=_compare_systems, log=True)
+
+    p = sub.add_parser("incremental", help="Re-evaluate a system against gold, recomputing only changed paragraphs")
+    p.add_argument("--gold", default="data/gold/master.json", help="Gold file")
+    p.add_argument("--system", required=True, help="System / reviewed file")
+    p.add_argument("--store", required=True, help="Directory of the per-paragraph statistics store")
+    p.add_argument("--threshold", type=float, default=0.0, help="Minimum Dice for a mapped pair")
+    p.set_defaults(run=_incremental)
+
+    p = sub.add_parser("gold", help="Versions of the gold set recorded by update-gold")
+    p.add_argument("--gold_file", default="data/gold/master.json", help="Gold file whose store holds the versions")
+    p.add_argument("--store", default=None, help="Gold store directory (default: <gold_file dir>/store)")
+    actions = p.add_subparsers(dest="action", required=True, metavar="action")
+    actions.add_parser("log", help="List the versions")
+    a = actions.add_parser("diff", help="Paragraph / event / attribute changes between two versions")
+    a.add_argument("old", help="Version (number or hash prefix)")
+    a.add_argument("new", nargs="?", default="latest", help="Version (default: latest)")
+    a.add_argument("--out", default=None, help="Also save the full diff as JSON")
+    a = actions.add_parser("checkout", help="Write a version in the master.json layout")
+    a.add_argument("version", help="Version (latest, number or hash prefix)")
+    a.add_argument("--out", required=True, help="Output file (.json or .shards)")
+    p.set_defaults(run=_gold)
+
+    p = sub.add_parser("shards", help="Convert between {pid: paragraph} JSON and sharded NDJSON")
+    actions = p.add_subparsers(dest="action", required=True, metavar="action")
+    a = actions.add_parser("split", help="JSON file -> <name>.shards directory")
+    a.add_argument("source")
+    a.add_argument("target", nargs="?", help="Default: source with the .shards suffix")
+    a.add_argument("--shards", type=int, default=None, help="Number of shards (default: CPU count)")
+    a.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    a = actions.add_parser("join", help="<name>.shards directory -> JSON file")
+    a.add_argument("source")
+    a.add_argument("target", nargs="?", help="Default: source with the .json suffix")
+    p.set_defaults(run=_shards)
+
+    p = sub.add_parser("columnar", help="Export parsed events to a mapped columnar file / score it")
+    actions = p.add_subparsers(dest="action", required=True, metavar="action")
+    a = actions.add_parser("export", help="Gold + system files -> one columnar file")
+    a.add_argument("--gold", default="data/gold/master.json", help="Gold file")
+    a.add_argument("--systems", nargs="+", required=True, help="System / annotator files")
+    a.add_argument("--config", default="config/pipeline.yaml", help="Config file (paths.cache_root: event cache)")
+    a.add_argument("--out", required=True, help="Output file (e.g. .cache/columnar/batch.cols)")
+    a = actions.add_parser("score", help="Score every system of a columnar file")
+    a.add_argument("path", help="File written by 'export'")
+    a.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    a.add_argument("--threshold", type=float, default=0.0, help="Minimum Dice for a mapped pair")
+    a.add_argument("--matching", choices=["id", "overlap"], default="id",
+                   help="Map events by (doc_id, event_id) or by trigger overlap within the document")
+    p.set_defaults(run=_columnar)
+
+    p = sub.add_parser("serve", help="Serve agreement / precision / metrics_v2 scoring with a warm gold set")
+    p.add_argument("--config", default="config/pipeline.yaml", help="Path to config file (YAML or JSON)")
+    p.add_argument("--gold", default=None, help="Gold file (default: <paths.gold_root>/master.json)")
+    # Literals rather than service.DEFAULT_HOST / DEFAULT_PORT: importing the service loads NumPy
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8765)
+    p.set_defaults(run=_serve, log=True)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None):
+    args = build_parser().parse_args(argv)
+    if getattr(args, "log", False):
+        logging.basicConfig(level=logging.INFO)
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
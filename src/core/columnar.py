@@ -0,0 +1,197 @@
+#src/core/columnar.py
+# -------------------------------------------------------------
+"""Memory-mapped columnar event tables for zero-copy multi-process scoring.
+
+Parallel scoring used to hand every worker its own copy of the parsed
+events (unpickled, or re-read from the event cache), so memory grew with the
+number of workers.  ``export_columnar`` writes the gold table and any number
+of system tables, already in one code space (``EventTable.recode``), to a
+single ``event_store.write_arrays`` file (64-byte aligned buffers):
+
+    sizes                         code-space size of tokens and each label field
+    <name>/token_ptr, token_ids   trigger tokens in CSR form
+    <name>/col_<field>            int32 doc_id, event_id, type, subtype,
+                                  modality, polarity per event
+    <name>/doc_codes, doc_ptr     document offset table
+
+Documents are written in doc-code order, so any range of doc codes is a
+contiguous slice of every table.  ``open_columnar`` maps the file read-only
+(``read_arrays(mmap=True)``); vocab strings are not stored, the tables only
+carry their code-space sizes (``CodeSpace``), which is all the matching and
+metric kernels use.
+
+``mapped_statistics`` splits the documents into ranges and has each worker
+run ``metrics_v2.mention_mapping`` and ``significance.document_statistics``
+on ``doc_slice`` views: label columns and token ids are never copied, only
+the two offset arrays of a slice are rebased.  Every worker maps the same
+file, so its pages live once in the page cache whatever the worker count.
+The per-document sums give the same ``evaluate`` numbers (``score_mapped``)
+and feed ``significance`` as ``paired_statistics`` does.  Argument and
+coreference columns are not exported.
+"""
+from __future__ import annotations
+
+import multiprocessing as mp
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from src.core.event_store import TOKENS, EventTable, gather_csr, read_arrays, write_arrays
+from src.core.gold_store import atomic_write
+from src.core.metrics_v2 import mention_mapping
+from src.core.significance import STATISTICS, document_statistics, metrics_from_sums
+
+GOLD = "gold"
+COLUMN_FIELDS = ("doc_id", "event_id", "type", "subtype", "modality", "polarity")
+SIZE_FIELDS = (TOKENS,) + COLUMN_FIELDS
+SLICES_PER_WORKER = 4
+
+_TABLES: Optional[Dict[str, EventTable]] = None  # mapped once per process by _init_worker
+_SOURCE: Optional[Tuple[str, bool]] = None
+
+
+class CodeSpace:
+    """Stands in for a ``Vocab`` in a mapped table: the kernels only use its size.
+
+    Labels (e.g. in debug logs) show up as ``#<code>``.
+    """
+
+    __slots__ = ("size",)
+
+    def __init__(self, size: int):
+        self.size = size
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, code: int) -> str:
+        return f"#{code}"
+
+    @property
+    def strings(self) -> "CodeSpace":
+        return self
+
+
+def _by_doc_code(table: EventTable) -> Dict[str, np.ndarray]:
+    """The exported arrays of ``table`` with its documents reordered by doc code."""
+    order = np.argsort(table.doc_codes, kind="stable")
+    _, rows, n_events = gather_csr(table.doc_ptr, np.arange(len(table)), order)
+    _, token_ids, n_tokens = gather_csr(table.token_ptr, table.token_ids, rows)
+    arrays = {"token_ptr": np.concatenate(([0], np.cumsum(n_tokens, dtype=np.int64))),
+              "token_ids": token_ids,
+              "doc_codes": table.doc_codes[order],
+              "doc_ptr": np.concatenate(([0], np.cumsum(n_events, dtype=np.int64)))}
+    for field in COLUMN_FIELDS:
+        arrays[f"col_{field}"] = table.columns[field][rows]
+    return arrays
+
+
+def export_columnar(tables: Dict[str, EventTable], path: Union[str, Path]) -> Path:
+    """Write ``{name: table}`` (one of them named ``"gold"``) to ``path``; the tables must share vocabs."""
+    if GOLD not in tables:
+        raise ValueError(f"no {GOLD!r} table to export")
+    vocabs = tables[GOLD].vocabs
+    if any(table.vocabs is not vocabs for table in tables.values()):
+        raise ValueError("tables must share the gold vocabs (see EventTable.recode)")
+    arrays = {"sizes": np.array([len(vocabs[field]) for field in SIZE_FIELDS], dtype=np.int64)}
+    for name, table in tables.items():
+        if "/" in name:
+            raise ValueError(f"table name {name!r} contains '/'")
+        arrays.update({f"{name}/{key}": arr for key, arr in _by_doc_code(table).items()})
+
+    path = Path(path)
+    atomic_write(path, lambda f: write_arrays(f, arrays), fsync=False)  # atomic: workers never map a partial file
+    return path
+
+
+def open_columnar(path: Union[str, Path], mmap: bool = True) -> Dict[str, EventTable]:
+    """``{name: table}`` over the arrays of ``path`` (read-only mapped views; ``mmap=False`` reads a private copy)."""
+    arrays = read_arrays(path, mmap=mmap)
+    vocabs = {field: CodeSpace(size) for field, size in zip(SIZE_FIELDS, arrays["sizes"].tolist())}
+    names = dict.fromkeys(key.split("/", 1)[0] for key in arrays if "/" in key)
+    tables = {}
+    for name in names:
+        def get(key, name=name):
+            return arrays[f"{name}/{key}"]
+        tables[name] = EventTable(vocabs, get("token_ptr"), get("token_ids"),
+                                  {field: get(f"col_{field}") for field in COLUMN_FIELDS},
+                                  get("doc_codes"), get("doc_ptr"), None, {}, None)
+    return tables
+
+
+def doc_slice(table: EventTable, lo: int, hi: int) -> EventTable:
+    """Events of the documents with codes in ``[lo, hi)`` of an exported table, as views."""
+    d0, d1 = np.searchsorted(table.doc_codes, [lo, hi]).tolist()
+    e0, e1 = int(table.doc_ptr[d0]), int(table.doc_ptr[d1])
+    t0, t1 = int(table.token_ptr[e0]), int(table.token_ptr[e1])
+    return EventTable(table.vocabs, table.token_ptr[e0:e1 + 1] - t0, table.token_ids[t0:t1],
+                      {field: column[e0:e1] for field, column in table.columns.items()},
+                      table.doc_codes[d0:d1], table.doc_ptr[d0:d1 + 1] - e0, None, {}, None)
+
+
+def doc_ranges(tables: Dict[str, EventTable], n_ranges: int) -> List[Tuple[int, int]]:
+    """Split the documents of all tables into ``n_ranges`` ``[lo, hi)`` doc-code ranges of similar size."""
+    docs = np.unique(np.concatenate([table.doc_codes for table in tables.values()]))
+    chunks = [chunk for chunk in np.array_split(docs, max(1, min(n_ranges, len(docs)))) if len(chunk)]
+    return [(int(chunk[0]), int(chunk[-1]) + 1) for chunk in chunks]
+
+
+def _init_worker(path: str, mmap: bool = True):
+    global _TABLES, _SOURCE
+    if _SOURCE != (path, mmap):
+        _TABLES, _SOURCE = open_columnar(path, mmap=mmap), (path, mmap)
+
+
+def _slice_statistics(lo: int, hi: int, systems: Sequence[str], threshold: float,
+                      matching: str) -> Tuple[np.ndarray, np.ndarray]:
+    """``(doc codes, stats[systems, documents, STATISTICS])`` of one doc range; runs inside a worker."""
+    gold = doc_slice(_TABLES[GOLD], lo, hi)
+    sliced = [doc_slice(_TABLES[name], lo, hi) for name in systems]
+    docs = np.unique(np.concatenate([gold.doc_codes] + [s.doc_codes for s in sliced]))
+    stats = np.stack([document_statistics(gold, s, mention_mapping(gold, s, threshold, matching=matching), docs)
+                      for s in sliced])
+    return docs, stats
+
+
+def mapped_statistics(path: Union[str, Path], systems: Optional[Sequence[str]] = None,
+                      workers: Optional[int] = None, threshold: float = 0.0, matching: str = "id",
+                      mmap: bool = True) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """Per-document statistics of every system of an exported file, computed by ``workers`` processes.
+
+    Returns ``(systems, doc codes, stats)`` with ``stats`` shaped
+    ``(systems, documents, significance.STATISTICS)``, as ``paired_statistics``.
+    """
+    global _TABLES, _SOURCE
+    tables = open_columnar(path)  # the parent only reads the doc-code arrays
+    systems = [name for name in tables if name != GOLD] if systems is None else list(systems)
+    workers = max(1, workers or os.cpu_count() or 1)
+    ranges = doc_ranges(tables, workers * SLICES_PER_WORKER)
+    if not ranges:
+        return systems, np.zeros(0, dtype=np.int64), np.zeros((len(systems), 0, len(STATISTICS)))
+    columns = [[lo for lo, _ in ranges], [hi for _, hi in ranges], [systems] * len(ranges),
+               [threshold] * len(ranges), [matching] * len(ranges)]
+    try:
+        if workers == 1:
+            _init_worker(str(path), mmap)
+            results = list(map(_slice_statistics, *columns))
+        else:
+            methods = mp.get_all_start_methods()
+            context = mp.get_context("fork" if "fork" in methods else None)
+            with ProcessPoolExecutor(min(workers, len(ranges)), mp_context=context, initializer=_init_worker,
+                                     initargs=(str(path), mmap)) as pool:
+                results = list(pool.map(_slice_statistics, *columns))
+    finally:
+        _TABLES = _SOURCE = None
+    docs = np.concatenate([docs for docs, _ in results])
+    return systems, docs, np.concatenate([stats for _, stats in results], axis=1)
+
+
+def score_mapped(path: Union[str, Path], systems: Optional[Sequence[str]] = None, workers: Optional[int] = None,
+                 threshold: float = 0.0, matching: str = "id") -> Dict[str, Dict[str, float]]:
+    """``{system: evaluate() span / attribute / combined metrics}`` from an exported file."""
+    systems, _, stats = mapped_statistics(path, systems, workers=workers, threshold=threshold, matching=matching)
+    return {name: {metric: round(float(value), 1) for metric, value in metrics_from_sums(stats[i].sum(axis=0)).items()}
+            for i, name in enumerate(systems)}
@@ -0,0 +1,217 @@
+#src/core/error_analysis.py
+# -------------------------------------------------------------
+"""Confusion matrices and error breakdown of a system against the gold set.
+
+Built from the same mapping as the ``evaluate`` numbers (``metrics_v2.mention_mapping``):
+
+*   confusion per attribute (type, subtype, modality, polarity): cell
+    ``[g, s]`` is the number of gold mentions labelled ``g`` whose system
+    mention says ``s``; a gold mention mapped to ``|MG|`` system mentions
+    spreads ``1/|MG|`` over them (as in Algorithm 3), so every gold mention
+    counts once.  The extra label ``UNMATCHED`` holds missed gold mentions
+    (row ``g``, column ``UNMATCHED``) and spurious system mentions (row
+    ``UNMATCHED``, column ``s``);
+*   per event type — precision / recall / F1 of mentions found with the
+    right type (counts, not Dice mass as in ``breakdown.per_type_scores``),
+    missed / spurious counts and the types it is most often confused with.
+    Recall counts gold mentions (the ``1/|MG|`` diagonal of the confusion);
+    precision counts system mentions, each mapped one with a gold twin of the
+    same type counting 1 — weighting them by ``1/|MG|`` would cap precision at
+    ``1/|MG|`` when one gold mention maps to several system mentions;
+*   per document — missed, spurious and mis-labelled mentions (plus which
+    labels were wrong); the documents with the most errors are listed first.
+
+Everything is one scatter-add: the (row, column, weight) triples of every
+attribute block and of the per-document counters are stacked into a single
+``scipy.sparse.coo_matrix`` and summed by ``tocsr()``.  The matrices stay
+sparse, so a large subtype vocabulary costs only its non-zero cells;
+type / modality / polarity are reported as dense matrices over the labels
+that occur, subtype as a list of cells.
+
+``write_error_report`` saves ``<tag>_errors.json`` and ``<tag>_confusion.csv``
+(one row per non-zero cell: attribute, gold, system, count) next to
+``reports/<tag>_metrics.json``.
+"""
+from __future__ import annotations
+
+import csv
+from pathlib import Path
+from typing import Any, Dict, List, Tuple, Union
+
+import numpy as np
+from scipy import sparse
+
+from src.core import metric_kernel as kernel
+from src.core.event_store import EventTable
+from src.core.metric_kernel import Mapping
+from src.core.utils import save_json
+
+UNMATCHED = "<unmatched>"
+DENSE_ATTRIBUTES = ("type", "modality", "polarity")
+DOCUMENT_COUNTS = ("n_gold", "n_system", "missed", "spurious", "mislabelled", "type", "subtype", "realis")
+TOP_CONFUSIONS = 10
+
+
+def _scatter(gold: EventTable, system: EventTable, pairs: Dict[str, np.ndarray], docs: np.ndarray):
+    """One summed sparse matrix holding every attribute block and the per-document counters.
+
+    Returns the CSR matrix and the first row of each block (``offsets[attr]``,
+    ``offsets["documents"]``); block ``attr`` has ``len(vocab) + 1`` rows, the
+    last one (and the column with the same index) being ``UNMATCHED``.
+    """
+    gid, sid, weight = pairs["gid"], pairs["sid"], pairs["weight"]
+    missed = np.ones(len(gold), dtype=bool)
+    missed[gid] = False
+    spurious = np.ones(len(system), dtype=bool)
+    spurious[sid] = False
+    missed_ids, spurious_ids = np.flatnonzero(missed), np.flatnonzero(spurious)
+
+    rows: List[np.ndarray] = []
+    cols: List[np.ndarray] = []
+    weights: List[np.ndarray] = []
+
+    def add(r, c, w):
+        rows.append(np.asarray(r, dtype=np.int64))
+        cols.append(np.broadcast_to(np.asarray(c, dtype=np.int64), np.shape(r)))
+        weights.append(np.broadcast_to(np.asarray(w, dtype=np.float64), np.shape(r)))
+
+    offsets: Dict[str, int] = {}
+    n_rows = width = 0
+    wrong: Dict[str, np.ndarray] = {}
+    for attr in kernel.ATTRIBUTES:
+        g_col, s_col = gold.columns[attr], system.columns[attr]
+        none = len(gold.vocabs[attr])
+        offsets[attr] = n_rows
+        add(n_rows + g_col[gid], s_col[sid], weight)          # mapped pairs
+        add(n_rows + g_col[missed_ids], none, 1.0)             # missed gold mentions
+        add(np.full(len(spurious_ids), n_rows + none), s_col[spurious_ids], 1.0)  # spurious system mentions
+        wrong[attr] = g_col[gid] != s_col[sid]
+        n_rows += none + 1
+        width = max(width, none + 1)
+
+    # Per-document counters: same scatter, columns DOCUMENT_COUNTS
+    offsets["documents"] = n_rows
+    g_doc = n_rows + np.searchsorted(docs, gold.columns["doc_id"])
+    s_doc = n_rows + np.searchsorted(docs, system.columns["doc_id"])
+    counter = {name: k for k, name in enumerate(DOCUMENT_COUNTS)}
+    add(g_doc, counter["n_gold"], 1.0)
+    add(s_doc, counter["n_system"], 1.0)
+    add(g_doc[missed_ids], counter["missed"], 1.0)
+    add(s_doc[spurious_ids], counter["spurious"], 1.0)
+    pair_doc = g_doc[gid]
+    realis = wrong["modality"] | wrong["polarity"]
+    for name, mask in (("mislabelled", wrong["type"] | wrong["subtype"] | realis), ("type", wrong["type"]),
+                       ("subtype", wrong["subtype"]), ("realis", realis)):
+        add(pair_doc[mask], counter[name], weight[mask])
+    n_rows += len(docs)
+    width = max(width, len(DOCUMENT_COUNTS))
+
+    matrix = sparse.coo_matrix((np.concatenate(weights), (np.concatenate(rows), np.concatenate(cols))),
+                               shape=(n_rows, width)).tocsr()  # duplicates are summed here
+    return matrix, offsets
+
+
+def _cells(block: sparse.csr_matrix, labels: list) -> List[list]:
+    """Non-zero cells ``[gold, system, count]`` of a block, largest first."""
+    coo = block.tocoo()
+    order = np.lexsort((coo.col, coo.row, -coo.data))
+    return [[labels[r], labels[c], round(float(v), 3)]
+            for r, c, v in zip(coo.row[order].tolist(), coo.col[order].tolist(), coo.data[order].tolist()) if v]
+
+
+def _confusion(block: sparse.csr_matrix, labels: list, dense: bool) -> Dict[str, Any]:
+    """Labels that occur on either axis, then a dense matrix over them or the list of cells."""
+    used = np.flatnonzero(np.asarray(block.sum(axis=1)).ravel() + np.asarray(block.sum(axis=0)).ravel())
+    used_labels = [labels[c] for c in used.tolist()]
+    if dense:
+        matrix = block[used][:, used].toarray()
+        return {"labels": used_labels, "matrix": np.round(matrix, 3).tolist()}
+    return {"labels": used_labels, "cells": _cells(block, labels)}
+
+
+def _per_type(block: sparse.csr_matrix, labels: list, gold: EventTable, system: EventTable,
+              pairs: Dict[str, np.ndarray]) -> Dict[str, Dict]:
+    none = len(labels) - 1
+    counts = block.toarray()
+    n_gold = np.bincount(gold.columns["type"], minlength=none)[:none]
+    n_system = np.bincount(system.columns["type"], minlength=none)[:none]
+    # System side: each mapped system mention whose gold twin has its type counts 1 (a system mention maps once)
+    s_type = system.columns["type"][pairs["sid"]]
+    system_tp = np.bincount(s_type[gold.columns["type"][pairs["gid"]] == s_type], minlength=none)[:none]
+    scores = {}
+    for code in np.flatnonzero(n_gold + n_system).tolist():
+        # Recall on the gold side (1/|MG| mass), precision on the system side (unweighted)
+        p = system_tp[code] / n_system[code] if n_system[code] else 0.0
+        r = counts[code, code] / n_gold[code] if n_gold[code] else 0.0
+        f1 = 2 * p * r / (p + r) if p + r > 0 else 0.0
+        row = counts[code, :none].copy()
+        row[code] = 0
+        confused = [c for c in np.argsort(-row, kind="stable")[:3].tolist() if row[c] > 0]
+        scores[labels[code]] = {
+            "precision": round(float(p) * 100, 1), "recall": round(float(r) * 100, 1), "f1": round(float(f1) * 100, 1),
+            "support": int(n_gold[code]), "n_system": int(n_system[code]),
+            "missed": round(float(counts[code, none]), 3), "spurious": round(float(counts[none, code]), 3),
+            "confused_as": {labels[c]: round(float(row[c]), 3) for c in confused},
+        }
+    return scores
+
+
+def error_report(gold: EventTable, system: EventTable, mapping: Mapping, top_documents: int = 10) -> Dict[str, Any]:
+    """Confusions, per-type scores and worst documents; ``system`` must share ``gold``'s vocabs.
+
+    ``top_documents`` caps ``worst_documents`` (documents ranked by missed +
+    spurious + mis-labelled mentions; ``None`` keeps all documents with errors).
+    """
+    docs = np.unique(np.concatenate([gold.doc_codes, system.doc_codes]))
+    pairs = kernel.pair_columns(mapping)
+    matrix, offsets = _scatter(gold, system, pairs, docs)
+
+    report: Dict[str, Any] = {"n_gold": len(gold), "n_system": len(system),
+                              "n_mapped_pairs": sum(map(len, mapping.values())),
+                              "confusion": {}, "top_confusions": {}}
+    for attr in kernel.ATTRIBUTES:
+        labels = list(gold.vocabs[attr].strings) + [UNMATCHED]
+        block = matrix[offsets[attr]:offsets[attr] + len(labels), :len(labels)]
+        report["confusion"][attr] = _confusion(block, labels, dense=attr in DENSE_ATTRIBUTES)
+        report["top_confusions"][attr] = [cell for cell in _cells(block, labels) if cell[0] != cell[1]][:TOP_CONFUSIONS]
+        if attr == "type":
+            report["per_type"] = _per_type(block, labels, gold, system, pairs)
+
+    counts = matrix[offsets["documents"]:, :len(DOCUMENT_COUNTS)].toarray()
+    errors = counts[:, [DOCUMENT_COUNTS.index(name) for name in ("missed", "spurious", "mislabelled")]].sum(axis=1)
+    order = np.lexsort((-counts[:, 0], -errors))
+    order = order[errors[order] > 0][:top_documents]
+    doc_strings = gold.vocabs["doc_id"].strings
+    worst = []
+    for row in order.tolist():
+        entry = {"pid": doc_strings[docs[row]], "errors": round(float(errors[row]), 3)}
+        entry.update({name: round(float(value), 3) for name, value in zip(DOCUMENT_COUNTS, counts[row].tolist())})
+        entry["n_gold"], entry["n_system"] = int(entry["n_gold"]), int(entry["n_system"])
+        worst.append(entry)
+    report["worst_documents"] = worst
+    return report
+
+
+def confusion_rows(report: Dict[str, Any]) -> List[Tuple[str, Any, Any, float]]:
+    """``(attribute, gold, system, count)`` for every non-zero cell of every confusion in ``report``."""
+    rows = []
+    for attr, confusion in report["confusion"].items():
+        if "cells" in confusion:
+            rows.extend((attr, g, s, c) for g, s, c in confusion["cells"])
+            continue
+        labels = confusion["labels"]
+        for i, line in enumerate(confusion["matrix"]):
+            rows.extend((attr, labels[i], labels[j], c) for j, c in enumerate(line) if c)
+    return rows
+
+
+def write_error_report(report: Dict[str, Any], reports_dir: Union[str, Path], tag: str) -> Tuple[str, str]:
+    """Save ``<reports_dir>/<tag>_errors.json`` and ``<tag>_confusion.csv``; return both paths."""
+    json_path, csv_path = Path(reports_dir) / f"{tag}_errors.json", Path(reports_dir) / f"{tag}_confusion.csv"
+    save_json(report, str(json_path))
+    with open(csv_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(("attribute", "gold", "system", "count"))
+        writer.writerows((attr, "" if g is None else g, "" if s is None else s, c)
+                         for attr, g, s, c in confusion_rows(report))
+    return str(json_path), str(csv_path)
@@ -0,0 +1,456 @@
+#src/core/event_store.py
+# -------------------------------------------------------------
+"""Compact, interned event table.
+
+``parse_events`` used to build one dict per event holding a ``set`` of token
+strings plus four label strings, i.e. several hundred bytes of Python objects
+per event.  ``EventTable`` stores the same information column-wise:
+
+*   every string (trigger token, doc id, event id, type, subtype, modality,
+    polarity) is interned once in a per-field ``Vocab`` and referenced by an
+    ``int32`` code;
+*   trigger tokens are kept in CSR form: ``token_ids[token_ptr[i]:token_ptr[i+1]]``
+    is the sorted, de-duplicated id array of event ``i``;
+*   labels are one ``int32`` column per field (``trigger`` holds the raw
+    trigger text, used by the exact-match metrics);
+*   documents are kept in file order, including those without events:
+    ``doc_codes[d]`` is the doc-id code of document ``d`` and its events are
+    rows ``doc_ptr[d]:doc_ptr[d+1]``;
+*   arguments are a second CSR level: event ``i`` owns argument rows
+    ``arg_ptr[i]:arg_ptr[i+1]`` of the ``arg_columns`` (text, role,
+    argument_type, canonical_coreference codes);
+*   event coreference (``coreferent_event_triggers``) is an ``(n, 2)`` array
+    ``coref_links`` of ``(event row, linked event row)`` pairs, resolved
+    within the paragraph at build time (ids that name no mention of the
+    paragraph are dropped).
+
+Two tables built with the same ``vocabs`` dict compare codes directly; tables
+built separately are brought into the same code space with ``recode``.
+"""
+from __future__ import annotations
+
+import json
+import sys
+from array import array
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple, Union
+
+import numpy as np
+
+TOKENS = "tokens"
+LABEL_FIELDS = ("doc_id", "event_id", "trigger", "type", "subtype", "modality", "polarity")
+ARG_FIELDS = ("arg_text", "role", "argument_type", "canonical_coreference")
+VOCAB_FIELDS = (TOKENS,) + LABEL_FIELDS + ARG_FIELDS
+
+
+def extract_all_trigger_tokens(trigger: Dict) -> Set[str]:
+    tokens = set(trigger["text"].split())
+    extra_spans = trigger.get("extra_trigger_spans", [])
+    for extra in extra_spans:
+        if isinstance(extra, str):
+            tokens.update(extra.split())
+        elif isinstance(extra, dict):  # nested discontiguous
+            tokens.update(extract_all_trigger_tokens(extra))
+    return tokens
+
+
+class Vocab:
+    """Append-only string interner: ``intern(s)`` returns a stable integer code.
+
+    ``None`` (a JSON ``null`` label) is interned like any other value.
+    """
+
+    __slots__ = ("strings", "index")
+
+    def __init__(self, strings: Iterable[str] = ()):
+        self.strings: list = []
+        self.index: Dict[str, int] = {}
+        for s in strings:
+            self.intern(s)
+
+    @classmethod
+    def from_unique(cls, strings: list) -> "Vocab":
+        """Vocab whose codes are the positions of the distinct ``strings`` (no per-string interning)."""
+        vocab = cls()
+        vocab.strings = strings
+        vocab.index = dict(zip(strings, range(len(strings))))
+        if len(vocab.index) != len(strings):
+            raise ValueError("duplicate strings in vocab")
+        return vocab
+
+    def copy(self) -> "Vocab":
+        """Independent vocab with the same codes (interning into it leaves this one untouched)."""
+        vocab = Vocab()
+        vocab.strings = list(self.strings)
+        vocab.index = dict(self.index)
+        return vocab
+
+    def intern(self, s: str) -> int:
+        code = self.index.get(s)
+        if code is None:
+            code = self.index[s] = len(self.strings)
+            self.strings.append(s)
+        return code
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+    def __getitem__(self, code: int) -> str:
+        return self.strings[code]
+
+
+def new_vocabs() -> Dict[str, Vocab]:
+    return {field: Vocab() for field in VOCAB_FIELDS}
+
+
+def copy_vocabs(vocabs: Dict[str, Vocab]) -> Dict[str, Vocab]:
+    return {field: vocab.copy() for field, vocab in vocabs.items()}
+
+
+class EventTable:
+    """Columnar event store; see module docstring for the layout."""
+
+    __slots__ = ("vocabs", "token_ptr", "token_ids", "columns", "doc_codes", "doc_ptr", "arg_ptr", "arg_columns",
+                 "coref_links")
+
+    def __init__(self, vocabs: Dict[str, Vocab], token_ptr: np.ndarray, token_ids: np.ndarray,
+                 columns: Dict[str, np.ndarray], doc_codes: np.ndarray, doc_ptr: np.ndarray,
+                 arg_ptr: np.ndarray, arg_columns: Dict[str, np.ndarray], coref_links: np.ndarray):
+        self.vocabs = vocabs
+        self.token_ptr = token_ptr
+        self.token_ids = token_ids
+        self.columns = columns
+        self.doc_codes = doc_codes
+        self.doc_ptr = doc_ptr
+        self.arg_ptr = arg_ptr
+        self.arg_columns = arg_columns
+        self.coref_links = coref_links
+
+    def __len__(self) -> int:
+        return len(self.token_ptr) - 1
+
+    def tokens(self, i: int) -> np.ndarray:
+        """Sorted token-id array of event ``i``."""
+        return self.token_ids[self.token_ptr[i]:self.token_ptr[i + 1]]
+
+    def token_strings(self, i: int) -> Set[str]:
+        strings = self.vocabs[TOKENS].strings
+        return {strings[t] for t in self.tokens(i).tolist()}
+
+    def label(self, field: str, i: int) -> str:
+        return self.vocabs[field][int(self.columns[field][i])]
+
+    def row(self, i: int) -> Dict:
+        """Event ``i`` in the legacy dict form (debugging / reporting only)."""
+        event = {field: self.label(field, i) for field in LABEL_FIELDS}
+        event[TOKENS] = self.token_strings(i)
+        return event
+
+    def row_lengths(self) -> np.ndarray:
+        return np.diff(self.token_ptr)
+
+    def doc_of_event(self) -> np.ndarray:
+        """Document index (into ``doc_codes``) of every event."""
+        return np.repeat(np.arange(len(self.doc_codes)), np.diff(self.doc_ptr))
+
+    def event_of_arg(self) -> np.ndarray:
+        """Event row of every argument."""
+        return np.repeat(np.arange(len(self)), np.diff(self.arg_ptr))
+
+    def doc_ids(self) -> list:
+        """Document ids in file order (including documents without events)."""
+        strings = self.vocabs["doc_id"].strings
+        return [strings[c] for c in self.doc_codes.tolist()]
+
+    def nbytes(self) -> int:
+        """Approximate memory footprint: arrays plus interned strings and their index."""
+        size = self.token_ptr.nbytes + self.token_ids.nbytes + self.doc_codes.nbytes + self.doc_ptr.nbytes
+        size += self.arg_ptr.nbytes + self.coref_links.nbytes + sum(c.nbytes for c in self.columns.values())
+        size += sum(c.nbytes for c in self.arg_columns.values())
+        for vocab in self.vocabs.values():
+            size += sys.getsizeof(vocab.strings) + sys.getsizeof(vocab.index)
+            size += sum(sys.getsizeof(s) for s in vocab.strings)
+        return size
+
+    def recode(self, vocabs: Dict[str, Vocab]) -> "EventTable":
+        """Return this table expressed in ``vocabs`` (extending them as needed)."""
+        if vocabs is self.vocabs:
+            return self
+        columns = {}
+        for field in LABEL_FIELDS:
+            lut = lookup_table(self.vocabs[field], vocabs[field])
+            columns[field] = lut[self.columns[field]]
+            if field == "doc_id":
+                doc_codes = lut[self.doc_codes]
+        arg_columns = {field: lookup_table(self.vocabs[field], vocabs[field])[self.arg_columns[field]]
+                       for field in ARG_FIELDS}
+        token_ids = lookup_table(self.vocabs[TOKENS], vocabs[TOKENS])[self.token_ids]
+        # New codes need not preserve order: re-sort ids within each row.
+        rows = np.repeat(np.arange(len(self)), self.row_lengths())
+        token_ids = token_ids[np.lexsort((token_ids, rows))]
+        return EventTable(vocabs, self.token_ptr, token_ids, columns, doc_codes, self.doc_ptr,
+                          self.arg_ptr, arg_columns, self.coref_links)
+
+
+def lookup_table(source: Vocab, target: Vocab, transform: Optional[Callable[[str], str]] = None) -> np.ndarray:
+    """Array mapping ``source`` codes to ``target`` codes, interning into ``target`` as needed.
+
+    ``transform`` (e.g. ``str.lower``) is applied to each string before interning.
+    """
+    strings = source.strings if transform is None else (transform(s) for s in source.strings)
+    return np.fromiter((target.intern(s) for s in strings), dtype=np.int32, count=len(source))
+
+
+def translate(source: Vocab, target: Vocab) -> np.ndarray:
+    """Lookup array mapping ``source`` codes to ``target`` codes, ``-1`` where absent.
+
+    Unlike ``EventTable.recode`` this never extends ``target``.
+    """
+    index = target.index
+    return np.fromiter((index.get(s, -1) for s in source.strings), dtype=np.int32, count=len(source))
+
+
+class EventTableBuilder:
+    """Accumulate events into compact ``array`` buffers, then freeze to an ``EventTable``."""
+
+    def __init__(self, vocabs: Optional[Dict[str, Vocab]] = None):
+        self.vocabs = vocabs if vocabs is not None else new_vocabs()
+        self.token_ptr = array("q", [0])
+        self.token_ids = array("i")
+        self.labels = {field: array("i") for field in LABEL_FIELDS}
+        self.doc_codes = array("i")
+        self.doc_ptr = array("q", [0])
+        self.arg_ptr = array("q", [0])
+        self.arg_labels = {field: array("i") for field in ARG_FIELDS}
+        self.coref_links = array("q")  # flattened (row, linked row) pairs
+
+    def add_doc(self, doc_id: str, doc: Dict) -> int:
+        """Add one paragraph and all its event mentions; return the number of events."""
+        self.doc_codes.append(self.vocabs["doc_id"].intern(doc_id))
+        mentions = doc.get("event_mentions", [])
+        first = len(self.token_ptr) - 1
+        for mention in mentions:
+            self.add(doc_id, mention)
+        rows = {}
+        for offset, mention in enumerate(mentions):
+            rows.setdefault(mention["id"], first + offset)
+        for offset, mention in enumerate(mentions):
+            for linked in mention.get("coreferent_event_triggers") or ():
+                row = rows.get(linked)
+                if row is not None and row != first + offset:
+                    self.coref_links.extend((first + offset, row))
+        self.doc_ptr.append(len(self.token_ptr) - 1)
+        return len(mentions)
+
+    def add(self, doc_id: str, mention: Dict):
+        vocabs, labels = self.vocabs, self.labels
+        token_vocab = vocabs[TOKENS]
+        ids = sorted(token_vocab.intern(t) for t in extract_all_trigger_tokens(mention["trigger"]))
+        self.token_ids.extend(ids)
+        self.token_ptr.append(len(self.token_ids))
+        factuality = mention["factuality"]
+        for field, value in (("doc_id", doc_id), ("event_id", mention["id"]), ("trigger", mention["trigger"]["text"]),
+                             ("type", mention["event_type"]), ("subtype", mention["event_subtype"]),
+                             ("modality", factuality["modality"]), ("polarity", factuality["polarity"])):
+            labels[field].append(vocabs[field].intern(value))
+        arguments = mention.get("arguments", [])
+        arg_labels = self.arg_labels
+        for arg in arguments:
+            for field, value in (("arg_text", arg.get("text")), ("role", arg.get("role")),
+                                 ("argument_type", arg.get("argument_type")),
+                                 ("canonical_coreference", arg.get("canonical_coreference"))):
+                arg_labels[field].append(vocabs[field].intern(value))
+        self.arg_ptr.append(self.arg_ptr[-1] + len(arguments))
+
+    def build(self) -> EventTable:
+        columns = {field: np.frombuffer(buf, dtype=np.int32).copy() for field, buf in self.labels.items()}
+        return EventTable(self.vocabs,
+                          np.frombuffer(self.token_ptr, dtype=np.int64).copy(),
+                          np.frombuffer(self.token_ids, dtype=np.int32).copy(),
+                          columns,
+                          np.frombuffer(self.doc_codes, dtype=np.int32).copy(),
+                          np.frombuffer(self.doc_ptr, dtype=np.int64).copy(),
+                          np.frombuffer(self.arg_ptr, dtype=np.int64).copy(),
+                          {field: np.frombuffer(buf, dtype=np.int32).copy() for field, buf in self.arg_labels.items()},
+                          np.array(self.coref_links, dtype=np.int64).reshape(-1, 2))
+
+
+def gather_csr(ptr: np.ndarray, values: np.ndarray, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Concatenate CSR rows ``rows``; return (owner position, value, row length)."""
+    starts = ptr[rows]
+    lengths = ptr[rows + 1] - starts
+    owner = np.repeat(np.arange(len(rows)), lengths)
+    offsets = np.arange(int(lengths.sum())) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return owner, values[np.repeat(starts, lengths) + offsets], lengths
+
+
+def _gather_rows(table: EventTable, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Concatenate the token rows ``rows``; return (owner position, token id, row length)."""
+    return gather_csr(table.token_ptr, table.token_ids, rows)
+
+
+def dice_many(gold: EventTable, system: EventTable, gids: np.ndarray, sids: np.ndarray) -> np.ndarray:
+    """Dice coefficient of every ``(gids[k], sids[k])`` pair, vectorized.
+
+    Both tables must share token codes (see ``EventTable.recode``).  Each side is
+    flattened to unique ``pair * V + token`` keys; the per-pair intersection
+    size is the bincount of the keys present on both sides.
+    """
+    n_pairs = len(gids)
+    if n_pairs == 0:
+        return np.zeros(0, dtype=np.float64)
+    width = max(len(gold.vocabs[TOKENS]), 1)
+    g_owner, g_tok, g_len = _gather_rows(gold, gids)
+    s_owner, s_tok, s_len = _gather_rows(system, sids)
+    common = np.intersect1d(g_owner * width + g_tok, s_owner * width + s_tok, assume_unique=True)
+    inter = np.bincount(common // width, minlength=n_pairs)
+    total = g_len + s_len
+    return np.divide(2 * inter, total, out=np.zeros(n_pairs, dtype=np.float64), where=total > 0)
+
+
+def _ptr(lengths: np.ndarray) -> np.ndarray:
+    return np.concatenate(([0], np.cumsum(lengths, dtype=np.int64)))
+
+
+def select_docs(table: EventTable, doc_ids: Iterable[str]) -> EventTable:
+    """The documents of ``table`` whose ids are in ``doc_ids`` (in table order), sharing its vocabs."""
+    index = table.vocabs["doc_id"].index
+    codes = np.array([index[d] for d in doc_ids if d in index], dtype=np.int32)
+    docs = np.flatnonzero(np.isin(table.doc_codes, codes))
+    _, rows, n_events = gather_csr(table.doc_ptr, np.arange(len(table)), docs)
+    _, token_ids, n_tokens = gather_csr(table.token_ptr, table.token_ids, rows)
+    _, arg_rows, n_args = gather_csr(table.arg_ptr, np.arange(int(table.arg_ptr[-1])), rows)
+    new_row = np.full(len(table), -1, dtype=np.int64)
+    new_row[rows] = np.arange(len(rows))
+    links = new_row[table.coref_links]  # both ends of a link are in the same document
+    return EventTable(table.vocabs, _ptr(n_tokens), token_ids,
+                      {field: column[rows] for field, column in table.columns.items()},
+                      table.doc_codes[docs], _ptr(n_events), _ptr(n_args),
+                      {field: column[arg_rows] for field, column in table.arg_columns.items()},
+                      links[links[:, 0] >= 0].reshape(-1, 2))
+
+
+def build_table(json_data: Union[Dict, Iterable[Tuple[str, Dict]]],
+                vocabs: Optional[Dict[str, Vocab]] = None) -> EventTable:
+    """Build an ``EventTable`` from a ``{pid: paragraph}`` dict or ``(pid, paragraph)`` pairs."""
+    builder = EventTableBuilder(vocabs)
+    items = json_data.items() if isinstance(json_data, dict) else json_data
+    for doc_id, doc in items:
+        builder.add_doc(doc_id, doc)
+    return builder.build()
+
+
+def _stack_ptrs(ptrs) -> np.ndarray:
+    """Concatenate CSR pointer arrays, shifting each by the total length before it."""
+    parts, base = [np.zeros(1, dtype=np.int64)], 0
+    for ptr in ptrs:
+        parts.append(ptr[1:] + base)
+        base += int(ptr[-1])
+    return np.concatenate(parts)
+
+
+def concat_tables(tables: Iterable[EventTable], vocabs: Optional[Dict[str, Vocab]] = None) -> EventTable:
+    """Stack tables document-wise, recoding each into ``vocabs`` (fresh ones by default).
+
+    Recoding interns each table's strings in its own first-seen order, so
+    concatenating the tables of consecutive chunks of a file gives the same
+    codes as ``build_table`` over the whole file.
+    """
+    vocabs = vocabs if vocabs is not None else new_vocabs()
+    tables = [table.recode(vocabs) for table in tables]
+    if not tables:
+        return EventTableBuilder(vocabs).build()
+    row_base = np.cumsum([0] + [len(table) for table in tables[:-1]])
+    return EventTable(vocabs,
+                      _stack_ptrs(t.token_ptr for t in tables),
+                      np.concatenate([t.token_ids for t in tables]),
+                      {field: np.concatenate([t.columns[field] for t in tables]) for field in LABEL_FIELDS},
+                      np.concatenate([t.doc_codes for t in tables]),
+                      _stack_ptrs(t.doc_ptr for t in tables),
+                      _stack_ptrs(t.arg_ptr for t in tables),
+                      {field: np.concatenate([t.arg_columns[field] for t in tables]) for field in ARG_FIELDS},
+                      np.concatenate([t.coref_links + base for t, base in zip(tables, row_base)]).reshape(-1, 2))
+
+
+# ----- Flat array (de)serialization: used by the on-disk cache -----
+def to_arrays(table: EventTable) -> Dict[str, np.ndarray]:
+    """Flatten a table into named NumPy arrays.
+
+    Each vocab becomes a UTF-8 blob plus byte offsets; a JSON ``null`` label
+    (e.g. a missing ``event_subtype``) is recorded by its code in ``_null``.
+    """
+    arrays = {"token_ptr": table.token_ptr, "token_ids": table.token_ids,
+              "doc_codes": table.doc_codes, "doc_ptr": table.doc_ptr, "arg_ptr": table.arg_ptr,
+              "coref_links": table.coref_links}
+    for field in LABEL_FIELDS:
+        arrays[f"col_{field}"] = table.columns[field]
+    for field in ARG_FIELDS:
+        arrays[f"col_{field}"] = table.arg_columns[field]
+    for field in VOCAB_FIELDS:
+        vocab = table.vocabs[field]
+        encoded = [b"" if s is None else s.encode("utf-8") for s in vocab.strings]
+        arrays[f"vocab_{field}_blob"] = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        arrays[f"vocab_{field}_ptr"] = np.concatenate(([0], np.cumsum([len(b) for b in encoded], dtype=np.int64)))
+        arrays[f"vocab_{field}_null"] = np.array([vocab.index.get(None, -1)], dtype=np.int64)
+    return arrays
+
+
+def from_arrays(arrays) -> EventTable:
+    """Inverse of ``to_arrays``; ``arrays`` is any mapping of name -> array (e.g. an ``NpzFile``)."""
+    vocabs = {}
+    for field in VOCAB_FIELDS:
+        blob = arrays[f"vocab_{field}_blob"].tobytes()
+        ptr = arrays[f"vocab_{field}_ptr"].tolist()
+        null = int(arrays[f"vocab_{field}_null"][0])
+        strings = [blob[a:b].decode("utf-8") for a, b in zip(ptr, ptr[1:])]
+        if null >= 0:
+            strings[null] = None
+        vocabs[field] = Vocab.from_unique(strings)
+    columns = {field: arrays[f"col_{field}"] for field in LABEL_FIELDS}
+    arg_columns = {field: arrays[f"col_{field}"] for field in ARG_FIELDS}
+    return EventTable(vocabs, arrays["token_ptr"], arrays["token_ids"], columns,
+                      arrays["doc_codes"], arrays["doc_ptr"], arrays["arg_ptr"], arg_columns, arrays["coref_links"])
+
+
+# ----- Single-file binary layout -----
+# MAGIC | uint64 header length | JSON header {name: [dtype, shape, offset]} | buffers
+# Buffers are 64-byte aligned so the file can also be mapped with np.memmap.
+MAGIC = b"VFEVT001"
+_ALIGN = 64
+
+
+def write_arrays(f, arrays: Dict[str, np.ndarray]):
+    """Write named arrays to the binary file object ``f``."""
+    header, offset = {}, 0
+    for name, arr in arrays.items():
+        arr = np.ascontiguousarray(arr)
+        header[name] = [arr.dtype.str, list(arr.shape), offset]
+        offset += -(-arr.nbytes // _ALIGN) * _ALIGN
+    head = json.dumps(header).encode("utf-8")
+    start = -(-(len(MAGIC) + 8 + len(head)) // _ALIGN) * _ALIGN
+    f.write(MAGIC + len(head).to_bytes(8, "little") + head)
+    f.write(b"\0" * (start - len(MAGIC) - 8 - len(head)))
+    for name, arr in arrays.items():
+        data = np.ascontiguousarray(arr).tobytes()
+        f.write(data + b"\0" * (-len(data) % _ALIGN))
+
+
+def read_arrays(path, mmap: bool = False) -> Dict[str, np.ndarray]:
+    """Read a file written by ``write_arrays``; ``mmap=True`` returns read-only views of the mapped file."""
+    with open(path, "rb") as f:
+        prefix = f.read(len(MAGIC) + 8)
+        if prefix[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not an event-table file")
+        head_len = int.from_bytes(prefix[len(MAGIC):], "little")
+        header = json.loads(f.read(head_len).decode("utf-8"))
+        start = -(-(len(MAGIC) + 8 + head_len) // _ALIGN) * _ALIGN
+        if mmap:
+            buf = np.memmap(path, dtype=np.uint8, mode="r")
+        else:
+            f.seek(0)
+            buf = np.frombuffer(f.read(), dtype=np.uint8)
+    arrays = {}
+    for name, (dtype, shape, offset) in header.items():
+        dtype = np.dtype(dtype)
+        count = int(np.prod(shape)) if shape else 1
+        arrays[name] = np.frombuffer(buf, dtype=dtype, count=count, offset=start + offset).reshape(shape)
+    return arrays
@@ -0,0 +1,346 @@
+#src/core/gold_store.py
+# -------------------------------------------------------------
+"""Gold master store: append-only NDJSON log + paragraph-id offset index.
+
+``master.json`` used to be loaded whole, patched in a dict and re-serialized
+on every QC round.  ``GoldStore`` keeps the same ``{pid: paragraph}`` data as
+
+    <store_dir>/log.ndjson    one record per line: {"pid": ..., "doc": {...}}
+                              (or {"pid": ..., "deleted": true})
+    <store_dir>/index.json    {"log_size": n, "offsets": {pid: [offset, length]},
+                               "export": {"path", "size", "mtime_ns", "sha256"} | null}
+
+*   ``upsert`` / ``delete`` append only the changed records → O(changed);
+    a later record for the same pid shadows the earlier one.
+*   ``get(pid)`` is one seek + one ``json.loads``.
+*   ``index.json`` is a checkpoint: on open, records past ``log_size`` are
+    replayed, so the index never has to be rewritten per upsert.  A trailing
+    partial line is skipped on open (it may be a write in progress); writers
+    truncate it, under the store lock, before appending (crash mid-append).
+*   ``compact`` rewrites the log with live records only.
+*   ``export_json`` streams the store back to the ``master.json`` layout
+    (same bytes as ``json.dump(..., indent=2, ensure_ascii=False)``) and
+    records the file's stamp, so ``export_matches`` can tell whether
+    ``master.json`` was edited since (``gold_update`` refuses to overwrite it).
+
+Iteration order follows ``master.json`` semantics: a pid keeps the position
+of its first insertion, re-inserted after a delete goes to the end.
+
+Appends, truncation and ``compact`` hold an exclusive lock on
+``<store_dir>/lock``; readers take no lock and may open the store
+concurrently.
+
+``atomic_write`` (temporary sibling + ``os.replace``, keeping the target's
+mode) is the one writer used by every file that is replaced whole: the index,
+``master.json``, shards and their manifest, the event cache, columnar files.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import stat
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+LOGGER = logging.getLogger(__name__)
+
+LOG_NAME = "log.ndjson"
+INDEX_NAME = "index.json"
+LOCK_NAME = "lock"
+CHECKPOINT_BYTES = 8 << 20  # rewrite index.json once this much log is un-indexed
+
+
+def _new_file_mode() -> int:
+    umask = os.umask(0)  # the only way to read it; restored immediately
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+def atomic_write(path: Union[str, Path], write: Callable, fsync: bool = True):
+    """Replace ``path`` with what ``write(f)`` writes to a binary file object.
+
+    The data goes to a temporary sibling that is renamed over ``path``, so
+    readers see the old or the new file, never a partial one.  The result keeps
+    the mode of the file it replaces (a new file gets ``0o666 & ~umask``, as
+    ``open`` would create it), not ``mkstemp``'s 0600.  ``fsync=False`` skips
+    the flush to disk for files that can be rebuilt (caches).
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        mode = stat.S_IMODE(path.stat().st_mode)
+    except FileNotFoundError:
+        mode = _new_file_mode()
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def write_json_items(f, items: Iterable[Tuple[str, Dict]]):
+    """Write ``(pid, paragraph)`` pairs to ``f`` as ``json.dump({...}, indent=2, ensure_ascii=False)`` would."""
+    f.write(b"{")
+    empty = True
+    for pid, doc in items:
+        body = json.dumps(doc, indent=2, ensure_ascii=False).replace("\n", "\n  ")
+        f.write(f"{'' if empty else ','}\n  {json.dumps(pid, ensure_ascii=False)}: {body}".encode("utf-8"))
+        empty = False
+    f.write(b"}" if empty else b"\n}")
+
+
+def file_stamp(path: Union[str, Path], content: bool = True, chunk_size: int = 1 << 20) -> Dict:
+    """``{"path", "size", "mtime_ns", "sha256"}`` of a JSON file or a ``.shards`` directory (manifest + shards).
+
+    ``content=False`` only stats the files (``sha256`` is ``None``).
+    """
+    from src.core.shards import MANIFEST_NAME, is_sharded, shard_files
+
+    path = Path(path)
+    files = [path / MANIFEST_NAME] + shard_files(path) if is_sharded(path) else [path]
+    stats = [fp.stat() for fp in files]
+    digest = None
+    if content:
+        h = hashlib.sha256()
+        for fp in files:
+            with open(fp, "rb") as f:
+                for chunk in iter(lambda: f.read(chunk_size), b""):
+                    h.update(chunk)
+        digest = h.hexdigest()
+    return {"path": str(path.resolve()), "size": sum(st.st_size for st in stats),
+            "mtime_ns": max(st.st_mtime_ns for st in stats), "sha256": digest}
+
+
+@contextmanager
+def _locked(lock_path: Path):
+    """Exclusive inter-process lock held for the ``with`` block."""
+    with open(lock_path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _record(pid: str, doc: Dict) -> bytes:
+    return (json.dumps({"pid": pid, "doc": doc}, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+class GoldStore:
+    """``{pid: paragraph}`` gold set with O(changed) upserts and point lookups."""
+
+    def __init__(self, store_dir: Union[str, Path]):
+        self.dir = Path(store_dir)
+        self.log_path = self.dir / LOG_NAME
+        self.index_path = self.dir / INDEX_NAME
+        self.offsets: Dict[str, Tuple[int, int]] = {}
+        self.export_stamp: Optional[Dict] = None  # file_stamp of the last export_json / record_export
+        self._indexed_size = 0
+        self._end = 0  # end of the last complete record indexed
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.log_path.touch(exist_ok=True)
+        self._load_index()
+
+    # ----- Index -----
+    def _load_index(self):
+        if self.index_path.exists():
+            try:
+                index = json.loads(self.index_path.read_text(encoding="utf-8"))
+                self.offsets = {pid: tuple(v) for pid, v in index["offsets"].items()}
+                self._indexed_size = index["log_size"]
+                self.export_stamp = index.get("export")
+            except (ValueError, KeyError) as exc:
+                LOGGER.warning("Rebuilding unreadable gold index %s (%s)", self.index_path, exc)
+                self.offsets, self._indexed_size = {}, 0
+        if self._indexed_size > self.log_path.stat().st_size:  # log replaced behind our back
+            self.offsets, self._indexed_size = {}, 0
+        self._end = self._indexed_size
+        self._replay()
+
+    def _replay(self):
+        """Index the complete records from ``_end`` to the end of the log.
+
+        A trailing partial line is left alone: it is either a concurrent
+        append in progress or a crashed one, which only a writer may truncate
+        (``_writing``).
+        """
+        with open(self.log_path, "rb") as f:
+            f.seek(self._end)
+            pos = self._end
+            for line in f:
+                if not line.endswith(b"\n"):
+                    LOGGER.debug("Skipping partial record at byte %d of %s", pos, self.log_path)
+                    break
+                self._apply(json.loads(line), pos, len(line))
+                pos += len(line)
+        self._end = pos
+        if pos - self._indexed_size >= CHECKPOINT_BYTES:
+            self.checkpoint()
+
+    def _apply(self, record: Dict, offset: int, length: int):
+        if record.get("deleted"):
+            self.offsets.pop(record["pid"], None)
+        else:
+            self.offsets[record["pid"]] = (offset, length)
+
+    def checkpoint(self):
+        """Persist the in-memory index (not needed for correctness, only for fast opens)."""
+        size = self._end  # not the file size: a partial record past it may still be in flight
+        payload = json.dumps({"log_size": size, "offsets": self.offsets, "export": self.export_stamp},
+                             ensure_ascii=False)
+        atomic_write(self.index_path, lambda f: f.write(payload.encode("utf-8")))
+        self._indexed_size = size
+
+    # ----- Writes -----
+    @contextmanager
+    def _writing(self):
+        """Hold the store lock; index records appended since, truncate a torn tail (crash mid-append)."""
+        with _locked(self.dir / LOCK_NAME):
+            self._replay()
+            if self.log_path.stat().st_size > self._end:
+                LOGGER.warning("Truncating torn record at byte %d of %s", self._end, self.log_path)
+                with open(self.log_path, "rb+") as f:
+                    f.truncate(self._end)
+            yield
+
+    def _append(self, records: List[Tuple[Dict, bytes]]):
+        if not records:
+            return
+        with self._writing():
+            with open(self.log_path, "ab") as f:
+                offset = f.tell()
+                f.write(b"".join(line for _, line in records))
+                f.flush()
+                os.fsync(f.fileno())
+        for record, line in records:
+            self._apply(record, offset, len(line))
+            offset += len(line)
+        self._end = offset
+        if offset - self._indexed_size >= CHECKPOINT_BYTES:
+            self.checkpoint()
+
+    def upsert(self, items: Union[Dict[str, Dict], Iterable[Tuple[str, Dict]]]) -> int:
+        """Insert or replace paragraphs; returns the number written."""
+        pairs = items.items() if isinstance(items, dict) else items
+        records = [({"pid": pid}, _record(pid, doc)) for pid, doc in pairs]
+        self._append(records)
+        return len(records)
+
+    def delete(self, pids: Iterable[str]) -> int:
+        """Remove paragraphs (tombstones); returns the number actually present."""
+        present = [pid for pid in dict.fromkeys(pids) if pid in self.offsets]
+        records = []
+        for pid in present:
+            record = {"pid": pid, "deleted": True}
+            records.append((record, (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")))
+        self._append(records)
+        return len(present)
+
+    def compact(self):
+        """Rewrite the log with live records only, then checkpoint the index."""
+        offsets: Dict[str, Tuple[int, int]] = {}
+
+        def write(out):
+            pos = 0
+            with open(self.log_path, "rb") as src:
+                for pid, (offset, length) in self.offsets.items():
+                    src.seek(offset)
+                    out.write(src.read(length))
+                    offsets[pid] = (pos, length)
+                    pos += length
+
+        with self._writing():
+            before = self._end
+            atomic_write(self.log_path, write)
+            self.offsets = offsets
+            self._end = sum(length for _, length in offsets.values())
+            self.checkpoint()
+        LOGGER.info("Compacted %s: %d → %d bytes", self.log_path, before, self._indexed_size)
+
+    # ----- Reads -----
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __contains__(self, pid: str) -> bool:
+        return pid in self.offsets
+
+    def pids(self) -> List[str]:
+        return list(self.offsets)
+
+    def get(self, pid: str, default=None):
+        if pid not in self.offsets:
+            return default
+        with open(self.log_path, "rb") as f:
+            return self._read(f, pid)
+
+    def _read(self, f, pid: str) -> Dict:
+        offset, length = self.offsets[pid]
+        f.seek(offset)
+        return json.loads(f.read(length))["doc"]
+
+    def items(self, pids: Iterable[str] = None) -> Iterator[Tuple[str, Dict]]:
+        """Yield ``(pid, paragraph)`` in store order (or for the given ``pids``)."""
+        with open(self.log_path, "rb") as f:
+            for pid in (self.offsets if pids is None else pids):
+                if pid in self.offsets:
+                    yield pid, self._read(f, pid)
+
+    # ----- master.json compatibility -----
+    @classmethod
+    def from_json(cls, json_path: Union[str, Path], store_dir: Union[str, Path]) -> "GoldStore":
+        """Create (or extend) a store from an existing ``master.json`` (or ``master.shards``)."""
+        from src.core.streaming import iter_paragraphs
+
+        store = cls(store_dir)
+        store.upsert(dict(iter_paragraphs(str(json_path))))
+        store.checkpoint()
+        return store
+
+    def export_json(self, json_path: Union[str, Path]):
+        """Write the store as ``master.json``, streaming one paragraph at a time."""
+        atomic_write(json_path, lambda f: write_json_items(f, self.items()))
+        self.record_export(json_path)
+
+    def record_export(self, path: Union[str, Path]):
+        """Remember ``path`` (just written from the store) as the current export."""
+        self.export_stamp = file_stamp(path)
+        self.checkpoint()
+
+    def export_matches(self, path: Union[str, Path]) -> Optional[bool]:
+        """Whether ``path`` is still the last export; ``None`` if no export of ``path`` was recorded.
+
+        Size and mtime are compared first; the content is hashed only when the
+        mtime moved (e.g. the file was copied back unchanged).
+        """
+        stamp = self.export_stamp
+        if stamp is None or stamp["path"] != str(Path(path).resolve()) or not Path(path).exists():
+            return None
+        current = file_stamp(path, content=False)
+        if current["size"] != stamp["size"]:
+            return False
+        return current["mtime_ns"] == stamp["mtime_ns"] or file_stamp(path)["sha256"] == stamp["sha256"]
@@ -0,0 +1,104 @@
+#src/core/gold_update.py
+# -------------------------------------------------------------
+"""Merge human-QC'd paragraphs into the gold set (the ``update-gold`` command).
+
+Only JSON and the ``GoldStore`` log are involved, so this module and its
+imports stay free of NumPy: ``update-gold`` is the most frequent command and
+its cold start is checked by ``benchmarks/bench_import_time.py``.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from src.core.gold_store import LOG_NAME, GoldStore
+from src.core.gold_versions import GoldVersions, store_dir_of
+from src.core.shards import SHARD_SUFFIX, resolve, write_shards
+from src.core.streaming import iter_paragraphs
+from src.core.utils import load_json
+
+
+class GoldFileChanged(RuntimeError):
+    """The gold file differs from what the store last exported to it (edited outside ``update-gold``)."""
+
+
+def _matches_store(store: GoldStore, gold_path: Path) -> bool:
+    """Whether ``gold_path`` holds exactly the store's paragraphs (a stamp check when one was recorded)."""
+    matches = store.export_matches(gold_path)
+    if matches is None:  # store exported before stamps were recorded: compare the content once
+        stored = store.items()
+        matches = all(item == next(stored, None) for item in iter_paragraphs(str(gold_path)))
+        matches = matches and next(stored, None) is None
+    return matches
+
+
+def reseed(store: GoldStore, gold_path: Union[str, Path]) -> int:
+    """Make ``store`` hold exactly the paragraphs of ``gold_path``; return the number of pids changed."""
+    data = dict(iter_paragraphs(str(gold_path)))
+    changed = {pid: doc for pid, doc in data.items() if store.get(pid) != doc}
+    removed = store.delete([pid for pid in store.pids() if pid not in data])
+    store.upsert(changed)
+    return len(changed) + removed
+
+
+def update_gold(qc_file: Union[str, Path], gold_file: Union[str, Path], store_dir: Optional[Union[str, Path]] = None,
+                export: bool = True, compact: bool = False, message: str = "",
+                reseed_from_gold: bool = False) -> Dict[str, Any]:
+    """Upsert the QC'd paragraphs into the gold store (O(changed)).
+
+    The store lives in ``<gold_file dir>/store`` unless ``store_dir`` is given;
+    on first use it is seeded from the existing ``gold_file``.  With ``export``
+    the store is written back to ``gold_file`` for consumers of ``master.json``;
+    ``compact`` drops superseded records from the store log.  A ``gold_file``
+    ending in ``.shards`` is read and exported as sharded NDJSON.
+
+    A ``gold_file`` that no longer matches the store's last export (edited by
+    hand) is never overwritten: ``GoldFileChanged`` is raised, unless
+    ``reseed_from_gold`` first imports it into the store (``reseed``).
+
+    Each call records a gold version (``gold_versions.GoldVersions``): when the
+    store is seeded or re-seeded, the gold set read from ``gold_file`` first,
+    then the QC'd paragraphs that actually changed, tagged with ``message``.
+
+    Returns ``{"seeded", "reseeded", "updated", "paragraphs", "store", "gold",
+    "version", "versions"}`` (``seeded`` is the number of paragraphs imported
+    from ``gold_file``, ``None`` if the store already existed; ``reseeded`` the
+    number of pids a re-seed changed, ``None`` without one; ``gold`` is
+    ``None`` without ``export``; ``version`` is the id of the resulting
+    version and ``versions`` the length of the history).
+    """
+    qc_data = load_json(qc_file)
+    gold_path = resolve(gold_file)  # master.shards if there is no master.json
+    store_path = Path(store_dir) if store_dir else store_dir_of(gold_path)
+
+    seeded = reseeded = None
+    log_path = store_path / LOG_NAME
+    if gold_path.exists() and (not log_path.exists() or not log_path.stat().st_size):
+        store = GoldStore.from_json(gold_path, store_path)
+        seeded = len(store)
+    else:
+        store = GoldStore(store_path)
+        if export and gold_path.exists() and not _matches_store(store, gold_path):
+            if not reseed_from_gold:
+                raise GoldFileChanged(f"{gold_path} was modified since the gold store {store_path} last wrote it; "
+                                      "re-seed the store from it (--reseed) or restore it before updating")
+            reseeded = reseed(store, gold_path)
+    versions = GoldVersions(store_path)
+    if seeded is not None or reseeded is not None or not len(versions):
+        # The gold set before this QC round
+        source = "seed" if seeded is not None else "re-seed" if reseeded is not None else None
+        versions.commit(store, message=f"{source} from {gold_path.name}" if source else "existing store")
+
+    updated = store.upsert(qc_data)
+    version = versions.commit(store, pids=list(qc_data), message=message)
+    if compact:
+        store.compact()
+
+    if export:
+        if gold_path.suffix == SHARD_SUFFIX:
+            write_shards(dict(store.items()), gold_path)
+            store.record_export(gold_path)
+        else:
+            store.export_json(gold_path)
+    return {"seeded": seeded, "reseeded": reseeded, "updated": updated, "paragraphs": len(store), "store": str(store_path),
+            "gold": str(gold_path) if export else None, "version": version, "versions": len(versions)}
@@ -0,0 +1,259 @@
+#src/core/gold_versions.py
+# -------------------------------------------------------------
+"""Content-addressed versions of the gold set, stored next to the ``GoldStore``.
+
+``update-gold`` rewrites paragraphs of the store in place; every QC round also
+records a version here so older gold sets can be scored against and rounds
+compared:
+
+    <store_dir>/versions/objects/       ``GoldStore`` keyed by content hash:
+                                        one record per distinct paragraph
+    <store_dir>/versions/history.ndjson one line per version:
+        {"version": sha256, "parent": sha256 | null, "created": ..., "message": ...,
+         "paragraphs": n, "changed": {pid: hash}, "deleted": [pid, ...]}
+
+A version id is the sha256 of its parent, ``changed`` and ``deleted`` only
+(not its timestamp or message), so the same edits on top of the same parent
+always get the same id.
+
+A paragraph is stored once per distinct content (sha256 of its compact JSON),
+and a version only lists the pids whose hash changed since its parent, so
+storage grows with the edits, not with the size of the gold set.  The
+``pid -> hash`` manifest of a version is rebuilt by replaying the history up
+to it (dict updates, no paragraph is read); paragraph order follows the
+``GoldStore`` / ``master.json`` semantics.
+
+Versions are referred to by ``"latest"``, by their 1-based number in the
+history, or by a unique prefix of their hash.  ``diff`` compares two
+manifests by hash and reads only the paragraphs that differ, matching their
+events by ``id``.
+
+Only JSON and hashing are involved: ``update-gold`` records a version without
+loading NumPy.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from src.core.gold_store import GoldStore
+
+LOGGER = logging.getLogger(__name__)
+
+VERSIONS_DIR = "versions"
+OBJECTS_DIR = "objects"
+HISTORY_NAME = "history.ndjson"
+LATEST = "latest"
+EVENT_ATTRIBUTES = ("event_type", "event_subtype", "trigger", "modality", "polarity", "arguments", "coreference")
+
+
+def content_hash(doc: Dict) -> str:
+    """sha256 of the paragraph's compact JSON (key order preserved)."""
+    blob = json.dumps(doc, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(blob).hexdigest()
+
+
+def store_dir_of(gold_path: Union[str, Path]) -> Path:
+    """Default store of a gold file: ``<gold dir>/store`` (as in ``gold_update.update_gold``)."""
+    return Path(gold_path).parent / "store"
+
+
+class GoldVersions:
+    """History of gold-set versions with structurally shared paragraphs."""
+
+    def __init__(self, store_dir: Union[str, Path]):
+        self.dir = Path(store_dir) / VERSIONS_DIR
+        self.history_path = self.dir / HISTORY_NAME
+        self._objects: Optional[GoldStore] = None
+        self.history: List[Dict[str, Any]] = self._read_history()
+
+    @property
+    def objects(self) -> GoldStore:
+        if self._objects is None:  # opened on first use: reading a missing history creates nothing
+            self._objects = GoldStore(self.dir / OBJECTS_DIR)
+        return self._objects
+
+    def _read_history(self) -> List[Dict[str, Any]]:
+        if not self.history_path.exists():
+            return []
+        history = []
+        with open(self.history_path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):  # torn append: the version was never completed
+                    LOGGER.warning("Ignoring torn version record in %s", self.history_path)
+                    break
+                history.append(json.loads(line))
+        return history
+
+    def __len__(self) -> int:
+        return len(self.history)
+
+    # ----- Recording -----
+    def commit(self, store: GoldStore, pids: Optional[Iterable[str]] = None, message: str = "") -> Optional[str]:
+        """Record the current content of ``store`` as a new version; return its id.
+
+        ``pids`` restricts the comparison with the latest version to the
+        paragraphs that may have changed (e.g. the QC sample just upserted),
+        so recording costs O(changed); ``None`` compares the whole store, as
+        does the first version.  Returns the latest id unchanged (``None`` if
+        there is none) when nothing differs.
+        """
+        parent = self.history[-1]["version"] if self.history else None
+        current = self.manifest(parent) if parent else {}
+        if pids is None or parent is None:
+            candidates = store.pids() + [pid for pid in current if pid not in store]
+        else:
+            candidates = list(dict.fromkeys(pids))
+
+        changed: Dict[str, str] = {}
+        new_objects: Dict[str, Dict] = {}
+        for pid, doc in store.items(candidates):
+            digest = content_hash(doc)
+            if current.get(pid) != digest:
+                changed[pid] = digest
+                if digest not in self.objects:
+                    new_objects[digest] = doc
+        deleted = [pid for pid in candidates if pid in current and pid not in store]
+        if not changed and not deleted:
+            return parent
+
+        content = {"parent": parent, "changed": changed, "deleted": deleted}
+        version = hashlib.sha256(json.dumps(content, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+        record = {"version": version, "parent": parent, "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                  "message": message, "paragraphs": len(store), "changed": changed, "deleted": deleted}
+
+        # Objects first: a version line never refers to a paragraph that is not on disk
+        self.objects.upsert(new_objects)
+        with open(self.history_path, "ab") as f:
+            f.write((json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8"))
+            f.flush()
+            os.fsync(f.fileno())
+        self.history.append(record)
+        LOGGER.info("Gold version %s: %d changed, %d deleted, %d new objects", version[:12], len(changed),
+                    len(deleted), len(new_objects))
+        return version
+
+    # ----- Lookup -----
+    def position(self, ref: Optional[str] = LATEST) -> int:
+        """Index in ``history`` of ``ref`` (``"latest"``, 1-based number or unique hash prefix)."""
+        if not self.history:
+            raise ValueError(f"No gold versions recorded in {self.dir}")
+        ref = str(LATEST if ref is None else ref)
+        if ref == LATEST:
+            return len(self.history) - 1
+        if ref.isdigit() and len(ref) < 8:  # numbers, not short hashes made of digits
+            number = int(ref)
+            if not 1 <= number <= len(self.history):
+                raise ValueError(f"Gold version {number} out of range 1..{len(self.history)}")
+            return number - 1
+        matches = [i for i, record in enumerate(self.history) if record["version"].startswith(ref)]
+        if len(matches) != 1:
+            raise ValueError(f"{'Ambiguous' if matches else 'Unknown'} gold version {ref!r}")
+        return matches[0]
+
+    def version_id(self, ref: Optional[str] = LATEST) -> str:
+        return self.history[self.position(ref)]["version"]
+
+    def manifest(self, ref: Optional[str] = LATEST) -> Dict[str, str]:
+        """``{pid: content hash}`` of a version, in paragraph order."""
+        manifest: Dict[str, str] = {}
+        for record in self.history[:self.position(ref) + 1]:
+            for pid in record["deleted"]:
+                manifest.pop(pid, None)
+            manifest.update(record["changed"])
+        return manifest
+
+    def paragraphs(self, ref: Optional[str] = LATEST) -> Iterator[Tuple[str, Dict]]:
+        """Yield ``(pid, paragraph)`` of a version (a ``streaming.iter_paragraphs`` drop-in).
+
+        Raises ``ValueError`` if a paragraph of the version is missing from the object store.
+        """
+        manifest = self.manifest(ref)
+        objects = self.objects
+        missing = [pid for pid, digest in manifest.items() if digest not in objects]
+        if missing:
+            raise ValueError(f"Gold version {self.version_id(ref)[:12]} refers to {len(missing)} paragraph(s) "
+                             f"missing from {objects.dir} (e.g. {missing[0]!r})")
+        # Every hash resolves, so objects.items yields exactly one record per pid, in manifest order
+        for pid, (_, doc) in zip(manifest, objects.items(manifest.values())):
+            yield pid, doc
+
+    def load(self, ref: Optional[str] = LATEST) -> Dict[str, Dict]:
+        return dict(self.paragraphs(ref))
+
+    # ----- Diff -----
+    def diff(self, old_ref: str, new_ref: Optional[str] = LATEST) -> Dict[str, Any]:
+        """Paragraph-, event- and attribute-level changes from ``old_ref`` to ``new_ref``."""
+        old, new = self.manifest(old_ref), self.manifest(new_ref)
+        added = [pid for pid in new if pid not in old]
+        removed = [pid for pid in old if pid not in new]
+        changed = [pid for pid in new if pid in old and old[pid] != new[pid]]
+
+        events = {"added": 0, "removed": 0, "changed": 0}
+        attributes = dict.fromkeys(EVENT_ATTRIBUTES, 0)
+        details: Dict[str, Dict] = {}
+        for pid in added:
+            events["added"] += len(self.objects.get(new[pid]).get("event_mentions", []))
+        for pid in removed:
+            events["removed"] += len(self.objects.get(old[pid]).get("event_mentions", []))
+        for pid in changed:
+            detail = event_diff(self.objects.get(old[pid]), self.objects.get(new[pid]))
+            events["added"] += len(detail["added"])
+            events["removed"] += len(detail["removed"])
+            events["changed"] += len(detail["changed"])
+            for attrs in detail["changed"].values():
+                for attr in attrs:
+                    attributes[attr] += 1
+            details[pid] = detail
+
+        return {
+            "from": self.version_id(old_ref),
+            "to": self.version_id(new_ref),
+            "paragraphs": {"added": added, "removed": removed, "changed": len(changed),
+                           "unchanged": sum(1 for pid in new if old.get(pid) == new[pid])},
+            "events": events,
+            "attributes": {attr: n for attr, n in attributes.items() if n},
+            "changed": details,
+        }
+
+
+def _event_fields(mention: Dict) -> Dict[str, Any]:
+    factuality = mention.get("factuality") or {}
+    return {
+        "event_type": mention.get("event_type"),
+        "event_subtype": mention.get("event_subtype"),
+        "trigger": (mention.get("trigger") or {}).get("text"),
+        "modality": factuality.get("modality"),
+        "polarity": factuality.get("polarity"),
+        "arguments": sorted(f"{arg.get('role')}={arg.get('text')}" for arg in mention.get("arguments") or ()),
+        "coreference": sorted(mention.get("coreferent_event_triggers") or ()),
+    }
+
+
+def event_diff(old_doc: Dict, new_doc: Dict) -> Dict[str, Any]:
+    """Events of two versions of a paragraph matched by ``id``: added / removed ids and changed attributes."""
+    old_events, new_events = {}, {}
+    for events, doc in ((old_events, old_doc), (new_events, new_doc)):
+        for mention in doc.get("event_mentions", []):
+            events.setdefault(mention["id"], mention)  # first mention of an id, as in EventTableBuilder
+    changed = {}
+    for event_id in old_events.keys() & new_events.keys():
+        before, after = _event_fields(old_events[event_id]), _event_fields(new_events[event_id])
+        attrs = {attr: [before[attr], after[attr]] for attr in EVENT_ATTRIBUTES if before[attr] != after[attr]}
+        if attrs:
+            changed[event_id] = attrs
+    return {
+        "added": [event_id for event_id in new_events if event_id not in old_events],
+        "removed": [event_id for event_id in old_events if event_id not in new_events],
+        "changed": {event_id: changed[event_id] for event_id in new_events if event_id in changed},
+    }
+
+
+def versions_for(gold_path: Union[str, Path], store_dir: Optional[Union[str, Path]] = None) -> GoldVersions:
+    """Versions of the store that backs ``gold_path`` (``store_dir`` overrides the default location)."""
+    return GoldVersions(store_dir if store_dir is not None else store_dir_of(gold_path))
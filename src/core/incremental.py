@@ -0,0 +1,230 @@
+#src/core/incremental.py
+# -------------------------------------------------------------
+"""Incremental re-evaluation driven by per-paragraph fingerprints.
+
+After a QC round only a few gold paragraphs change, yet ``evaluate`` redoes
+the whole corpus.  Mention mapping never crosses paragraphs (candidates share
+``doc_id``), so every ``evaluate()`` number is a ratio of per-paragraph sums
+(``significance.STATISTICS``: dice mass, mapped counts, attribute matches)
+and ``metrics.per_type_precision`` is a ratio of per-paragraph TP / FP counts.
+
+``IncrementalEvaluator(store_dir)`` persists, for one (gold, system) pair,
+
+    <store_dir>/meta.json     {"fingerprints": {pid: [gold fp, system fp]},
+                               "totals": [...], "type_tp": {...}, "type_fp": {...},
+                               "threshold": t, "log_size": n}
+    <store_dir>/paragraphs/   per-paragraph records in a ``GoldStore`` log:
+                              {"stats": [...], "type_tp": {...}, "type_fp": {...}}
+
+A fingerprint is the BLAKE2b digest of the paragraph's canonical JSON.  On
+``evaluate(gold, system)`` both sides are fingerprinted while streaming; only
+paragraphs whose fingerprint changed on either side (or that appeared or
+disappeared) are parsed into ``EventTable``s, mapped and scored.  Their old
+records are subtracted from the running totals and the new ones added, so
+re-aggregation is O(changed); the per-paragraph log is appended to, never
+rewritten.
+
+``meta.json`` is written last and records the log size it matches; a store
+left half-updated by a crash, or built with another threshold, is rebuilt
+from scratch on the next run.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import shutil
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Set, Tuple, Union
+
+import numpy as np
+
+from src.core.event_store import EventTable, build_table
+from src.core.gold_store import GoldStore, atomic_write
+from src.core.metrics_v2 import mention_mapping
+from src.core.significance import METRICS, STATISTICS, document_statistics, metrics_from_sums
+from src.core.streaming import iter_paragraphs
+from src.core.telemetry import Telemetry, get_telemetry
+
+LOGGER = logging.getLogger(__name__)
+
+META_NAME = "meta.json"
+STORE_VERSION = 1
+
+Source = Union[str, Path, Dict[str, Dict], GoldStore]
+
+
+def fingerprint(paragraph: Dict) -> str:
+    """Content hash of a paragraph, independent of key order and whitespace."""
+    canonical = json.dumps(paragraph, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _iter_source(source: Source, pids: Optional[Set[str]] = None) -> Iterator[Tuple[str, Dict]]:
+    if isinstance(source, GoldStore):
+        yield from source.items(pids)
+        return
+    items = source.items() if isinstance(source, dict) else iter_paragraphs(str(source))
+    for pid, paragraph in items:
+        if pids is None or pid in pids:
+            yield pid, paragraph
+
+
+def paragraph_records(gold: Dict[str, Dict], system: Dict[str, Dict], threshold: float = 0.0) -> Dict[str, Dict]:
+    """``{pid: record}`` for the paragraphs of ``gold`` ∪ ``system``, scored together in one pass."""
+    gold_t = build_table(gold)
+    system_t = build_table(system, vocabs=gold_t.vocabs)
+    docs = np.unique(np.concatenate([gold_t.doc_codes, system_t.doc_codes]))
+    stats = document_statistics(gold_t, system_t, mention_mapping(gold_t, system_t, threshold=threshold), docs)
+    type_tp, type_fp = _type_counts(gold_t, system_t, docs)
+
+    doc_strings = gold_t.vocabs["doc_id"].strings
+    records = {}
+    for row, code in enumerate(docs.tolist()):
+        pid = doc_strings[code]
+        records[pid] = {"stats": stats[row].tolist(), "type_tp": type_tp.get(row, {}), "type_fp": type_fp.get(row, {})}
+    return records
+
+
+def _type_counts(gold: EventTable, system: EventTable, docs: np.ndarray) -> Tuple[Dict, Dict]:
+    """Per-document ``per_type_precision`` TP / FP: system events of gold paragraphs, matched on (trigger, type)."""
+    width_t = np.int64(max(len(gold.vocabs["trigger"]), 1))
+    width_y = np.int64(max(len(gold.vocabs["type"]), 1))
+
+    def keys(table):
+        doc = np.searchsorted(docs, table.columns["doc_id"]).astype(np.int64)
+        return (doc * width_t + table.columns["trigger"]) * width_y + table.columns["type"], doc
+
+    gold_keys, _ = keys(gold)
+    sys_keys, sys_doc = keys(system)
+    scored = np.isin(sys_doc, np.searchsorted(docs, gold.doc_codes))  # only paragraphs present in gold
+    hit = np.isin(sys_keys, gold_keys)
+    sys_type = system.columns["type"]
+    type_strings = gold.vocabs["type"].strings
+    out = ({}, {})
+    for counts, mask in zip(out, (scored & hit, scored & ~hit)):
+        cells, n = np.unique(sys_doc[mask] * width_y + sys_type[mask], return_counts=True)
+        for cell, count in zip(cells.tolist(), n.tolist()):
+            counts.setdefault(cell // int(width_y), {})[type_strings[cell % int(width_y)]] = count
+    return out
+
+
+def _add_types(total: Dict[str, int], part: Dict[str, int], sign: int):
+    for key, value in part.items():
+        total[key] = total.get(key, 0) + sign * value
+        if total[key] == 0:
+            del total[key]
+
+
+class IncrementalEvaluator:
+    """Per-paragraph sufficient statistics of one (gold, system) pair, kept up to date on disk."""
+
+    def __init__(self, store_dir: Union[str, Path], threshold: float = 0.0):
+        self.dir = Path(store_dir)
+        self.meta_path = self.dir / META_NAME
+        self.threshold = threshold
+        self.meta = self._load_meta()
+        self.store = GoldStore(self.dir / "paragraphs")
+        if self.store.log_path.stat().st_size != self.meta["log_size"]:
+            LOGGER.warning("Incremental store %s is out of sync with its meta file – rebuilding", self.dir)
+            self.reset()
+
+    def _empty_meta(self) -> Dict:
+        return {"version": STORE_VERSION, "threshold": self.threshold, "log_size": 0, "fingerprints": {},
+                "totals": [0.0] * len(STATISTICS), "type_tp": {}, "type_fp": {}}
+
+    def _load_meta(self) -> Dict:
+        if self.meta_path.exists():
+            try:
+                meta = json.loads(self.meta_path.read_text(encoding="utf-8"))
+                if meta.get("version") == STORE_VERSION and meta.get("threshold") == self.threshold:
+                    return meta
+                LOGGER.info("Incremental store %s was built with other settings – rebuilding", self.dir)
+            except ValueError as exc:
+                LOGGER.warning("Unreadable incremental meta %s (%s) – rebuilding", self.meta_path, exc)
+        shutil.rmtree(self.dir / "paragraphs", ignore_errors=True)
+        return self._empty_meta()
+
+    def reset(self):
+        """Forget every stored paragraph (the next ``evaluate`` recomputes everything)."""
+        shutil.rmtree(self.dir / "paragraphs", ignore_errors=True)
+        self.store = GoldStore(self.dir / "paragraphs")
+        self.meta = self._empty_meta()
+
+    def _fingerprints(self, source: Source, side: int, seen: Dict[str, list], changed: Set[str],
+                      keep: Dict[str, Dict]):
+        stored = self.meta["fingerprints"]
+        for pid, paragraph in _iter_source(source):
+            fp = fingerprint(paragraph)
+            seen.setdefault(pid, [None, None])[side] = fp
+            if stored.get(pid, (None, None))[side] != fp:
+                changed.add(pid)
+                keep[pid] = paragraph
+
+    def evaluate(self, gold: Source, system: Source, telemetry: Optional[Telemetry] = None) -> Dict:
+        """Corpus metrics (as ``evaluate``) plus ``Per_Type_Precision``, recomputing only changed paragraphs."""
+        telemetry = get_telemetry(telemetry)
+        stored = self.meta["fingerprints"]
+
+        with telemetry.phase("fingerprint") as counts:
+            seen: Dict[str, list] = {}
+            changed: Set[str] = set()
+            kept: Tuple[Dict, Dict] = ({}, {})
+            self._fingerprints(gold, 0, seen, changed, kept[0])
+            self._fingerprints(system, 1, seen, changed, kept[1])
+            changed.update(pid for pid, fps in seen.items() if stored.get(pid) != fps)  # dropped from one side
+            removed = [pid for pid in stored if pid not in seen]
+            counts["paragraphs"] = len(seen)
+            counts["changed"] = len(changed)
+            counts["removed"] = len(removed)
+
+        with telemetry.phase("recompute") as counts:
+            # The unchanged side of a changed paragraph was not kept: read just those back.
+            for side, source in enumerate((gold, system)):
+                missing = {pid for pid in changed if seen[pid][side] is not None and pid not in kept[side]}
+                if missing:
+                    kept[side].update(_iter_source(source, missing))
+            records = paragraph_records(kept[0], kept[1], self.threshold) if changed else {}
+            counts["paragraphs"] = len(records)
+
+        with telemetry.phase("aggregate") as counts:
+            totals = np.array(self.meta["totals"], dtype=np.float64)
+            type_tp, type_fp = self.meta["type_tp"], self.meta["type_fp"]
+            stale = [pid for pid in list(changed) + removed if pid in self.store]
+            for _, old in self.store.items(stale):
+                totals -= old["stats"]
+                _add_types(type_tp, old["type_tp"], -1)
+                _add_types(type_fp, old["type_fp"], -1)
+            for record in records.values():
+                totals += record["stats"]
+                _add_types(type_tp, record["type_tp"], 1)
+                _add_types(type_fp, record["type_fp"], 1)
+            self.store.delete(removed)
+            self.store.upsert(records)
+            self.store.checkpoint()
+            for pid in removed:
+                del stored[pid]
+            for pid in changed:
+                stored[pid] = seen[pid]
+            self.meta.update(totals=totals.tolist(), log_size=self.store.log_path.stat().st_size)
+            payload = json.dumps(self.meta, ensure_ascii=False)
+            atomic_write(self.meta_path, lambda f: f.write(payload.encode("utf-8")))
+            counts["subtracted"] = len(stale)
+            counts["added"] = len(records)
+
+        return self.results()
+
+    def results(self) -> Dict:
+        """Metrics from the stored totals (no re-reading)."""
+        values = metrics_from_sums(np.array(self.meta["totals"], dtype=np.float64))
+        results: Dict = {name: round(float(values[name]), 1) for name in METRICS}
+        tp, fp = self.meta["type_tp"], self.meta["type_fp"]
+        results["Per_Type_Precision"] = {t: tp.get(t, 0) / (tp.get(t, 0) + fp.get(t, 0))
+                                         for t in set(tp) | set(fp)}
+        return results
+
+
+def evaluate_incremental(gold: Source, system: Source, store_dir: Union[str, Path], threshold: float = 0.0,
+                         telemetry: Optional[Telemetry] = None) -> Dict:
+    """One-shot ``IncrementalEvaluator(store_dir, threshold).evaluate(gold, system)``."""
+    return IncrementalEvaluator(store_dir, threshold).evaluate(gold, system, telemetry=telemetry)
@@ -0,0 +1,93 @@
+#src/core/kappa.py
+# -------------------------------------------------------------
+"""Batched Cohen's κ for paragraph-level trigger agreement.
+
+``prepare_QC_samples`` used to call sklearn's ``cohen_kappa_score`` once per
+paragraph on two tiny 0/1 vectors.  For binary labels κ is a closed form of the
+2×2 confusion counts::
+
+    N   = c11 + c10 + c01 + c00
+    p_o = (c10 + c01) / N                                   # observed disagreement
+    p_e = ((c00 + c10)(c10 + c11) + (c01 + c11)(c00 + c01)) / N²
+    κ   = 1 - p_o / p_e
+
+(exactly sklearn's computation with ``labels=[0, 1]``).  Here the counts of
+every paragraph are derived at once from integer-coded ``(pid, trigger, type)``
+keys and all κ values come out of one vectorized expression.
+
+Edge cases follow ``utils.safe_kappa``: a paragraph with no labels on either
+side, or whose vectors are uniform (nothing in ``a - b`` or ``b - a``), has
+κ = 1.0.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+
+from src.core.cache import load_events
+from src.core.event_store import EventTable, Vocab, build_table, lookup_table
+
+AgentData = Union[Dict, str, Path, EventTable]
+
+
+def binary_kappa(c11, c10, c01, c00=0) -> np.ndarray:
+    """Cohen's κ for arrays of 2×2 counts (``c10``: a=1, b=0; ``c01``: a=0, b=1)."""
+    c11, c10, c01, c00 = (np.asarray(c, dtype=np.float64) for c in (c11, c10, c01, c00))
+    n = c11 + c10 + c01 + c00
+    disagree = c10 + c01
+    # Uniform vectors: all zeros (n == 0 or only c00) or all ones (only c11).
+    uniform = (disagree == 0) & ((c11 == 0) | (c00 == 0))
+    expected = ((c00 + c10) * (c10 + c11) + (c01 + c11) * (c00 + c01)) / np.where(n > 0, n, 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        kappa = 1.0 - disagree / expected
+    return np.where(uniform, 1.0, kappa)
+
+
+def as_table(data: AgentData) -> EventTable:
+    """Accept loaded JSON, an ``EventTable`` or a path (read through the event cache)."""
+    if isinstance(data, EventTable):
+        return data
+    if isinstance(data, (str, Path)):
+        return load_events(data)
+    return build_table(data)
+
+
+def trigger_label_counts(agent_a: AgentData, agent_b: AgentData) -> Tuple[List[str], np.ndarray, np.ndarray, np.ndarray]:
+    """Per shared paragraph: ``(pids, |a∩b|, |a-b|, |b-a|)`` over ``(trigger.lower(), event_type)`` labels.
+
+    Paragraphs are those present on both sides (in ``agent_a`` order), including
+    paragraphs without events.
+    """
+    ta, tb = as_table(agent_a), as_table(agent_b)
+
+    # One shared code space for the three key fields, without touching either table's vocabs.
+    docs, triggers, types = Vocab(), Vocab(), Vocab()
+    coded = []
+    for t in (ta, tb):
+        doc_lut = lookup_table(t.vocabs["doc_id"], docs)
+        coded.append((doc_lut[t.doc_codes],
+                      doc_lut[t.columns["doc_id"]],
+                      lookup_table(t.vocabs["trigger"], triggers, str.lower)[t.columns["trigger"]],
+                      lookup_table(t.vocabs["type"], types)[t.columns["type"]]))
+    n_docs, n_types = len(docs), max(len(types), 1)
+    width = np.int64(max(len(triggers), 1)) * n_types  # keys per document
+
+    keys_a, keys_b = (np.unique(doc.astype(np.int64) * width + trig.astype(np.int64) * n_types + typ)
+                      for _, doc, trig, typ in coded)
+    common = np.intersect1d(keys_a, keys_b, assume_unique=True)
+    n_a = np.bincount(keys_a // width, minlength=n_docs)
+    n_b = np.bincount(keys_b // width, minlength=n_docs)
+    both = np.bincount(common // width, minlength=n_docs)
+
+    docs_a, docs_b = coded[0][0], coded[1][0]
+    shared = docs_a[np.isin(docs_a, docs_b)]
+    pids = [docs.strings[d] for d in shared.tolist()]
+    return pids, both[shared], (n_a - both)[shared], (n_b - both)[shared]
+
+
+def paragraph_kappas(agent_a: AgentData, agent_b: AgentData) -> Tuple[List[str], np.ndarray]:
+    """``(pids, kappas)`` for every paragraph shared by the two agents, in one vectorized pass."""
+    pids, both, a_only, b_only = trigger_label_counts(agent_a, agent_b)
+    return pids, binary_kappa(both, a_only, b_only)
@@ -0,0 +1,189 @@
+#src/core/matching.py
+# -------------------------------------------------------------
+"""Greedy mention matching engine (Algorithm 1).
+
+The original loop picked the best pair with a linear ``max`` scan and removed
+it with ``list.pop`` on every iteration, i.e. O(P²) in the number of scored
+pairs.  Here the candidates are heapified once and popped in descending score
+order, which gives O(P + k·log P) for k popped pairs (O(P log P) worst case).
+
+Tie order is preserved: ``max`` returns the *first* maximal element of the
+remaining list and ``pop`` keeps the relative order of the rest, so equal
+scores are consumed in insertion order.  The heap key ``(-score, position)``
+reproduces exactly that order.
+
+Candidate pairs come from one of two blockers (``MATCHING_MODES``):
+
+*   ``"id"`` — the paper's constraint, same ``(doc_id, event_id)``
+    (``id_candidates``);
+*   ``"overlap"`` — same ``doc_id`` and at least one shared trigger token,
+    whatever the event ids (``overlap_candidates``).  Agents renumber and add
+    events, so ids rarely line up between ``agentA`` and ``agentB``.  An
+    inverted index ``(doc_id, token) -> gold rows`` is probed with every
+    system token; pairs with zero overlap are never generated, so the work is
+    linear in the number of (pair, shared token) hits, not quadratic per
+    document.  The hit count of a pair is its intersection size, which gives
+    the Dice score without touching the token rows again.
+
+Both emit pairs gold-major, then by system row, so ``greedy_match`` breaks
+ties the same way in either mode.
+"""
+from __future__ import annotations
+
+import heapq
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from src.core.event_store import TOKENS, EventTable
+
+Mapping = Dict[int, List[Tuple[int, float]]]
+
+MATCHING_MODES = ("id", "overlap")
+
+
+def greedy_match(score_list: Iterable[Tuple[int, int, float]], threshold: float = 0.0) -> Mapping:
+    """Return ``{gold_id: [(system_id, score), ...]}`` following Algorithm 1.
+
+    Args:
+        score_list: candidate ``(gold_id, system_id, score)`` triples in the
+            order they were scored (this order breaks ties).
+        threshold: minimum score for a pair to be mapped.  Once the best
+            remaining score drops below it, no later pair can qualify and the
+            loop stops early.
+    """
+    heap = [(-score, pos, gm, sn) for pos, (gm, sn, score) in enumerate(score_list)]
+    heapq.heapify(heap)
+
+    mapping: Mapping = {}
+    used_sys = set()
+    while heap:
+        neg_score, _, gm, sn = heapq.heappop(heap)
+        best_score = -neg_score
+        if best_score < threshold:
+            break
+        if sn in used_sys:
+            continue
+        mapping.setdefault(gm, []).append((sn, best_score))
+        used_sys.add(sn)
+    return mapping
+
+
+def id_candidates(gold: EventTable, system: EventTable) -> Tuple[np.ndarray, np.ndarray]:
+    """Candidate ``(gids, sids)`` pairs sharing the same ``(doc_id, event_id)``.
+
+    Both tables must share vocabs.  Pairs come out ordered by gold id, then by
+    system id, i.e. the order in which the dict-based loop used to score them.
+    """
+    width = max(len(gold.vocabs["event_id"]), 1)
+    gkey = gold.columns["doc_id"].astype(np.int64) * width + gold.columns["event_id"]
+    skey = system.columns["doc_id"].astype(np.int64) * width + system.columns["event_id"]
+    order = np.argsort(skey, kind="stable")
+    sorted_keys = skey[order]
+    lo = np.searchsorted(sorted_keys, gkey, side="left")
+    counts = np.searchsorted(sorted_keys, gkey, side="right") - lo
+    gids = np.repeat(np.arange(len(gkey)), counts)
+    offsets = np.arange(int(counts.sum())) - np.repeat(np.cumsum(counts) - counts, counts)
+    return gids, order[np.repeat(lo, counts) + offsets]
+
+
+def _token_keys(table: EventTable, width: np.int64) -> Tuple[np.ndarray, np.ndarray]:
+    """``doc_id * width + token`` key and owning row of every trigger token of ``table``."""
+    rows = np.repeat(np.arange(len(table)), table.row_lengths())
+    return table.columns["doc_id"].astype(np.int64)[rows] * width + table.token_ids, rows
+
+
+def _probe_postings(sorted_keys: np.ndarray, posting_rows: np.ndarray, skeys: np.ndarray, srows: np.ndarray,
+                    n_system: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Join system token keys with the sorted gold postings; return unique ``(gids, sids, shared)``."""
+    lo = np.searchsorted(sorted_keys, skeys, side="left")
+    counts = np.searchsorted(sorted_keys, skeys, side="right") - lo
+    offsets = np.arange(int(counts.sum())) - np.repeat(np.cumsum(counts) - counts, counts)
+    hits = posting_rows[np.repeat(lo, counts) + offsets] * np.int64(max(n_system, 1)) + np.repeat(srows, counts)
+    pairs, shared = np.unique(hits, return_counts=True)  # sorted: gold-major, then system row
+    return pairs // max(n_system, 1), pairs % max(n_system, 1), shared
+
+
+def overlap_dice(gold: EventTable, system: EventTable, gids: np.ndarray, sids: np.ndarray,
+                 shared: np.ndarray) -> np.ndarray:
+    """Dice of each pair from its shared-token count (same values as ``dice_many``)."""
+    total = gold.row_lengths()[gids] + system.row_lengths()[sids]
+    return np.divide(2 * shared, total, out=np.zeros(len(gids), dtype=np.float64), where=total > 0)
+
+
+def overlap_candidates(gold: EventTable, system: EventTable) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Pairs in the same document sharing at least one trigger token, with the shared-token count.
+
+    Both tables must share vocabs.  Returns ``(gids, sids, shared)`` ordered
+    by gold id, then by system id.
+    """
+    width = np.int64(max(len(gold.vocabs[TOKENS]), 1))
+    gkeys, grows = _token_keys(gold, width)
+    order = np.argsort(gkeys, kind="stable")
+    skeys, srows = _token_keys(system, width)
+    return _probe_postings(gkeys[order], grows[order], skeys, srows, len(system))
+
+
+class GoldIndex:
+    """``(doc_id, event_id)`` key index of one gold table, built once and probed by many systems.
+
+    ``candidates(system)`` returns the same pairs, in the same order, as
+    ``id_candidates(gold, system)``; ``stats(system)`` the same counts as
+    ``metrics_v2.id_matching_stats``; ``overlaps(system)`` the same as
+    ``overlap_candidates(gold, system)``, from a token index built on first
+    use.  Systems must be recoded into
+    ``gold.vocabs``; codes interned after the index was built belong to no
+    gold event and never match.
+    """
+
+    def __init__(self, gold: EventTable):
+        self.gold = gold
+        self.width = np.int64(max(len(gold.vocabs["event_id"]), 1))
+        self.n_doc_codes = len(gold.vocabs["doc_id"])
+        keys = gold.columns["doc_id"].astype(np.int64) * self.width + gold.columns["event_id"]
+        self.order = np.argsort(keys, kind="stable")
+        self.sorted_keys = keys[self.order]
+        self.pairs = np.unique(keys)
+        self.docs = np.unique(gold.columns["doc_id"])
+        self._postings: Optional[Tuple[np.ndarray, np.ndarray, np.int64]] = None
+
+    def _keys(self, system: EventTable) -> np.ndarray:
+        doc, event = system.columns["doc_id"].astype(np.int64), system.columns["event_id"]
+        keys = doc * self.width + event
+        keys[(event >= self.width) | (doc >= self.n_doc_codes)] = -1
+        return keys
+
+    def candidates(self, system: EventTable) -> Tuple[np.ndarray, np.ndarray]:
+        skey = self._keys(system)
+        lo = np.searchsorted(self.sorted_keys, skey, side="left")
+        counts = np.searchsorted(self.sorted_keys, skey, side="right") - lo
+        sids = np.repeat(np.arange(len(skey)), counts)
+        offsets = np.arange(int(counts.sum())) - np.repeat(np.cumsum(counts) - counts, counts)
+        gids = self.order[np.repeat(lo, counts) + offsets]
+        order = np.lexsort((sids, gids))  # gold-major, like id_candidates
+        return gids[order], sids[order]
+
+    def overlaps(self, system: EventTable) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        if self._postings is None:
+            width = np.int64(max(len(self.gold.vocabs[TOKENS]), 1))
+            keys, rows = _token_keys(self.gold, width)
+            order = np.argsort(keys, kind="stable")
+            self._postings = (keys[order], rows[order], width)
+        sorted_keys, rows, width = self._postings
+        skeys, srows = _token_keys(system, width)
+        skeys[(system.token_ids >= width) | (system.columns["doc_id"][srows] >= self.n_doc_codes)] = -1
+        return _probe_postings(sorted_keys, rows, skeys, srows, len(system))
+
+    def stats(self, system: EventTable) -> Dict[str, int]:
+        skey = self._keys(system)
+        width = max(len(self.gold.vocabs["event_id"]), 1)
+        system_docs = np.unique(system.columns["doc_id"])
+        system_pairs = np.unique(system.columns["doc_id"].astype(np.int64) * width + system.columns["event_id"])
+        return {
+            "gold_docs": len(self.docs),
+            "system_docs": len(system_docs),
+            "common_docs": len(np.intersect1d(self.docs, system_docs, assume_unique=True)),
+            "gold_pairs": len(self.pairs),
+            "system_pairs": len(system_pairs),
+            "common_pairs": len(np.intersect1d(self.pairs, np.unique(skey[skey >= 0]), assume_unique=True)),
+        }
@@ -6,24 +6,42 @@
     It may contain paragraphs sampled từ nhiều batch.
 *   Precision‑per‑type is computed **chỉ trên** những paragraph xuất hiện trong
     master gold; prediction ngoài phạm vi này không ảnh hưởng.
-*   κ values vẫn là placeholder.
+*   κ (trigger & argument) được tính thật trên toàn batch giữa các annotator
+    (mặc định agentA vs agentB, `paths.annotator_roots`): Cohen khi có 2
+    annotator, Fleiss khi nhiều hơn (`src/core/agreement.py`).
+*   Master gold được đọc qua cache sự kiện đã parse (`src/core/cache.py`),
+    nên chỉ parse lại JSON khi nội dung file thay đổi.
 """
 from __future__ import annotations
 
-import json, logging
+import logging
+import math
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Sequence, Union
 from collections import Counter
 
+import numpy as np
+
+from src.core.agreement import agreement_kappas
+from src.core.cache import DEFAULT_CACHE_DIR, load_events
+from src.core.event_store import EventTable, build_table, translate
+from src.core.shards import resolve
+
 LOGGER = logging.getLogger(__name__)
 
-def per_type_precision(pred: dict, gold: dict) -> dict[str, float]:
+def per_type_precision(pred: Union[dict, EventTable], gold: Union[dict, EventTable]) -> dict[str, float]:
     """Return precision for each event_type.
 
     Args:
         pred: reviewed output {pid: {event_mentions:[...]}}
         gold: master gold subset (same schema)
+
+    Either argument may also be an ``EventTable`` (e.g. the cached master gold);
+    the match is then computed on integer codes instead of string tuples.
     """
+    if isinstance(pred, EventTable) or isinstance(gold, EventTable):
+        return _per_type_precision_table(pred, gold)
+
     tp, fp = Counter(), Counter()
 
     for pid, gold_obj in gold.items():
@@ -42,28 +60,86 @@ def per_type_precision(pred: dict, gold: dict) -> dict[str, float]:
         t: tp[t] / (tp[t] + fp[t]) if (tp[t] + fp[t]) else 0.0 for t in set(tp) | set(fp)
     }
 
-def _load_gold(gold_root: str = "data/gold") -> dict | None:
-    fp = Path(gold_root) / "master.json"
+def _per_type_precision_table(pred: Union[dict, EventTable], gold: Union[dict, EventTable]) -> dict[str, float]:
+    """``per_type_precision`` on ``EventTable``s, in the prediction's code space."""
+    pred_t = pred if isinstance(pred, EventTable) else build_table(pred)
+    gold_t = gold if isinstance(gold, EventTable) else build_table(gold)
+
+    # Gold codes translated into pred's vocabs (-1 = never seen in pred, cannot match).
+    g_doc = translate(gold_t.vocabs["doc_id"], pred_t.vocabs["doc_id"])
+    g_trig = translate(gold_t.vocabs["trigger"], pred_t.vocabs["trigger"])
+    g_type = translate(gold_t.vocabs["type"], pred_t.vocabs["type"])
+    n_trig = np.int64(max(len(pred_t.vocabs["trigger"]), 1))
+    n_type = np.int64(max(len(pred_t.vocabs["type"]), 1))
+
+    def keys(doc, trig, typ):
+        return (doc.astype(np.int64) * n_trig + trig) * n_type + typ
+
+    gd, gr, gt = (g_doc[gold_t.columns["doc_id"]], g_trig[gold_t.columns["trigger"]],
+                  g_type[gold_t.columns["type"]])
+    known = (gd >= 0) & (gr >= 0) & (gt >= 0)
+    gold_keys = keys(gd[known], gr[known], gt[known])
+
+    pd, pr, pt = pred_t.columns["doc_id"], pred_t.columns["trigger"], pred_t.columns["type"]
+    in_scope = np.isin(pd, g_doc[gold_t.doc_codes])  # only paragraphs present in gold
+    hit = np.isin(keys(pd, pr, pt), gold_keys)
+    tp = np.bincount(pt[in_scope & hit], minlength=int(n_type)).tolist()
+    fp = np.bincount(pt[in_scope & ~hit], minlength=int(n_type)).tolist()
+
+    types = pred_t.vocabs["type"].strings
+    return {types[t]: tp[t] / (tp[t] + fp[t]) for t in range(len(types)) if tp[t] + fp[t]}
+
+def _load_gold(gold_root: str = "data/gold", cache_dir: str | None = DEFAULT_CACHE_DIR) -> EventTable | None:
+    fp = resolve(Path(gold_root) / "master.json")
     if not fp.exists():
         LOGGER.warning("Master gold file not found at %s – precision skipped", fp)
         return None
-    return json.loads(fp.read_text(encoding="utf-8"))
+    return load_events(fp, cache_dir)
+
+DEFAULT_ANNOTATOR_ROOTS = ("data/processed/agentA", "data/processed/agentB")
+
+def _load_annotators(batch_tag: str, roots: Sequence[str], cache_dir: str | None) -> List[EventTable]:
+    tables = []
+    for root in roots:
+        fp = resolve(Path(root) / f"{batch_tag}.json")
+        if not fp.exists():
+            LOGGER.warning("Annotator file not found at %s – skipped for κ", fp)
+            continue
+        tables.append(load_events(fp, cache_dir))
+    return tables
 
-def compute_agreement(reviewed: Dict, batch_tag: str, *, config: Dict) -> Dict[str, Any]:
+def compute_agreement(reviewed: Dict, batch_tag: str, *, config: Dict,
+                      annotators: Optional[Sequence[Union[dict, EventTable]]] = None,
+                      gold: Optional[Union[dict, EventTable]] = None) -> Dict[str, Any]:
     """Return QA metrics for one batch.
 
-    • Always returns placeholder κ values.
-    • Adds precision‑per‑type & low_precision_types if master gold available.
+    • trigger_kappa / arg_kappa: corpus-level κ between the annotators of the
+      batch (``annotators`` if given, else ``<root>/<batch_tag>.json`` for each
+      of ``paths.annotator_roots``); ``None`` when fewer than two are available.
+    • Adds precision‑per‑type & low_precision_types if master gold available
+      (``gold`` if given, e.g. a table shared by several batches, else
+      ``<gold_root>/master.json``).
     """
     metrics: Dict[str, Any] = {
         "batch": batch_tag,
         "n_paragraphs": len(reviewed),
-        "trigger_kappa": 0.80,  # TODO: replace with real Fleiss κ
-        "arg_kappa": 0.72,
+        "trigger_kappa": None,
+        "arg_kappa": None,
     }
 
-    gold_root = config.get("paths", {}).get("gold_root", "data/gold")
-    gold = _load_gold(gold_root)
+    paths = config.get("paths", {})
+    cache_dir = paths.get("cache_root", DEFAULT_CACHE_DIR)
+    if annotators is None:
+        tables = _load_annotators(batch_tag, paths.get("annotator_roots", DEFAULT_ANNOTATOR_ROOTS), cache_dir)
+    else:
+        tables = [a if isinstance(a, EventTable) else build_table(a) for a in annotators]
+    if len(tables) >= 2:
+        metrics.update(agreement_kappas(tables))
+    else:
+        LOGGER.warning("Need at least two annotators for κ on %s, found %d", batch_tag, len(tables))
+
+    if gold is None:
+        gold = _load_gold(paths.get("gold_root", "data/gold"), cache_dir)
     if gold is None:
         return metrics
 
@@ -74,4 +150,26 @@ def compute_agreement(reviewed: Dict, batch_tag: str, *, config: Dict) -> Dict[s
     metrics["low_precision_types"] = {t: p for t, p in prec.items() if p < threshold}
 
     LOGGER.info("Metrics for %s → %s", batch_tag, metrics)
-    return metrics
\ No newline at end of file
+    return metrics
+
+def qa_failures(metrics: Dict[str, Any], config: Dict) -> List[str]:
+    """Reasons a batch fails the QA gates in ``config['metrics']`` (empty = passed).
+
+    A configured κ gate whose κ could not be computed (fewer than two
+    annotators, or NaN) fails rather than being skipped.
+    """
+    thresholds = config.get("metrics", {})
+    reasons = []
+    for key, min_key in (("trigger_kappa", "trigger_kappa_min"), ("arg_kappa", "arg_kappa_min")):
+        if min_key not in thresholds:
+            continue
+        value = metrics.get(key)
+        if value is None or math.isnan(value):
+            reasons.append(f"{key} unavailable (need ≥2 annotators)")
+        elif value < thresholds[min_key]:
+            reasons.append(f"{key} {value:.3f} < {thresholds[min_key]}")
+
+    low_types = metrics.get("low_precision_types", {})
+    if low_types:
+        reasons.append(f"low precision for types: {list(low_types.keys())}")
+    return reasons
\ No newline at end of file
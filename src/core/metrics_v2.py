@@ -1,168 +1,154 @@
-import json
-from typing import Dict, List, Tuple, Set
-from tqdm import tqdm
+import logging
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+import numpy as np
 import time
 
-# ===================PRE-PROCESSING===================
-def extract_all_trigger_tokens(trigger: Dict) -> Set[str]:
-    tokens = set(trigger["text"].split())
-    extra_spans = trigger.get("extra_trigger_spans", [])
-    for extra in extra_spans:
-        if isinstance(extra, str):
-            tokens.update(extra.split())
-        elif isinstance(extra, dict):  # nested discontiguous
-            tokens.update(extract_all_trigger_tokens(extra)) 
-    return tokens
+from src.core import metric_kernel as kernel
+from src.core.cache import DEFAULT_CACHE_DIR, load_events
+from src.core.event_store import EventTable, EventTableBuilder, Vocab, dice_many
+from src.core.event_store import extract_all_trigger_tokens  # noqa: F401  (kept importable from here)
+from src.core.matching import MATCHING_MODES, GoldIndex, greedy_match, id_candidates, overlap_candidates, overlap_dice
+from src.core.streaming import iter_paragraphs
+from src.core.telemetry import ConsoleSink, Telemetry, get_telemetry
+from src.core.utils import load_json
+
+if TYPE_CHECKING:
+    from src.core.span_alignment import SpanTable
+
+LOGGER = logging.getLogger(__name__)
 
+# ===================PRE-PROCESSING===================
 def sample_data(json_data: Dict, sample_size: int = 500) -> Dict:
     """Sample first N documents from JSON data"""
     if len(json_data) <= sample_size:
         return json_data
     doc_keys = list(json_data.keys())[:sample_size]
     sampled_data = {key: json_data[key] for key in doc_keys}
-    print(f"Sampled {len(sampled_data)} documents from {len(json_data)} total documents")
+    LOGGER.info("Sampled %d documents from %d total documents", len(sampled_data), len(json_data))
     return sampled_data
 
 
-def parse_events(json_data: Dict) -> List[Dict]:
-    """Parse events from JSON data matching your format"""
-    events = []
-    print("Parsing events from JSON...")
-    total_docs = len(json_data)
-    with tqdm(total=total_docs, desc="Processing documents", unit="doc") as pbar:
-        for doc_id, doc in json_data.items():
-            doc_events = 0
-            for e in doc["event_mentions"]:
-                tokens = extract_all_trigger_tokens(e["trigger"])
-                events.append({
-                    "doc_id": doc_id,  
-                    "event_id": e["id"],  
-                    "tokens": tokens,
-                    "type": e["event_type"],
-                    "subtype": e["event_subtype"],
-                    "modality": e["factuality"]["modality"],
-                    "polarity": e["factuality"]["polarity"]
-                })
-                doc_events += 1
-            pbar.set_postfix(events=doc_events)
-            pbar.update(1)
-    print(f"Parsed {len(events)} events from {total_docs} documents")
+def parse_events(json_data: Union[Dict, Iterable[Tuple[str, Dict]]], vocabs: Optional[Dict[str, Vocab]] = None,
+                 telemetry: Optional[Telemetry] = None) -> EventTable:
+    """Parse events from JSON data matching your format
+
+    ``json_data`` is either the loaded ``{pid: paragraph}`` dict or an iterable of
+    ``(pid, paragraph)`` pairs such as ``streaming.iter_paragraphs(path)``; in the
+    latter case each paragraph can be freed as soon as its events are copied out.
+    Events are stored in a compact ``EventTable``; pass the ``vocabs`` of another
+    table to share its string codes.  Progress is shown only if ``telemetry``
+    asks for it.
+    """
+    builder = EventTableBuilder(vocabs)
+    if isinstance(json_data, dict):
+        total = len(json_data)
+        json_data = json_data.items()
+    else:
+        total = None
+    progress = get_telemetry(telemetry).progress(total, "Processing documents")
+    total_docs = 0
+    for doc_id, doc in json_data:
+        builder.add_doc(doc_id, doc)
+        progress.update()
+        total_docs += 1
+    progress.close()
+    events = builder.build()
+    LOGGER.debug("Parsed %d events from %d documents", len(events), total_docs)
     return events
 
 
 # ===================METRICS===================
-def dice_coefficient(set1: Set[str], set2: Set[str]) -> float:
-    intersection = len(set1 & set2)
-    return 2 * intersection / (len(set1) + len(set2)) if (set1 or set2) else 0.0
+def dice_coefficient(tokens1: Sequence[int], tokens2: Sequence[int]) -> float:
+    """Dice of two sorted, unique token-id arrays (``EventTable.tokens(i)``)."""
+    total = len(tokens1) + len(tokens2)
+    if total == 0:
+        return 0.0
+    return 2 * len(np.intersect1d(tokens1, tokens2, assume_unique=True)) / total
 
-def mention_mapping(gold: List[Dict], system: List[Dict], threshold) -> Dict[int, List[Tuple[int, float]]]:
+def mention_mapping(gold: EventTable, system: EventTable, threshold,
+                    telemetry: Optional[Telemetry] = None,
+                    index: Optional[GoldIndex] = None, matching: str = "id",
+                    spans: Optional[Tuple["SpanTable", "SpanTable"]] = None) -> Dict[int, List[Tuple[int, float]]]:
     """
     Implementation of Algorithm 1 with ID matching constraint:
     Only match events that have the same doc_id and event_id
+
+    ``matching="overlap"`` drops the event_id constraint: candidates are the
+    pairs of the same doc_id sharing a trigger token (inverted token index,
+    see ``matching.overlap_candidates``); the greedy loop is unchanged.
+
+    ``spans`` — ``(gold, system)`` ``span_alignment.SpanTable``s row-aligned
+    with the tables — scores the pairs whose triggers resolve on both sides by
+    token positions (``span_alignment.position_scores``); the other pairs keep
+    the token-set Dice.
+
+    Timed as the ``index``, ``dice`` and ``match`` phases of ``telemetry``.
+    A prebuilt ``GoldIndex`` of ``gold`` skips re-indexing when one gold
+    table is evaluated against many systems.
     """
-    print("Computing mention mapping with ID constraint...")
-    
-    # Step 1: Create index mappings for faster lookup
-    system_index = {}
-    for sid, s in enumerate(system):
-        key = (s["doc_id"], s["event_id"])
-        if key not in system_index:
-            system_index[key] = []
-        system_index[key].append(sid)
-    print(f"System index created with {len(system_index)} unique (doc_id, event_id) pairs")
-    
-    # Step 2: Compute Dice scores only for matching IDs
-    score_list = []
-    zero_score_pairs = []
-    matching_pairs = 0
-    total_possible_pairs = 0
-    print("Computing Dice scores for matching ID pairs...")
-    with tqdm(total=len(gold), desc="Processing gold events", unit="event") as pbar:
-        for gid, g in enumerate(gold):
-            gold_key = (g["doc_id"], g["event_id"])
-            total_possible_pairs += 1
-            if gold_key in system_index:
-                for sid in system_index[gold_key]:
-                    s = system[sid]
-                    score = dice_coefficient(g["tokens"], s["tokens"])
-                    matching_pairs += 1
-                    if score > 0:
-                        score_list.append((gid, sid, score))
-                    else:
-                        zero_score_pairs.append((gid, sid, g["tokens"], s["tokens"]))
-            pbar.update(1)
-    
-    print(f"Found {matching_pairs} matching ID pairs from {total_possible_pairs} gold events")
-    print(f"Found {len(score_list)} pairs with Dice score > 0")
-    print(f"Found {len(zero_score_pairs)} pairs with Dice score = 0")
-    
-    # Show some examples of zero score pairs
-    if zero_score_pairs:
-        print("\nExamples of matching ID pairs with Dice score = 0:")
-        print("-" * 60)
-        for i, (gid, sid, gold_tokens, sys_tokens) in enumerate(zero_score_pairs[:5]):  # Show first 5
-            print(f"   Pair {i+1}:")
-            print(f"     Gold {gid} ({gold[gid]['doc_id']}, {gold[gid]['event_id']}): {gold_tokens}")
-            print(f"     System {sid} ({system[sid]['doc_id']}, {system[sid]['event_id']}): {sys_tokens}")
-            print(f"     Intersection: {gold_tokens & sys_tokens}")
-            print()
-        if len(zero_score_pairs) > 5:
-            print(f"   ... and {len(zero_score_pairs) - 5} more pairs")
-    
-    # Step 3: Initialize mapping and used system mentions
-    mapping = {}  # gold_id -> [(system_id, score), ...]
-    used_sys = set()  # system mentions already used
-    
-    # Step 4: Algorithm 1 main loop
-    print("Finding optimal mappings...")
-    with tqdm(total=len(score_list), desc="Processing score pairs", unit="pair") as pbar:
-        while score_list:
-            # Find the pair with highest Dice score
-            best_idx = max(range(len(score_list)), key=lambda i: score_list[i][2])
-            gm, sn, best_score = score_list[best_idx]
-            
-            # Check if system mention not used and score >= threshold
-            if sn not in used_sys and best_score >= threshold:
-                # Add to mapping
-                if gm not in mapping:
-                    mapping[gm] = []
-                mapping[gm].append((sn, best_score))
-                # Mark system mention as used
-                used_sys.add(sn)
-            score_list.pop(best_idx)
-            pbar.update(1)
-    mapped_gold = len(mapping)
-    mapped_system = sum(len(sys_list) for sys_list in mapping.values())
-    print(f"Mapping complete: {mapped_gold}/{len(gold)} gold mentions mapped to {mapped_system}/{len(system)} system mentions")
+    if matching not in MATCHING_MODES:
+        raise ValueError(f"Unknown matching mode: {matching}")
+    telemetry = get_telemetry(telemetry)
+    system = system.recode(gold.vocabs)
+    
+    # Step 1: Candidate pairs sharing (doc_id, event_id), via a sorted key index,
+    # or sharing (doc_id, trigger token), via an inverted token index
+    with telemetry.phase("index") as counts:
+        if matching == "overlap":
+            gids, sids, shared = index.overlaps(system) if index is not None else overlap_candidates(gold, system)
+        else:
+            gids, sids = index.candidates(system) if index is not None else id_candidates(gold, system)
+        counts["candidate_pairs"] = len(gids)
+    
+    # Step 2: Compute Dice scores for all candidate pairs at once
+    with telemetry.phase("dice") as counts:
+        if spans is None:
+            resolved = np.zeros(len(gids), dtype=bool)
+            tokens = slice(None)
+        else:
+            from src.core.span_alignment import position_scores
+            resolved = spans[0].resolved[gids] & spans[1].resolved[sids]
+            tokens = ~resolved
+        scores = np.empty(len(gids), dtype=np.float64)
+        if matching == "overlap":
+            scores[tokens] = overlap_dice(gold, system, gids[tokens], sids[tokens], shared[tokens])
+        else:
+            scores[tokens] = dice_many(gold, system, gids[tokens], sids[tokens])
+        if resolved.any():
+            scores[resolved] = position_scores(spans[0], spans[1], gids[resolved], sids[resolved])
+        counts["position_pairs"] = int(resolved.sum())
+        positive = scores > 0
+        counts["pairs"] = len(gids)
+        counts["zero_score_pairs"] = len(gids) - int(positive.sum())
+    if counts["zero_score_pairs"] and LOGGER.isEnabledFor(logging.DEBUG):
+        _log_zero_score_examples(gold, system, gids[~positive], sids[~positive])
+    
+    # Step 3: Algorithm 1 main loop (heap-based, see src/core/matching.py)
+    with telemetry.phase("match") as counts:
+        score_list = zip(gids[positive].tolist(), sids[positive].tolist(), scores[positive].tolist())
+        mapping = greedy_match(score_list, threshold)  # gold_id -> [(system_id, score), ...]
+        counts["mapped_gold"] = len(mapping)
+        counts["mapped_system"] = sum(len(sys_list) for sys_list in mapping.values())
     return mapping
 
+def _log_zero_score_examples(gold, system, zero_gids, zero_sids, limit: int = 5):
+    """Debug log of matching-ID pairs whose triggers share no token."""
+    for i, (gid, sid) in enumerate(zip(zero_gids[:limit].tolist(), zero_sids[:limit].tolist())):
+        gold_tokens, sys_tokens = gold.token_strings(gid), system.token_strings(sid)
+        LOGGER.debug("Dice = 0 pair %d: gold %d (%s, %s) %s vs system %d (%s, %s) %s", i + 1,
+                     gid, gold.label("doc_id", gid), gold.label("event_id", gid), gold_tokens,
+                     sid, system.label("doc_id", sid), system.label("event_id", sid), sys_tokens)
+    if len(zero_gids) > limit:
+        LOGGER.debug("... and %d more pairs with Dice = 0", len(zero_gids) - limit)
+
 # ----- Span F1 (Algorithm 2) -----
 def compute_span_f1(gold, system, mapping):
     """
     Implementation of Algorithm 2: Compute TP and FP for span-level F1
     """
-    print("Computing Span F1...")
-    TP = 0.0
-    FP = 0.0
-    with tqdm(total=len(gold), desc="Computing Span F1", unit="mention") as pbar:
-        for gid in range(len(gold)):
-            if gid not in mapping or len(mapping[gid]) == 0:
-                FP += 1
-            else:
-                best_dice = max(dice_score for _, dice_score in mapping[gid])
-                TP += best_dice
-            pbar.update(1)
-    
-    NS = len(system)  # Number of system mentions
-    NG = len(gold)    # Number of gold mentions
-    
-    # According to the paper's formula
-    precision = TP / NS if NS > 0 else 0.0
-    recall = TP / NG if NG > 0 else 0.0
-    f1 = 2 * precision * recall / (precision + recall) if (precision + recall) > 0 else 0.0
-    
-    print(f"✅ Span F1 computed: P={precision:.3f}, R={recall:.3f}, F1={f1:.3f}")
-    return round(precision * 100, 1), round(recall * 100, 1), round(f1 * 100, 1)
+    span_p, span_r, span_f1 = kernel.span_scores(kernel.pair_columns(mapping), len(gold), len(system))
+    LOGGER.debug("Span F1: P=%s, R=%s, F1=%s", span_p, span_r, span_f1)
+    return span_p, span_r, span_f1
 
 # ----- Attribute accuracy (Algorithm 3) -----
 def compute_attribute_acc(gold, system, mapping, attr):
@@ -172,37 +158,10 @@ def compute_attribute_acc(gold, system, mapping, attr):
     if not mapping:
         return 0.0
     
-    print(f"🏷️  Computing {attr} accuracy...")
-    
-    total_accuracy = 0.0
-    
-    # For each gold mention that has mappings
-    with tqdm(total=len(mapping), desc=f"Computing {attr} accuracy", unit="mention") as pbar:
-        for gid, mapped_systems in mapping.items():
-            mg_size = len(mapped_systems)
-            if mg_size == 0:
-                pbar.update(1)
-                continue
-            
-            # Get gold attribute value
-            gold_attr_value = gold[gid][attr]
-            accuracy_for_this_gold = 0.0
-            
-            # For each system mention mapped to this gold mention
-            for sid, dice_score in mapped_systems:
-                system_attr_value = system[sid][attr]
-                
-                # If attributes match
-                if system_attr_value == gold_attr_value:
-                    accuracy_for_this_gold += 1.0 / mg_size
-            
-            total_accuracy += accuracy_for_this_gold
-            pbar.update(1)
-    
-    # Average accuracy across all gold mentions with mappings
-    num_gold_with_mapping = len(mapping)
-    result = round(total_accuracy / num_gold_with_mapping * 100, 1) if num_gold_with_mapping > 0 else 0.0
-    print(f"✅ {attr} accuracy: {result}%")
+    pairs = kernel.pair_columns(mapping)
+    gold_cols, sys_cols = kernel.encode_attributes(gold, system)
+    result = kernel.accuracy(pairs, kernel.attribute_matches(pairs, gold_cols, sys_cols, (attr,)))
+    LOGGER.debug("%s accuracy: %s%%", attr, result)
     return result
 
 # ----- Realis accuracy -----
@@ -213,39 +172,10 @@ def compute_realis_acc(gold, system, mapping):
     if not mapping:
         return 0.0
     
-    print("🔄 Computing Realis accuracy...")
-    
-    total_accuracy = 0.0
-    
-    # For each gold mention that has mappings
-    with tqdm(total=len(mapping), desc="Computing Realis accuracy", unit="mention") as pbar:
-        for gid, mapped_systems in mapping.items():
-            mg_size = len(mapped_systems)
-            if mg_size == 0:
-                pbar.update(1)
-                continue
-            
-            # Get gold realis values
-            gold_modality = gold[gid]["modality"]
-            gold_polarity = gold[gid]["polarity"]
-            accuracy_for_this_gold = 0.0
-            
-            # For each system mention mapped to this gold mention
-            for sid, dice_score in mapped_systems:
-                system_modality = system[sid]["modality"]
-                system_polarity = system[sid]["polarity"]
-                
-                # Both modality and polarity must match
-                if system_modality == gold_modality and system_polarity == gold_polarity:
-                    accuracy_for_this_gold += 1.0 / mg_size
-            
-            total_accuracy += accuracy_for_this_gold
-            pbar.update(1)
-    
-    # Average accuracy across all gold mentions with mappings
-    num_gold_with_mapping = len(mapping)
-    result = round(total_accuracy / num_gold_with_mapping * 100, 1) if num_gold_with_mapping > 0 else 0.0
-    print(f"✅ Realis accuracy: {result}%")
+    pairs = kernel.pair_columns(mapping)
+    gold_cols, sys_cols = kernel.encode_attributes(gold, system)
+    result = kernel.accuracy(pairs, kernel.attribute_matches(pairs, gold_cols, sys_cols, ("modality", "polarity")))
+    LOGGER.debug("Realis accuracy: %s%%", result)
     return result
 
 # ----- Combined F1 -----
@@ -253,176 +183,188 @@ def compute_combined_f1(gold, system, mapping, attributes: List[str]) -> Tuple[f
     """
     Compute Combined F1 where TP requires both span overlap AND attribute match
     """
-    print("🎯 Computing Combined F1...")
-    
-    total_tp = 0.0
-    
-    # For each gold mention
-    with tqdm(total=len(gold), desc="Computing Combined F1", unit="mention") as pbar:
-        for gid in range(len(gold)):
-            if gid not in mapping or len(mapping[gid]) == 0:
-                pbar.update(1)
-                continue
-            
-            # Get all system mentions mapped to this gold mention
-            mapped_systems = mapping[gid]
-            mg_size = len(mapped_systems)
-            
-            # Calculate attribute-based TP for this gold mention
-            tp_for_this_gold = 0.0
-            
-            # For each system mention mapped to this gold mention
-            for sid, dice_score in mapped_systems:
-                # Check if all attributes match
-                all_attrs_match = all(gold[gid][attr] == system[sid][attr] for attr in attributes)
-                
-                if all_attrs_match:
-                    # Use dice score weighted by 1/|MG|
-                    tp_for_this_gold += dice_score / mg_size
-            
-            total_tp += tp_for_this_gold
-            pbar.update(1)
-    
-    # Calculate combined F1
-    NS = len(system)
-    NG = len(gold)
-    
-    precision = total_tp / NS if NS > 0 else 0.0
-    recall = total_tp / NG if NG > 0 else 0.0
-    f1 = 2 * precision * recall / (precision + recall) if (precision + recall) > 0 else 0.0
-    
-    print(f"✅ Combined F1 computed: P={precision:.3f}, R={recall:.3f}, F1={f1:.3f}")
-    return round(precision * 100, 1), round(recall * 100, 1), round(f1 * 100, 1)
+    pairs = kernel.pair_columns(mapping)
+    gold_cols, sys_cols = kernel.encode_attributes(gold, system)
+    match = kernel.attribute_matches(pairs, gold_cols, sys_cols, attributes)
+    comb_p, comb_r, comb_f1 = kernel.combined_scores(pairs, match, len(gold), len(system))
+    LOGGER.debug("Combined F1: P=%s, R=%s, F1=%s", comb_p, comb_r, comb_f1)
+    return comb_p, comb_r, comb_f1
 
 # ----- ID matching statistics -----
+def id_matching_stats(gold, system, index: Optional[GoldIndex] = None) -> Dict[str, int]:
+    """Documents and (doc_id, event_id) pairs on each side and in common"""
+    # Count unique doc_ids and event_ids (as integer codes in the gold vocab)
+    system = system.recode(gold.vocabs)
+    if index is not None:
+        return index.stats(system)
+    width = max(len(gold.vocabs["event_id"]), 1)
+    gold_docs = np.unique(gold.columns["doc_id"])
+    system_docs = np.unique(system.columns["doc_id"])
+    gold_pairs = np.unique(gold.columns["doc_id"].astype(np.int64) * width + gold.columns["event_id"])
+    system_pairs = np.unique(system.columns["doc_id"].astype(np.int64) * width + system.columns["event_id"])
+    return {
+        "gold_docs": len(gold_docs),
+        "system_docs": len(system_docs),
+        "common_docs": len(np.intersect1d(gold_docs, system_docs, assume_unique=True)),
+        "gold_pairs": len(gold_pairs),
+        "system_pairs": len(system_pairs),
+        "common_pairs": len(np.intersect1d(gold_pairs, system_pairs, assume_unique=True)),
+    }
+
 def print_id_matching_stats(gold, system):
     """Print statistics about ID matching"""
+    stats = id_matching_stats(gold, system)
     print("\n📊 ID Matching Statistics:")
     print("-" * 40)
-    
-    # Count unique doc_ids and event_ids
-    gold_docs = set(g["doc_id"] for g in gold)
-    system_docs = set(s["doc_id"] for s in system)
-    
-    gold_pairs = set((g["doc_id"], g["event_id"]) for g in gold)
-    system_pairs = set((s["doc_id"], s["event_id"]) for s in system)
-    
-    common_docs = gold_docs & system_docs
-    common_pairs = gold_pairs & system_pairs
-    
-    print(f"   Gold documents: {len(gold_docs)}")
-    print(f"   System documents: {len(system_docs)}")
-    print(f"   Common documents: {len(common_docs)}")
-    print(f"   Gold (doc_id, event_id) pairs: {len(gold_pairs)}")
-    print(f"   System (doc_id, event_id) pairs: {len(system_pairs)}")
-    print(f"   Common (doc_id, event_id) pairs: {len(common_pairs)}")
-    print(f"   Coverage: {len(common_pairs)/len(gold_pairs)*100:.1f}% of gold events have matching system events")
+    print(f"   Gold documents: {stats['gold_docs']}")
+    print(f"   System documents: {stats['system_docs']}")
+    print(f"   Common documents: {stats['common_docs']}")
+    print(f"   Gold (doc_id, event_id) pairs: {stats['gold_pairs']}")
+    print(f"   System (doc_id, event_id) pairs: {stats['system_pairs']}")
+    print(f"   Common (doc_id, event_id) pairs: {stats['common_pairs']}")
+    print(f"   Coverage: {stats['common_pairs']/stats['gold_pairs']*100:.1f}% of gold events have matching system events")
 
 # ----- Main evaluation function -----
-def evaluate(gold_path: str, system_path: str, threshold: float = 0.0) -> Dict[str, float]:
+def evaluate(gold_path: str, system_path: str, threshold: float = 0.0, stream: bool = False,
+             cache_dir: Optional[str] = DEFAULT_CACHE_DIR, telemetry: Optional[Telemetry] = None,
+             arguments: bool = False, coreference: bool = False, breakdown: bool = False,
+             matching: str = "id", errors: bool = False, gold_version: Optional[str] = None,
+             positions: bool = False) -> Dict[str, float]:
     """
     Main evaluation function following the paper's methodology with ID matching
+
+    Parsed events are read from the on-disk cache (``cache.load_events``) and only
+    re-parsed when a file's content changes; ``cache_dir=None`` disables it.
+    ``stream=True`` bypasses the cache and reads the files paragraph by paragraph
+    (``streaming.iter_paragraphs``) so the raw JSON tree is never held in memory.
+
+    Nothing is printed: phases are timed into ``telemetry`` (silent by default,
+    see ``src/core/telemetry.py``); pass e.g. ``Telemetry(ConsoleSink())`` for
+    the CLI report.
+
+    ``arguments=True`` adds argument identification / classification and
+    per-role scores (``src/core/arguments.py``); ``coreference=True`` adds
+    MUC / B³ / CEAF-e / BLANC event coreference scores (``src/core/coreference.py``);
+    ``breakdown=True`` adds ``Per_Type`` and ``Per_Document`` scores (``src/core/breakdown.py``);
+    ``errors=True`` adds the ``Errors`` report: confusion matrices, per-type
+    recall / F1 and worst documents (``src/core/error_analysis.py``).
+    ``matching="overlap"`` maps events by trigger overlap instead of by
+    event_id (see ``mention_mapping``).
+    ``gold_version`` scores against a recorded version of the gold set
+    (``"latest"``, its number or a hash prefix, see ``src/core/gold_versions.py``)
+    instead of the current content of ``gold_path``.
+    ``positions=True`` also resolves every trigger to token positions
+    (``src/core/span_alignment.py``, one more pass over both files) and scores
+    pairs that resolve on both sides by position; the shipped files carry no
+    offsets or paragraph text, so there it changes nothing.
     """
+    telemetry = get_telemetry(telemetry)
     start_time = time.time()
     
-    print("🚀 Starting evaluation with ID matching...")
-    print(f"📁 Gold file: {gold_path}")
-    print(f"📁 System file: {system_path}")
-    print(f"🎯 Threshold: {threshold}")
-    # print(f"📊 Sample size: {sample_size}")
-    print("-" * 80)
-    
-    # Load data
-    print("📥 Loading data files...")
-    with open(gold_path, "r", encoding="utf-8") as f:
-        gold_json = json.load(f)
-    with open(system_path, "r", encoding="utf-8") as f:
-        sys_json = json.load(f)
-    print("Files loaded successfully")
-    
-    # # Sample data
-    # print("\n" + "="*50)
-    # print("PHASE 0: SAMPLING DATA")
-    # print("="*50)
-    
-    # print("🎲 Sampling gold data...")
-    # gold_json = sample_data(gold_json, sample_size)
-    
-    # print("🎲 Sampling system data...")
-    # sys_json = sample_data(sys_json, sample_size)
-              
-    # Parse events
-    print("\n" + "="*50)
-    print("PHASE 1: PARSING EVENTS")
-    print("="*50)
-    
-    print("🔍 Parsing gold events...")
-    gold = parse_events(gold_json)
-    
-    print("🔍 Parsing system events...")
-    system = parse_events(sys_json)
-    
-    print(f"\n📊 Summary:")
-    print(f"   Gold events: {len(gold):,}")
-    print(f"   System events: {len(system):,}")
-    
-    # Print ID matching statistics
-    print_id_matching_stats(gold, system)
-    
-    # Compute mapping
-    print("\n" + "="*50)
-    print("PHASE 2: MENTION MAPPING (WITH ID CONSTRAINT)")
-    print("="*50)
-    
-    mapping = mention_mapping(gold, system, threshold=threshold)
-    
-    # Print mapping statistics
-    mapped_gold = len(mapping)
-    mapped_system = sum(len(sys_list) for sys_list in mapping.values())
-    print(f"\n📊 Mapping Summary:")
-    print(f"   Mapped gold mentions: {mapped_gold:,}/{len(gold):,} ({mapped_gold/len(gold)*100:.1f}%)")
-    print(f"   Mapped system mentions: {mapped_system:,}/{len(system):,} ({mapped_system/len(system)*100:.1f}%)")
-    
-    # Compute metrics
-    print("\n" + "="*50)
-    print("PHASE 3: COMPUTING METRICS")
-    print("="*50)
-    
-    # Compute span F1
-    span_p, span_r, span_f1 = compute_span_f1(gold, system, mapping)
-    
-    # Compute attribute accuracies
-    type_acc = compute_attribute_acc(gold, system, mapping, "type")
-    subtype_acc = compute_attribute_acc(gold, system, mapping, "subtype")
-    modality_acc = compute_attribute_acc(gold, system, mapping, "modality")
-    polarity_acc = compute_attribute_acc(gold, system, mapping, "polarity")
-    realis_acc = compute_realis_acc(gold, system, mapping)
-    
-    # Compute combined F1
-    all_attrs = ["type", "subtype", "modality", "polarity"]
-    comb_p, comb_r, comb_f1 = compute_combined_f1(gold, system, mapping, all_attrs)
-    
-    # Calculate total time
-    total_time = time.time() - start_time
-    
-    print("\n" + "="*50)
-    print("EVALUATION COMPLETE")
-    print("="*50)
-    print(f"⏱️  Total time: {total_time:.2f} seconds")
-    
-    return {
-        "Span_Precision": span_p,
-        "Span_Recall": span_r,
-        "Span_F1": span_f1,
-        "Type_Accuracy": type_acc,
-        "Subtype_Accuracy": subtype_acc,
-        "Modality_Accuracy": modality_acc,
-        "Polarity_Accuracy": polarity_acc,
-        "Realis_Accuracy": realis_acc,
-        "Combined_Precision": comb_p,
-        "Combined_Recall": comb_r,
-        "Combined_F1": comb_f1
-    }
+    telemetry.note("🚀 Starting evaluation with ID matching...")
+    telemetry.note(f"📁 Gold file: {gold_path}")
+    telemetry.note(f"📁 System file: {system_path}")
+    telemetry.note(f"🎯 Threshold: {threshold}")
+    telemetry.note(f"🔀 Matching: {matching}")
+    if gold_version is not None:
+        from src.core.gold_versions import versions_for
+        versions = versions_for(gold_path)
+        telemetry.note(f"🏷️  Gold version: {versions.version_id(gold_version)[:12]}")
+    
+    with telemetry.phase("parse") as counts:
+        if gold_version is not None:
+            # Rebuilt from the version's paragraphs, never from the current gold file
+            gold = parse_events(versions.paragraphs(gold_version), telemetry=telemetry)
+        elif stream:
+            # Paragraph by paragraph: the raw JSON tree is never held in memory
+            gold = parse_events(iter_paragraphs(gold_path), telemetry=telemetry)
+        elif cache_dir is None:
+            gold = parse_events(load_json(gold_path), telemetry=telemetry)
+        else:
+            gold = load_events(gold_path, cache_dir)
+        if stream:
+            system = parse_events(iter_paragraphs(system_path), vocabs=gold.vocabs, telemetry=telemetry)
+        elif cache_dir is None:
+            system = parse_events(load_json(system_path), vocabs=gold.vocabs, telemetry=telemetry)
+        else:
+            system = load_events(system_path, cache_dir).recode(gold.vocabs)
+        counts["gold_events"] = len(gold)
+        counts["system_events"] = len(system)
+    
+    spans = None
+    if positions:
+        from src.core.span_alignment import build_span_table
+        with telemetry.phase("spans") as counts:
+            gold_paragraphs = versions.paragraphs(gold_version) if gold_version is not None else iter_paragraphs(gold_path)
+            spans = (build_span_table(gold_paragraphs), build_span_table(iter_paragraphs(system_path)))
+            counts["resolved_gold"] = int(spans[0].resolved.sum())
+            counts["resolved_system"] = int(spans[1].resolved.sum())
+    
+    results = evaluate_tables(gold, system, threshold=threshold, telemetry=telemetry, arguments=arguments,
+                              coreference=coreference, breakdown=breakdown, matching=matching,
+                              errors=errors, spans=spans)
+    
+    telemetry.note(f"⏱️  Total time: {time.time() - start_time:.2f} seconds")
+    return results
+
+def evaluate_tables(gold: EventTable, system: EventTable, threshold: float = 0.0,
+                    telemetry: Optional[Telemetry] = None, arguments: bool = False,
+                    coreference: bool = False, index: Optional[GoldIndex] = None,
+                    breakdown: bool = False, matching: str = "id", errors: bool = False,
+                    spans: Optional[Tuple["SpanTable", "SpanTable"]] = None) -> Dict[str, float]:
+    """Mapping + metrics on already parsed tables (e.g. a gold table shared across batches).
+
+    ``system`` is recoded into ``gold``'s vocabs unless it already shares them;
+    ``index`` is an optional prebuilt ``GoldIndex(gold)``; ``spans`` as in
+    ``mention_mapping``.
+    """
+    telemetry = get_telemetry(telemetry)
+    if system.vocabs is not gold.vocabs:
+        system = system.recode(gold.vocabs)
+    
+    stats = id_matching_stats(gold, system, index=index)
+    if stats["gold_pairs"]:
+        telemetry.note(f"📊 Coverage: {stats['common_pairs']:,}/{stats['gold_pairs']:,} gold (doc_id, event_id) "
+                       f"pairs have a matching system event")
+    
+    mapping = mention_mapping(gold, system, threshold=threshold, telemetry=telemetry, index=index, matching=matching,
+                              spans=spans)
+    
+    # One pass to columnar arrays, then every metric is a NumPy reduction
+    with telemetry.phase("metrics") as counts:
+        gold_cols, sys_cols = kernel.encode_attributes(gold, system)
+        pairs = kernel.pair_columns(mapping)
+        results = kernel.compute_all(gold_cols, sys_cols, pairs, len(gold), len(system))
+        counts["mapped_pairs"] = len(pairs["gid"])
+    
+    # Optional phases: their backends are only imported when asked for
+    if arguments:
+        from src.core.arguments import argument_scores
+        with telemetry.phase("arguments") as counts:
+            results.update(argument_scores(gold, system, mapping))
+            counts["gold_arguments"] = len(gold.arg_columns["role"])
+            counts["system_arguments"] = len(system.arg_columns["role"])
+    
+    if coreference:
+        from src.core.coreference import coreference_scores
+        with telemetry.phase("coreference") as counts:
+            results.update(coreference_scores(gold, system, mapping, counts=counts))
+    
+    if breakdown:
+        from src.core.breakdown import per_document_scores, per_type_scores
+        with telemetry.phase("breakdown") as counts:
+            results["Per_Type"] = per_type_scores(gold, system, mapping)
+            results["Per_Document"] = per_document_scores(gold, system, mapping)
+            counts["types"] = len(results["Per_Type"])
+            counts["documents"] = len(results["Per_Document"])
+    
+    if errors:
+        from src.core.error_analysis import error_report
+        with telemetry.phase("errors") as counts:
+            results["Errors"] = error_report(gold, system, mapping)
+            counts["documents_with_errors"] = len(results["Errors"]["worst_documents"])
+    
+    return results
 
 # ----- Print results in a nice format -----
 def print_results(results: Dict[str, float]):
@@ -435,6 +377,9 @@ def print_results(results: Dict[str, float]):
     span_metrics = ["Span_Precision", "Span_Recall", "Span_F1"]
     attr_metrics = ["Type_Accuracy", "Subtype_Accuracy", "Modality_Accuracy", "Polarity_Accuracy", "Realis_Accuracy"]
     combined_metrics = ["Combined_Precision", "Combined_Recall", "Combined_F1"]
+    argument_metrics = ["Arg_Identification_Precision", "Arg_Identification_Recall", "Arg_Identification_F1",
+                        "Arg_Classification_Precision", "Arg_Classification_Recall", "Arg_Classification_F1"]
+    coref_measures = ["MUC", "B3", "CEAFe", "BLANC"]
     
     print("\n📏 SPAN METRICS:")
     print("-" * 30)
@@ -454,6 +399,24 @@ def print_results(results: Dict[str, float]):
         if metric in results:
             print(f"   {metric.replace('_', ' '):15s}: {results[metric]:6.1f}%")
     
+    if "Arg_Identification_F1" in results:
+        print("\n🧩 ARGUMENT METRICS:")
+        print("-" * 30)
+        for metric in argument_metrics:
+            print(f"   {metric[4:].replace('_', ' '):25s}: {results[metric]:6.1f}%")
+        print(f"\n   {'Role':20s} {'P':>6s} {'R':>6s} {'F1':>6s} {'Support':>8s}")
+        for role, score in sorted(results["Arg_Per_Role"].items(), key=lambda kv: -kv[1]["support"]):
+            print(f"   {role:20s} {score['precision']:6.1f} {score['recall']:6.1f} {score['f1']:6.1f} {score['support']:8d}")
+    
+    if "Coref_CoNLL_F1" in results:
+        print("\n🔗 COREFERENCE METRICS:")
+        print("-" * 30)
+        print(f"   {'Measure':8s} {'P':>6s} {'R':>6s} {'F1':>6s}")
+        for measure in coref_measures:
+            print(f"   {measure:8s} {results[f'Coref_{measure}_Precision']:6.1f} "
+                  f"{results[f'Coref_{measure}_Recall']:6.1f} {results[f'Coref_{measure}_F1']:6.1f}")
+        print(f"   {'CoNLL F1':8s} {'':>6s} {'':>6s} {results['Coref_CoNLL_F1']:6.1f}")
+    
     print("\n" + "="*60)
 
 if __name__ == "__main__":
@@ -467,7 +430,8 @@ if __name__ == "__main__":
         verified_path = "./data/processed/agentA/tokenized_data_500.json"
         
         # Run evaluation with sample of 100 documents
-        results = evaluate(gold_path, verified_path)
+        results = evaluate(gold_path, verified_path, telemetry=Telemetry(ConsoleSink(), progress=True), arguments=True,
+                           coreference=True)
         print_results(results)
         
     except FileNotFoundError as e:
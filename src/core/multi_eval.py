@@ -0,0 +1,151 @@
+#src/core/multi_eval.py
+# -------------------------------------------------------------
+"""Evaluate N system files against one gold file in a single sweep.
+
+Calling ``metrics_v2.evaluate`` once per system re-reads the gold file and
+rebuilds its ``(doc_id, event_id)`` index every time.  ``evaluate_systems``
+loads the gold ``EventTable`` once (through the event cache) and builds one
+``matching.GoldIndex``; every system is then only loaded, recoded, probed
+against the index, mapped and scored with ``metrics_v2.evaluate_tables``
+(``breakdown=True`` for the per-type and per-document tables).
+
+Systems run in a ``ProcessPoolExecutor``.  With the ``fork`` start method the
+workers inherit the gold table and index copy-on-write; elsewhere each worker
+loads them once in its initializer.  ``workers=1`` evaluates in-process.
+"""
+from __future__ import annotations
+
+import multiprocessing as mp
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from src.core.cache import DEFAULT_CACHE_DIR, load_events
+from src.core.event_store import EventTable
+from src.core.matching import GoldIndex
+from src.core.metrics_v2 import evaluate_tables
+from src.core.significance import METRICS
+from src.core.telemetry import Telemetry, get_telemetry
+
+_GOLD: Optional[EventTable] = None  # set in the parent before fork, or by _init_worker
+_INDEX: Optional[GoldIndex] = None
+
+
+def _init_worker(gold_path: str, cache_dir: Optional[str]):
+    global _GOLD, _INDEX
+    if _GOLD is None:
+        _GOLD = load_events(gold_path, cache_dir)
+        _INDEX = GoldIndex(_GOLD)
+
+
+def system_names(paths: Sequence[Union[str, Path]]) -> List[str]:
+    """Annotator directory names (agentA, agentB, ...), else file stems, else the full paths."""
+    for name_of in (lambda p: Path(p).parent.name, lambda p: Path(p).stem, str):
+        names = [name_of(p) for p in paths]
+        if len(set(names)) == len(names):
+            return names
+    raise ValueError("duplicate system paths")
+
+
+def evaluate_system(name: str, path: str, threshold: float = 0.0, cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+                    arguments: bool = False, coreference: bool = False, matching: str = "id") -> Dict[str, Any]:
+    """Evaluate one system file against the shared gold table; runs inside a worker."""
+    start = time.perf_counter()
+    telemetry = Telemetry()  # silent; per-phase numbers go into the report
+    system = load_events(path, cache_dir).recode(_GOLD.vocabs)
+    results = evaluate_tables(_GOLD, system, threshold=threshold, telemetry=telemetry, arguments=arguments,
+                              coreference=coreference, index=_INDEX, breakdown=True, matching=matching)
+    return {
+        "name": name,
+        "path": str(path),
+        "id_stats": _INDEX.stats(system),
+        "per_type": results.pop("Per_Type"),
+        "per_document": results.pop("Per_Document"),
+        "results": results,
+        "phases": telemetry.summary(),
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def evaluate_systems(gold_path: Union[str, Path], system_paths: Union[Sequence[str], Dict[str, str]],
+                     threshold: float = 0.0, workers: Optional[int] = None,
+                     cache_dir: Optional[str] = DEFAULT_CACHE_DIR, arguments: bool = False,
+                     coreference: bool = False, telemetry: Optional[Telemetry] = None,
+                     matching: str = "id") -> Dict[str, Any]:
+    """Metrics, ID statistics and per-type / per-document breakdowns of every system.
+
+    ``system_paths`` is ``{name: path}`` or a list of paths (named by ``system_names``).
+    """
+    global _GOLD, _INDEX
+    telemetry = get_telemetry(telemetry)
+    if not isinstance(system_paths, dict):
+        system_paths = dict(zip(system_names(system_paths), system_paths))
+    start = time.perf_counter()
+
+    with telemetry.phase("gold") as counts:
+        _GOLD = load_events(gold_path, cache_dir)
+        _INDEX = GoldIndex(_GOLD)
+        counts["gold_events"] = len(_GOLD)
+
+    methods = mp.get_all_start_methods()
+    context = mp.get_context("fork" if "fork" in methods else None)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(system_paths)))
+    systems: Dict[str, Any] = {}
+    try:
+        with telemetry.phase("systems") as counts:
+            args = (threshold, cache_dir, arguments, coreference, matching)
+            if workers == 1:
+                for name, path in system_paths.items():
+                    systems[name] = evaluate_system(name, str(path), *args)
+            else:
+                with ProcessPoolExecutor(workers, mp_context=context, initializer=_init_worker,
+                                         initargs=(str(gold_path), cache_dir)) as pool:
+                    futures = [pool.submit(evaluate_system, name, str(path), *args)
+                               for name, path in system_paths.items()]
+                    for future in as_completed(futures):
+                        report = future.result()
+                        systems[report["name"]] = report
+            counts["systems"] = len(systems)
+            counts["workers"] = workers
+    finally:
+        _GOLD = _INDEX = None
+
+    return {
+        "gold": str(gold_path),
+        "threshold": threshold,
+        "matching": matching,
+        "workers": workers,
+        "start_method": context.get_start_method() if workers > 1 else None,
+        "total_seconds": time.perf_counter() - start,
+        "systems": {name: systems[name] for name in system_paths},
+    }
+
+
+def print_comparison(report: Dict[str, Any], top_types: int = 15):
+    """Side-by-side metrics table, then per-type F1 for the most frequent gold types."""
+    names = list(report["systems"])
+    width = max(10, *(len(n) for n in names))
+    systems = report["systems"]
+
+    print("\n" + "=" * (24 + (width + 1) * len(names)))
+    print(f"{'Metric':24s}" + "".join(f" {n:>{width}s}" for n in names))
+    print("-" * (24 + (width + 1) * len(names)))
+    for metric in METRICS:
+        print(f"{metric:24s}" + "".join(f" {systems[n]['results'][metric]:{width}.1f}" for n in names))
+    print(f"{'Coverage (gold pairs %)':24s}" + "".join(
+        f" {100 * s['id_stats']['common_pairs'] / max(s['id_stats']['gold_pairs'], 1):{width}.1f}"
+        for s in systems.values()))
+
+    support: Dict[str, int] = {}
+    for s in systems.values():
+        for event_type, score in s["per_type"].items():
+            support[event_type] = max(support.get(event_type, 0), score["support"])
+    types = sorted(support, key=lambda t: -support[t])[:top_types]
+    print(f"\n{'Type F1 (support)':24s}" + "".join(f" {n:>{width}s}" for n in names))
+    print("-" * (24 + (width + 1) * len(names)))
+    for event_type in types:
+        cells = "".join(f" {systems[n]['per_type'].get(event_type, {}).get('f1', 0.0):{width}.1f}" for n in names)
+        print(f"{event_type[:17] + f' ({support[event_type]})':24s}{cells}")
+    print("=" * (24 + (width + 1) * len(names)))
@@ -0,0 +1,152 @@
+#src/core/qc.py
+# -------------------------------------------------------------
+"""QC sampling and batch QA, the work behind the ``qc-sample`` and ``evaluate`` commands.
+
+*   ``prepare_qc_sample`` — the lowest-κ paragraphs of a batch (agent A vs
+    agent B) written to ``data/processed/human/<batch>_sample.json`` for
+    human QC (was ``prepare_QC_samples.main``);
+*   ``review_batch`` — ``compute_agreement`` + QA gates on a reviewed batch,
+    saving the metrics report and the accepted / flagged batch (was
+    ``evaluate_batch.main``), plus the error analysis of the paragraphs that
+    are in the gold set (``batch_error_report``).
+
+Both return what they did; printing is left to the CLI (``src/core/cli.py``).
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.core.cache import load_events
+from src.core.kappa import paragraph_kappas
+from src.core.metrics import compute_agreement, qa_failures
+from src.core.selection import dominant_event_types, source_prefix, stratified, worst_k
+from src.core.shards import SHARD_SUFFIX, resolve
+from src.core.utils import load_config, load_json, save_json
+
+QC_FRACTION = 0.1  # share of a batch's paragraphs sent to human QC
+
+
+def compute_kappa_sorted(agent_a, agent_b) -> List[Tuple[str, float]]:
+    """Kappa per shared paragraph, ascending; agents are dicts, EventTables or file paths."""
+    pids, kappas = paragraph_kappas(agent_a, agent_b)  # all paragraphs in one vectorized pass
+    result = list(zip(pids, kappas.tolist()))
+    result.sort(key=lambda x: x[1])  # sort by kappa ascending
+    return result
+
+
+def qc_budget(n_paragraphs: int, fraction: float = QC_FRACTION) -> int:
+    """Number of paragraphs of a batch to send to human QC (at least one)."""
+    return max(1, int(n_paragraphs * fraction))
+
+
+def select_qc_pids(agent_a, agent_b, budget: int, mode: str = "worst", strata: str = "event_type",
+                   kappas: Optional[Tuple[List[str], Any]] = None) -> List[str]:
+    """Pick ``budget`` paragraphs for human QC in one pass over the (pid, kappa) stream.
+
+    mode="worst": lowest kappa overall; mode="stratified": lowest kappa per stratum
+    (dominant event_type in agent B, or pid source prefix) under the same budget.
+    ``kappas`` is ``paragraph_kappas(agent_a, agent_b)`` if already computed.
+    """
+    pids, kappas = paragraph_kappas(agent_a, agent_b) if kappas is None else kappas
+    stream = zip(pids, kappas.tolist())
+    if mode == "worst":
+        selected = worst_k(stream, budget)
+    elif mode == "stratified":
+        if strata == "prefix":
+            stratum_of = source_prefix
+        else:
+            stratum_of = dominant_event_types(load_events(agent_b) if isinstance(agent_b, (str, Path)) else agent_b).get
+        selected = stratified(stream, budget, stratum_of)
+    else:
+        raise ValueError(f"Unknown selection mode: {mode}")
+    return [pid for pid, _ in selected]
+
+
+def prepare_qc_sample(batch_tag: str, config_path: str = "config/pipeline.yaml", mode: str = "worst",
+                      strata: str = "event_type") -> Tuple[List[str], str]:
+    """Write the QC sample of ``batch_tag``; return the selected pids and the output path."""
+    load_config(config_path)  # fail early on a broken config
+
+    agent_a_path = resolve(f"data/processed/agentA/{batch_tag}.json")
+    agent_b_path = resolve(f"data/processed/agentB/{batch_tag}.json")
+    agent_b = load_json(agent_b_path)
+
+    # Paths: trigger labels come from the parsed-event cache, not a second json.load
+    selected_pids = select_qc_pids(agent_a_path, agent_b_path, qc_budget(len(agent_b)), mode=mode, strata=strata)
+    qc_data = {pid: agent_b[pid] for pid in selected_pids}
+
+    qc_outfile = f"data/processed/human/{batch_tag}_sample.json"
+    save_json(qc_data, qc_outfile)
+    return selected_pids, qc_outfile
+
+
+def _gold_path(config: Dict) -> Path:
+    return resolve(Path(config.get("paths", {}).get("gold_root", "data/gold")) / "master.json")
+
+
+def batch_error_report(reviewed: Dict, config: Dict, batch_tag: str, reports_dir: str = "reports",
+                       gold_data: Optional[Dict] = None) -> Optional[Tuple[str, str]]:
+    """Confusions / worst documents of ``reviewed`` against the gold paragraphs with the same pids.
+
+    The gold set is ``gold_data`` if given (e.g. a past version), else the
+    master gold file.  Saves ``<reports_dir>/<batch>_errors.json`` and
+    ``<batch>_confusion.csv`` and returns their paths; ``None`` without a gold
+    set or shared pids.
+    """
+    from src.core.error_analysis import error_report, write_error_report  # SciPy: only when evaluating
+    from src.core.event_store import build_table
+    from src.core.metrics_v2 import mention_mapping
+
+    if gold_data is None:
+        gold_path = _gold_path(config)
+        if not gold_path.exists():
+            return None
+        gold_data = load_json(gold_path)
+    shared = [pid for pid in reviewed if pid in gold_data]
+    if not shared:
+        return None
+    gold = build_table({pid: gold_data[pid] for pid in shared})
+    system = build_table({pid: reviewed[pid] for pid in shared}, vocabs=gold.vocabs)
+    report = error_report(gold, system, mention_mapping(gold, system, threshold=0.0))
+    report["batch"], report["n_paragraphs"] = batch_tag, len(shared)
+    return write_error_report(report, reports_dir, batch_tag)
+
+
+def review_batch(review_path: str, config_path: str, batch_tag: str, gold_version: Optional[str] = None) -> Dict[str, Any]:
+    """QA metrics of a reviewed batch; saves ``reports/<batch>_metrics.json`` and the accepted / flagged batch.
+
+    ``gold_version`` checks the batch against a recorded version of the gold
+    set (``src/core/gold_versions.py``) instead of the current master file;
+    its id is kept in the metrics as ``gold_version``.
+
+    Returns ``{"metrics", "qa_failures", "metrics_path", "batch_path", "error_paths"}``
+    (``error_paths`` as returned by ``batch_error_report``).
+    """
+    review_path = resolve(review_path)
+    reviewed = load_json(review_path)
+    config = load_config(config_path)
+    # Sharded input -> sharded output
+    suffix = SHARD_SUFFIX if review_path.suffix == SHARD_SUFFIX else ".json"
+
+    gold_data = None
+    if gold_version is not None:
+        from src.core.gold_versions import versions_for
+
+        versions = versions_for(_gold_path(config))
+        gold_data = versions.load(gold_version)
+    metrics = compute_agreement(reviewed, batch_tag, config=config, gold=gold_data)
+    if gold_version is not None:
+        metrics["gold_version"] = versions.version_id(gold_version)
+    metrics_path = f"reports/{batch_tag}_metrics.json"
+    save_json(metrics, metrics_path)
+
+    reasons = qa_failures(metrics, config)
+    if reasons:
+        batch_path = f"data/final/{batch_tag}_flagged_for_qc{suffix}"
+    else:
+        batch_path = f"data/final/{batch_tag}_accepted{suffix}"
+    save_json(reviewed, batch_path)
+    error_paths = batch_error_report(reviewed, config, batch_tag, gold_data=gold_data)
+    return {"metrics": metrics, "qa_failures": reasons, "metrics_path": metrics_path, "batch_path": batch_path,
+            "error_paths": error_paths}
@@ -0,0 +1,166 @@
+#src/core/runner.py
+# -------------------------------------------------------------
+"""Evaluate many batches in parallel with one shared gold set.
+
+``run_batches("tokenized_data_*")`` expands the glob against the agent B
+directory (``paths.annotator_roots[-1]``), then for every batch tag runs, in a
+``ProcessPoolExecutor`` worker:
+
+1.  QC selection — per-paragraph κ and the ``qc.qc_budget`` pids chosen by
+    ``qc.select_qc_pids`` (same budget and modes as ``qc-sample``);
+2.  ``metrics.compute_agreement`` — corpus κ, precision-per-type, QA gates;
+3.  ``metrics_v2.evaluate_tables`` — span / attribute / combined and argument
+    scores of the reviewed batch against the gold paragraphs it contains
+    (both sides cut down to the pids they share, ``event_store.select_docs``
+    on the gold table).
+
+The gold ``EventTable`` is loaded once in the parent (through the event cache)
+before the pool starts.  With the ``fork`` start method workers inherit it
+copy-on-write — NumPy buffers are never written, so pages stay shared; on
+platforms without ``fork`` each worker re-reads it from the cache once in its
+initializer.  Results come back as plain dicts and are written to one report
+with per-phase timings (the ``metrics_v2`` phases come from
+``telemetry.Telemetry``).
+"""
+from __future__ import annotations
+
+import logging
+import multiprocessing as mp
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from src.core.cache import DEFAULT_CACHE_DIR, load_events
+from src.core.event_store import EventTable, build_table, select_docs
+from src.core.kappa import paragraph_kappas
+from src.core.metrics import DEFAULT_ANNOTATOR_ROOTS, compute_agreement, qa_failures
+from src.core.metrics_v2 import evaluate_tables
+from src.core.qc import QC_FRACTION, qc_budget, select_qc_pids
+from src.core.shards import SHARD_SUFFIX, is_sharded, resolve
+from src.core.telemetry import Telemetry
+from src.core.utils import load_json
+
+LOGGER = logging.getLogger(__name__)
+
+_GOLD: Optional[EventTable] = None  # set in the parent before fork, or by _init_worker
+
+
+def _init_worker(gold_path: Optional[str], cache_dir: Optional[str]):
+    global _GOLD
+    if _GOLD is None and gold_path is not None:
+        _GOLD = load_events(gold_path, cache_dir)
+
+
+def discover_batches(pattern: str, config: Dict) -> List[str]:
+    """Batch tags matching ``pattern`` in the reviewed (agent B) directory."""
+    roots = config.get("paths", {}).get("annotator_roots", DEFAULT_ANNOTATOR_ROOTS)
+    root = Path(roots[-1])
+    return sorted({fp.stem for fp in root.glob(f"{pattern}.json")} |
+                  {fp.stem for fp in root.glob(f"{pattern}{SHARD_SUFFIX}") if is_sharded(fp)})
+
+
+def _gold_subset(gold: EventTable, reviewed: Dict) -> Dict:
+    present = set(gold.doc_ids())
+    return {pid: para for pid, para in reviewed.items() if pid in present}
+
+
+def evaluate_one(batch_tag: str, config: Dict, qc_fraction: float = QC_FRACTION, threshold: float = 0.0,
+                 qc_mode: str = "worst", strata: str = "event_type") -> Dict[str, Any]:
+    """Selection, agreement and metrics for one batch; runs inside a worker."""
+    paths = config.get("paths", {})
+    roots = paths.get("annotator_roots", DEFAULT_ANNOTATOR_ROOTS)
+    cache_dir = paths.get("cache_root", DEFAULT_CACHE_DIR)
+    timings: Dict[str, float] = {}
+    report: Dict[str, Any] = {"batch": batch_tag, "worker_pid": os.getpid(), "seconds": timings}
+
+    start = t0 = time.perf_counter()
+    reviewed = load_json(resolve(Path(roots[-1]) / f"{batch_tag}.json"))
+    files = [resolve(Path(root) / f"{batch_tag}.json") for root in roots]
+    tables = [load_events(fp, cache_dir) for fp in files if fp.exists()]
+    timings["load"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    if len(tables) >= 2:
+        pids, kappas = paragraph_kappas(tables[0], tables[-1])
+        budget = qc_budget(len(reviewed), qc_fraction)
+        selected = select_qc_pids(tables[0], tables[-1], budget, mode=qc_mode, strata=strata, kappas=(pids, kappas))
+        report["qc"] = {"budget": budget, "mode": qc_mode, "pids": selected,
+                        "mean_paragraph_kappa": float(np.mean(kappas)) if len(kappas) else None}
+    timings["qc_selection"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    metrics = compute_agreement(reviewed, batch_tag, config=config, annotators=tables, gold=_GOLD)
+    report["agreement"] = metrics
+    report["qa_failures"] = qa_failures(metrics, config)
+    report["passed"] = not report["qa_failures"]
+    timings["agreement"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    if _GOLD is not None:
+        subset = _gold_subset(_GOLD, reviewed)
+        report["n_gold_paragraphs"] = len(subset)
+        if subset:
+            telemetry = Telemetry()  # silent; per-phase numbers go into the report
+            gold = select_docs(_GOLD, subset)  # other batches' gold paragraphs are not misses
+            report["evaluation"] = evaluate_tables(gold, build_table(subset), threshold=threshold,
+                                                   telemetry=telemetry, arguments=True,
+                                                   coreference=True)
+            report["evaluation_phases"] = telemetry.summary()
+    timings["evaluation"] = time.perf_counter() - t0
+
+    timings["total"] = time.perf_counter() - start
+    return report
+
+
+def run_batches(pattern: str, config: Dict, workers: Optional[int] = None, qc_fraction: float = QC_FRACTION,
+                threshold: float = 0.0, qc_mode: str = "worst", strata: str = "event_type") -> Dict[str, Any]:
+    """Evaluate every batch matching ``pattern``; returns the consolidated report."""
+    global _GOLD
+    paths = config.get("paths", {})
+    cache_dir = paths.get("cache_root", DEFAULT_CACHE_DIR)
+    tags = discover_batches(pattern, config)
+    if not tags:
+        raise FileNotFoundError(f"No batches match {pattern!r}")
+
+    start = t0 = time.perf_counter()
+    gold_path = resolve(Path(paths.get("gold_root", "data/gold")) / "master.json")
+    if gold_path.exists():
+        _GOLD = load_events(gold_path, cache_dir)
+    else:
+        LOGGER.warning("Master gold file not found at %s – precision and evaluation skipped", gold_path)
+        _GOLD, gold_path = None, None
+    gold_seconds = time.perf_counter() - t0
+
+    methods = mp.get_all_start_methods()
+    context = mp.get_context("fork" if "fork" in methods else None)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(tags)))
+    batches: Dict[str, Any] = {}
+    try:
+        with ProcessPoolExecutor(workers, mp_context=context, initializer=_init_worker,
+                                 initargs=(str(gold_path) if gold_path else None, cache_dir)) as pool:
+            futures = {pool.submit(evaluate_one, tag, config, qc_fraction, threshold, qc_mode, strata): tag
+                       for tag in tags}
+            for future in as_completed(futures):
+                tag = futures[future]
+                try:
+                    batches[tag] = future.result()
+                    LOGGER.info("Batch %s done in %.2fs", tag, batches[tag]["seconds"]["total"])
+                except Exception as exc:  # one bad batch must not sink the run
+                    LOGGER.error("Batch %s failed: %s", tag, exc)
+                    batches[tag] = {"batch": tag, "error": f"{type(exc).__name__}: {exc}"}
+    finally:
+        _GOLD = None
+
+    return {
+        "pattern": pattern,
+        "workers": workers,
+        "start_method": context.get_start_method(),
+        "gold": str(gold_path) if gold_path else None,
+        "gold_load_seconds": gold_seconds,
+        "total_seconds": time.perf_counter() - start,
+        "batches": {tag: batches[tag] for tag in tags},
+    }
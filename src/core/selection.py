@@ -0,0 +1,127 @@
+#src/core/selection.py
+# -------------------------------------------------------------
+"""QC sample selection over a stream of ``(pid, kappa)`` paragraphs.
+
+*   ``worst_k``: the ``k`` lowest-κ paragraphs, kept in a bounded max-heap, so
+    memory is O(k) however long the stream is.  Ties keep stream order, i.e.
+    the result equals ``sorted(stream, key=kappa)[:k]``.
+*   ``stratified``: the lowest-κ paragraphs *per stratum* (dominant
+    ``event_type`` of the paragraph, or source prefix such as
+    ``taichinhnganhang``) under a total budget.  Each stratum gets a bounded
+    heap; quotas are allocated from the stratum sizes once the stream ends.
+
+Both consume the stream exactly once.
+"""
+from __future__ import annotations
+
+import heapq
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from src.core.event_store import EventTable
+
+NO_EVENT = "__none__"
+
+
+class BoundedHeap:
+    """Keep the ``k`` smallest ``(score, seq)`` entries seen so far."""
+
+    def __init__(self, k: int):
+        self.k = k
+        self._heap: list = []  # max-heap via negated keys: (-score, -seq, item)
+
+    def push(self, score: float, seq: int, item):
+        if self.k <= 0:
+            return
+        entry = (-score, -seq, item)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry > self._heap[0]:  # strictly better than the current worst kept
+            heapq.heapreplace(self._heap, entry)
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def smallest(self) -> List[Tuple[float, int, object]]:
+        """Kept entries as ``(score, seq, item)``, ascending."""
+        return sorted((-s, -q, item) for s, q, item in self._heap)
+
+
+def worst_k(stream: Iterable[Tuple[str, float]], k: int) -> List[Tuple[str, float]]:
+    """The ``k`` lowest-κ ``(pid, kappa)`` pairs, ascending."""
+    heap = BoundedHeap(k)
+    for seq, (pid, kappa) in enumerate(stream):
+        heap.push(kappa, seq, pid)
+    return [(pid, kappa) for kappa, _, pid in heap.smallest()]
+
+
+def allocate(sizes: Dict[str, int], budget: int, priority: Optional[Dict[str, float]] = None) -> Dict[str, int]:
+    """Split ``budget`` across strata proportionally to ``sizes`` (largest remainder).
+
+    Every non-empty stratum gets at least one slot when the budget allows;
+    otherwise the slots go to the strata with the lowest ``priority`` value
+    (e.g. the worst κ seen in the stratum).
+    """
+    strata = sorted(s for s, n in sizes.items() if n > 0)
+    quotas = {s: 0 for s in sizes}
+    if budget <= 0 or not strata:
+        return quotas
+    if budget < len(strata):
+        ranked = sorted(strata, key=lambda s: ((priority or {}).get(s, 0.0), s))
+        for s in ranked[:budget]:
+            quotas[s] = 1
+        return quotas
+
+    for s in strata:
+        quotas[s] = 1
+    rest = min(budget, sum(sizes[s] for s in strata)) - len(strata)
+    spare = {s: sizes[s] - 1 for s in strata}
+    total_spare = sum(spare.values())
+    if rest > 0 and total_spare > 0:
+        shares = {s: rest * spare[s] / total_spare for s in strata}
+        for s in strata:
+            quotas[s] += int(shares[s])
+        leftover = rest - sum(int(v) for v in shares.values())
+        for s in sorted(strata, key=lambda s: (-(shares[s] - int(shares[s])), s))[:leftover]:
+            quotas[s] += 1
+    return quotas
+
+
+def stratified(stream: Iterable[Tuple[str, float]], budget: int,
+               stratum_of: Callable[[str], str]) -> List[Tuple[str, float]]:
+    """Lowest-κ paragraphs per stratum under a total ``budget``, ascending by κ overall."""
+    heaps: Dict[str, BoundedHeap] = {}
+    sizes: Counter = Counter()
+    worst: Dict[str, float] = {}
+    for seq, (pid, kappa) in enumerate(stream):
+        stratum = stratum_of(pid)
+        sizes[stratum] += 1
+        worst[stratum] = min(kappa, worst.get(stratum, kappa))
+        heaps.setdefault(stratum, BoundedHeap(budget)).push(kappa, seq, pid)
+
+    quotas = allocate(sizes, budget, priority=worst)
+    picked = [entry for s, heap in heaps.items() for entry in heap.smallest()[:quotas[s]]]
+    return [(pid, kappa) for kappa, _, pid in sorted(picked)]
+
+
+# ----- Stratum keys -----
+def source_prefix(pid: str) -> str:
+    """``taichinhnganhang_12`` -> ``taichinhnganhang``."""
+    return pid.rsplit("_", 1)[0] if "_" in pid else pid
+
+
+def dominant_event_types(table: EventTable) -> Dict[str, str]:
+    """Most frequent ``event_type`` of each paragraph (``NO_EVENT`` when it has none)."""
+    n_docs, n_types = len(table.doc_codes), max(len(table.vocabs["type"]), 1)
+    doc_of_event = np.repeat(np.arange(n_docs), np.diff(table.doc_ptr))
+    counts = np.bincount(doc_of_event * n_types + table.columns["type"], minlength=n_docs * n_types)
+    counts = counts.reshape(n_docs, n_types)
+    best = counts.argmax(axis=1).tolist()
+    has_events = (np.diff(table.doc_ptr) > 0).tolist()
+    types = table.vocabs["type"].strings
+    return {
+        pid: (types[best[d]] if has_events[d] else NO_EVENT)
+        for d, pid in enumerate(table.doc_ids())
+    }
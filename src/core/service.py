@@ -0,0 +1,307 @@
+#src/core/service.py
+# -------------------------------------------------------------
+"""Long-lived local evaluation service with a warm gold set.
+
+Every QA script is a cold process: imports, ``config/pipeline.yaml`` and
+``data/gold/master.json`` are loaded again before a few milliseconds of real
+work.  ``python -m src serve`` loads them once and answers JSON
+requests on a localhost HTTP port (``http.server``, no extra dependency):
+
+    GET  /health      gold path / size / event types, reload count
+    POST /agreement   {"batch": tag, "reviewed": {pid: paragraph},
+                       "annotators": [{pid: paragraph}, ...]}      (optional)
+                      → ``metrics.compute_agreement`` + ``qa_failures``
+    POST /precision   {"paragraphs": {pid: paragraph}}
+                      → ``metrics.per_type_precision`` against the gold set
+    POST /evaluate    {"system": {pid: paragraph}, "threshold": 0.0,
+                       "matching": "id", "arguments": false, "coreference": false,
+                       "breakdown": false, "errors": false}
+                      → ``metrics_v2.evaluate_tables``
+
+``/evaluate`` scores the system paragraphs against the gold paragraphs with
+the same pids (as ``run_batches`` does), cut from the resident table with
+``event_store.select_docs``.  Request strings are interned into a per-request
+copy of the gold vocabs, so the resident ones never grow.
+
+Paragraphs in a request are checked before scoring (``check_paragraphs``): a
+mention without ``id``, trigger ``text``, type, subtype or factuality is a
+400, not a ``KeyError``.
+
+Resident state: the gold paragraphs, their ``EventTable`` (with the type
+vocabulary) and the config.  Before each request the gold
+file and the config are ``stat``-ed; when ``update_gold_from_human.py`` (or
+anything else) rewrites them, they are reloaded before answering.  Requests
+are handled one at a time, so a reload never races a request.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+from urllib import request as urlrequest
+from urllib.error import HTTPError
+
+from src.core.event_store import build_table, copy_vocabs, select_docs
+from src.core.matching import MATCHING_MODES
+from src.core.metrics import compute_agreement, per_type_precision, qa_failures
+from src.core.metrics_v2 import evaluate_tables
+from src.core.shards import MANIFEST_NAME, is_sharded, resolve
+from src.core.utils import load_config, load_json
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+
+class RequestError(ValueError):
+    """Malformed request (answered with HTTP 400)."""
+
+
+def _signature(path: Path) -> Optional[Tuple[int, int]]:
+    """``(mtime_ns, size)`` of a file, or of the manifest of a sharded file; ``None`` if missing."""
+    target = path / MANIFEST_NAME if is_sharded(path) else path
+    try:
+        st = target.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _require(payload: Dict, key: str, kind: type = dict):
+    value = payload.get(key)
+    if not isinstance(value, kind):
+        raise RequestError(f"'{key}' must be a JSON {'object' if kind is dict else kind.__name__}")
+    return value
+
+
+def _trigger_error(trigger) -> Optional[str]:
+    if not isinstance(trigger, dict) or not isinstance(trigger.get("text"), str):
+        return "trigger must be an object with a string 'text'"
+    extras = trigger.get("extra_trigger_spans", [])
+    if not isinstance(extras, list):
+        return "'extra_trigger_spans' must be a list"
+    for extra in extras:
+        error = None if isinstance(extra, str) else _trigger_error(extra)
+        if error:
+            return f"extra_trigger_spans: {error}"
+    return None
+
+
+def _mention_error(mention) -> Optional[str]:
+    """What ``EventTableBuilder.add`` would fail on, or ``None``."""
+    if not isinstance(mention, dict):
+        return "must be a JSON object"
+    missing = [key for key in ("id", "trigger", "event_type", "event_subtype", "factuality") if key not in mention]
+    if missing:
+        return f"missing {', '.join(repr(key) for key in missing)}"
+    error = _trigger_error(mention["trigger"])
+    if error:
+        return error
+    factuality = mention["factuality"]
+    if not isinstance(factuality, dict) or "modality" not in factuality or "polarity" not in factuality:
+        return "factuality must be an object with 'modality' and 'polarity'"
+    arguments = mention.get("arguments", [])
+    if not isinstance(arguments, list) or not all(isinstance(arg, dict) for arg in arguments):
+        return "'arguments' must be a list of JSON objects"
+    return None
+
+
+def check_paragraphs(paragraphs: Dict, key: str) -> Dict:
+    """Raise ``RequestError`` naming the first malformed paragraph or mention of ``paragraphs``."""
+    for pid, paragraph in paragraphs.items():
+        if not isinstance(paragraph, dict):
+            raise RequestError(f"'{key}'[{pid!r}] must be a JSON object")
+        mentions = paragraph.get("event_mentions", [])
+        if not isinstance(mentions, list):
+            raise RequestError(f"'{key}'[{pid!r}].event_mentions must be a list")
+        for i, mention in enumerate(mentions):
+            error = _mention_error(mention)
+            if error:
+                raise RequestError(f"'{key}'[{pid!r}].event_mentions[{i}]: {error}")
+    return paragraphs
+
+
+class EvaluationState:
+    """Gold set and gold table, and config, reloaded when their files change."""
+
+    def __init__(self, config_path: Union[str, Path] = "config/pipeline.yaml",
+                 gold_path: Optional[Union[str, Path]] = None):
+        self.config_path = Path(config_path)
+        self.gold_override = gold_path
+        self.config: Dict = {}
+        self.gold: Dict[str, Dict] = {}
+        self.table = None
+        self.gold_path: Optional[Path] = None
+        self._signatures: Dict[str, Optional[Tuple[int, int]]] = {}
+        self.reloads = 0
+        self.requests = 0
+        self.refresh()
+
+    def _gold_file(self) -> Path:
+        if self.gold_override is not None:
+            return resolve(self.gold_override)
+        return resolve(Path(self.config.get("paths", {}).get("gold_root", "data/gold")) / "master.json")
+
+    def refresh(self) -> bool:
+        """Reload the config and / or gold set if their files changed; True if anything was reloaded."""
+        reloaded = False
+        signature = _signature(self.config_path)
+        if signature != self._signatures.get("config") or "config" not in self._signatures:
+            self.config = load_config(str(self.config_path)) if signature is not None else {}
+            self._signatures["config"] = signature
+            reloaded = True
+            LOGGER.info("Loaded config %s", self.config_path)
+
+        gold_path = self._gold_file()
+        signature = _signature(gold_path)
+        if gold_path != self.gold_path or signature != self._signatures.get("gold"):
+            start = time.perf_counter()
+            self.gold = load_json(str(gold_path)) if signature is not None else {}
+            self.table = build_table(self.gold)
+            self.gold_path = gold_path
+            self._signatures["gold"] = signature
+            reloaded = True
+            if signature is None:
+                LOGGER.warning("Master gold file not found at %s – serving an empty gold set", gold_path)
+            else:
+                LOGGER.info("Loaded gold %s: %d paragraphs, %d events in %.2fs", gold_path, len(self.gold),
+                            len(self.table), time.perf_counter() - start)
+        if reloaded:
+            self.reloads += 1
+        return reloaded
+
+    # ----- endpoints -----
+    def health(self, payload: Dict) -> Dict[str, Any]:
+        return {
+            "status": "ok",
+            "gold": str(self.gold_path),
+            "gold_paragraphs": len(self.gold),
+            "gold_events": len(self.table),
+            "event_types": [t for t in self.table.vocabs["type"].strings if t is not None],
+            "config": str(self.config_path),
+            "reloads": self.reloads,
+            "requests": self.requests,
+            "pid": os.getpid(),
+        }
+
+    def agreement(self, payload: Dict) -> Dict[str, Any]:
+        reviewed = check_paragraphs(_require(payload, "reviewed"), "reviewed")
+        annotators = payload.get("annotators")
+        if annotators is not None and not (isinstance(annotators, list) and all(isinstance(a, dict) for a in annotators)):
+            raise RequestError("'annotators' must be a list of JSON objects")
+        for i, annotator in enumerate(annotators or ()):
+            check_paragraphs(annotator, f"annotators[{i}]")
+        metrics = compute_agreement(reviewed, str(payload.get("batch", "request")), config=self.config,
+                                    annotators=annotators, gold=self.table)
+        metrics["qa_failures"] = qa_failures(metrics, self.config)
+        metrics["passed"] = not metrics["qa_failures"]
+        return metrics
+
+    def precision(self, payload: Dict) -> Dict[str, Any]:
+        paragraphs = check_paragraphs(_require(payload, "paragraphs"), "paragraphs")
+        prec = per_type_precision(paragraphs, self.table)
+        threshold = self.config.get("metrics", {}).get("per_type_precision_min", 0.80)
+        return {"precision_per_type": prec, "low_precision_types": {t: p for t, p in prec.items() if p < threshold}}
+
+    def evaluate(self, payload: Dict) -> Dict[str, Any]:
+        system = check_paragraphs(_require(payload, "system"), "system")
+        matching = payload.get("matching", "id")
+        if payload.get("scope", "batch") != "batch":
+            raise RequestError("'scope' is no longer supported: the system is always scored against "
+                               "the gold paragraphs with the same pids")
+        if matching not in MATCHING_MODES:
+            raise RequestError(f"'matching' must be one of {MATCHING_MODES}")
+        options = {"threshold": float(payload.get("threshold", 0.0)), "matching": matching,
+                   "arguments": bool(payload.get("arguments", False)),
+                   "coreference": bool(payload.get("coreference", False)),
+                   "breakdown": bool(payload.get("breakdown", False)),
+                   "errors": bool(payload.get("errors", False))}
+        gold = select_docs(self.table, system)
+        gold.vocabs = copy_vocabs(gold.vocabs)  # the request's strings go into this copy, not the resident vocabs
+        results = evaluate_tables(gold, build_table(system, vocabs=gold.vocabs), **options)
+        results["n_gold_paragraphs"] = len(gold.doc_codes)
+        return results
+
+    def routes(self) -> Dict[Tuple[str, str], Callable[[Dict], Dict]]:
+        return {("GET", "/health"): self.health, ("POST", "/agreement"): self.agreement,
+                ("POST", "/precision"): self.precision, ("POST", "/evaluate"): self.evaluate}
+
+
+def _handler(state: EvaluationState):
+    routes = state.routes()
+
+    class Handler(BaseHTTPRequestHandler):
+        def _answer(self, method: str):
+            start = time.perf_counter()
+            endpoint = routes.get((method, self.path.split("?", 1)[0]))
+            if endpoint is None:
+                return self._send(404, {"error": f"no endpoint {method} {self.path}"})
+            try:
+                length = int(self.headers.get("Content-Length") or 0)
+                payload = json.loads(self.rfile.read(length) or b"{}") if length else {}
+                if not isinstance(payload, dict):
+                    raise RequestError("request body must be a JSON object")
+                reloaded = state.refresh()
+                state.requests += 1
+                result = endpoint(payload)
+            except (RequestError, json.JSONDecodeError) as exc:
+                return self._send(400, {"error": str(exc)})
+            except Exception as exc:  # keep serving after a bad batch
+                LOGGER.exception("Request %s %s failed", method, self.path)
+                return self._send(500, {"error": f"{type(exc).__name__}: {exc}"})
+            self._send(200, {"result": result, "reloaded": reloaded, "seconds": time.perf_counter() - start})
+
+        def _send(self, status: int, body: Dict):
+            data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            self._answer("GET")
+
+        def do_POST(self):
+            self._answer("POST")
+
+        def log_message(self, fmt, *args):
+            LOGGER.debug("%s - %s", self.address_string(), fmt % args)
+
+    return Handler
+
+
+def make_server(state: EvaluationState, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> HTTPServer:
+    """HTTP server bound to ``host:port`` (``port=0`` picks a free port, see ``server_address``)."""
+    return HTTPServer((host, port), _handler(state))
+
+
+def serve(config_path: Union[str, Path] = "config/pipeline.yaml", gold_path: Optional[Union[str, Path]] = None,
+          host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+    """Load the state and serve until interrupted."""
+    server = make_server(EvaluationState(config_path, gold_path), host, port)
+    LOGGER.info("Evaluation service on http://%s:%d", *server.server_address[:2])
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def call(endpoint: str, payload: Optional[Dict] = None, url: str = f"http://{DEFAULT_HOST}:{DEFAULT_PORT}",
+         timeout: float = 60.0) -> Dict[str, Any]:
+    """Client: POST ``payload`` (GET when ``None``) to ``endpoint``; return the ``result`` or raise ``RuntimeError``."""
+    data = None if payload is None else json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    req = urlrequest.Request(url.rstrip("/") + endpoint, data=data,
+                             headers={"Content-Type": "application/json; charset=utf-8"})
+    try:
+        with urlrequest.urlopen(req, timeout=timeout) as response:
+            return json.loads(response.read())["result"]
+    except HTTPError as exc:
+        raise RuntimeError(f"{endpoint}: HTTP {exc.code} {json.loads(exc.read()).get('error')}") from None
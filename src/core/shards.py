@@ -0,0 +1,208 @@
+#src/core/shards.py
+# -------------------------------------------------------------
+"""Sharded NDJSON paragraph files.
+
+The data files are one pretty-printed ``{pid: paragraph}`` object each, so a
+file can only be parsed whole and on one core.  A sharded file is a directory
+(``<name>.shards``, next to where ``<name>.json`` would be):
+
+    <name>.shards/manifest.json     {"format": "paragraphs-ndjson", "version": 1,
+                                     "paragraphs": N,
+                                     "shards": [{"file": "part-<tag>-00000.ndjson",
+                                                 "paragraphs": n, "bytes": b}, ...]}
+    <name>.shards/part-<tag>-00000.ndjson
+                                    one paragraph per line: {"pid": ..., "doc": {...}}
+
+Paragraphs are split into contiguous runs, so reading the shards in manifest
+order gives back the original pid order.  Lines use the ``GoldStore`` log
+record layout.
+
+*   ``read_shards`` parses the shards in a process pool (one task per shard)
+    and ``write_shards`` serializes them the same way; ``iter_shards`` streams
+    paragraphs one at a time on a single core.
+*   ``build_sharded_table`` goes one step further for the metrics: each
+    worker turns its shard into an ``EventTable`` and ships back only the
+    flat arrays (``event_store.to_arrays``); the parent concatenates them.
+    Paragraph dicts never cross a process boundary, so this is the path that
+    scales with cores (the event cache uses it on a miss).
+*   Every write uses fresh shard names (a random ``<tag>`` per write):
+    the new shards are written next to the old ones, then the manifest is
+    replaced atomically, then the old shards are removed.  A reader opening
+    the manifest gets either the complete old set or the complete new one;
+    only a reader still streaming the old set when the rewrite finishes can
+    find its remaining shards gone.
+*   ``utils.load_json`` / ``save_json``, ``streaming.iter_paragraphs`` and
+    the event cache accept a ``.shards`` directory wherever a ``.json`` file
+    is expected; ``resolve`` lets entry points find ``<name>.shards`` when
+    ``<name>.json`` is absent.
+
+``python -m src shards split|join`` converts between the two layouts.
+"""
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple, Union
+
+from src.core.gold_store import _record, atomic_write, write_json_items
+
+if TYPE_CHECKING:  # NumPy-backed; imported lazily so JSON-only readers stay light
+    from src.core.event_store import EventTable
+
+SHARD_SUFFIX = ".shards"
+MANIFEST_NAME = "manifest.json"
+FORMAT = "paragraphs-ndjson"
+VERSION = 1
+
+_ITEMS: Optional[List[Tuple[str, Dict]]] = None  # set in the parent before fork by write_shards
+
+
+def is_sharded(path: Union[str, Path]) -> bool:
+    return (Path(path) / MANIFEST_NAME).is_file()
+
+
+def resolve(path: Union[str, Path]) -> Path:
+    """``path`` if it exists, else its ``.shards`` sibling if that is a sharded file, else ``path``."""
+    path = Path(path)
+    if not path.exists() and is_sharded(path.with_suffix(SHARD_SUFFIX)):
+        return path.with_suffix(SHARD_SUFFIX)
+    return path
+
+
+def read_manifest(path: Union[str, Path]) -> Dict:
+    manifest = json.loads((Path(path) / MANIFEST_NAME).read_text(encoding="utf-8"))
+    if manifest.get("format") != FORMAT or manifest.get("version") != VERSION:
+        raise ValueError(f"Unsupported shard manifest in {path}")
+    return manifest
+
+
+def shard_files(path: Union[str, Path]) -> List[Path]:
+    """Shard paths in manifest (= paragraph) order."""
+    return [Path(path) / shard["file"] for shard in read_manifest(path)["shards"]]
+
+
+def _read_shard(fp: str) -> List[Tuple[str, Dict]]:
+    with open(fp, "rb") as f:
+        return [(record["pid"], record["doc"]) for record in map(json.loads, f)]
+
+
+def iter_shards(path: Union[str, Path]) -> Iterator[Tuple[str, Dict]]:
+    """Yield ``(pid, paragraph)`` pairs shard by shard, line by line."""
+    for fp in shard_files(path):
+        with open(fp, "rb") as f:
+            for line in f:
+                record = json.loads(line)
+                yield record["pid"], record["doc"]
+
+
+def _context():
+    import multiprocessing as mp  # on demand: JSON-only callers never start a pool
+
+    return mp.get_context("fork" if "fork" in mp.get_all_start_methods() else None)
+
+
+def _pool(workers: int):
+    from concurrent.futures import ProcessPoolExecutor
+
+    return ProcessPoolExecutor(workers, mp_context=_context())
+
+
+def read_shards(path: Union[str, Path], workers: Optional[int] = None) -> Dict[str, Dict]:
+    """Load a sharded file as ``{pid: paragraph}``, parsing shards in parallel."""
+    manifest = read_manifest(path)
+    files = [str(Path(path) / shard["file"]) for shard in manifest["shards"]]
+    workers = max(1, min(workers or os.cpu_count() or 1, len(files)))
+    if workers == 1:
+        parts = map(_read_shard, files)
+    else:
+        with _pool(workers) as pool:
+            parts = list(pool.map(_read_shard, files))
+    data: Dict[str, Dict] = {}
+    for shard, part in zip(manifest["shards"], parts):
+        if len(part) != shard["paragraphs"]:
+            raise ValueError(f"Shard {shard['file']} of {path} has {len(part)} paragraphs, "
+                             f"manifest says {shard['paragraphs']}")
+        data.update(part)
+    return data
+
+
+def _shard_arrays(fp: str) -> Dict:
+    from src.core.event_store import build_table, to_arrays
+
+    with open(fp, "rb") as f:
+        records = map(json.loads, f)
+        return to_arrays(build_table((record["pid"], record["doc"]) for record in records))
+
+
+def build_sharded_table(path: Union[str, Path], workers: Optional[int] = None) -> EventTable:
+    """``build_table`` of a sharded file, one shard per worker; same codes as a serial build."""
+    from src.core.event_store import build_table, concat_tables, from_arrays
+
+    files = [str(fp) for fp in shard_files(path)]
+    workers = max(1, min(workers or os.cpu_count() or 1, len(files)))
+    if workers == 1:
+        return build_table(iter_shards(path))
+    with _pool(workers) as pool:
+        return concat_tables(from_arrays(arrays) for arrays in pool.map(_shard_arrays, files))
+
+
+def _write_shard(fp: str, lo: int, hi: int, items: Optional[List[Tuple[str, Dict]]] = None) -> int:
+    """Write ``items`` (or ``_ITEMS[lo:hi]`` inherited through fork); return the byte size."""
+    items = _ITEMS[lo:hi] if items is None else items
+    atomic_write(fp, lambda f: f.write(b"".join(_record(pid, doc) for pid, doc in items)))
+    return os.path.getsize(fp)
+
+
+def write_shards(data: Dict[str, Dict], path: Union[str, Path], n_shards: Optional[int] = None,
+                 workers: Optional[int] = None) -> Dict:
+    """Write ``{pid: paragraph}`` as ``n_shards`` (default: CPU count) NDJSON shards; returns the manifest."""
+    global _ITEMS
+    path = Path(path)
+    items = list(data.items())
+    n_shards = max(1, min(n_shards or os.cpu_count() or 1, len(items)))
+    bounds = [len(items) * i // n_shards for i in range(n_shards + 1)]
+    tag = os.urandom(4).hex()  # never reuse a name the current manifest may point at
+    files = [f"part-{tag}-{i:05d}.ndjson" for i in range(n_shards)]
+    path.mkdir(parents=True, exist_ok=True)
+
+    workers = max(1, min(workers or os.cpu_count() or 1, n_shards))
+    fps = [str(path / name) for name in files]
+    if workers == 1:
+        sizes = [_write_shard(fp, lo, hi, items[lo:hi]) for fp, lo, hi in zip(fps, bounds, bounds[1:])]
+    else:
+        forked = _context().get_start_method() == "fork"
+        chunks = [None if forked else items[lo:hi] for lo, hi in zip(bounds, bounds[1:])]
+        _ITEMS = items
+        try:
+            with _pool(workers) as pool:
+                sizes = list(pool.map(_write_shard, fps, bounds, bounds[1:], chunks))
+        finally:
+            _ITEMS = None
+
+    manifest = {
+        "format": FORMAT,
+        "version": VERSION,
+        "paragraphs": len(items),
+        "shards": [{"file": name, "paragraphs": hi - lo, "bytes": size}
+                   for name, lo, hi, size in zip(files, bounds, bounds[1:], sizes)],
+    }
+    payload = json.dumps(manifest, indent=2, ensure_ascii=False).encode("utf-8")
+    atomic_write(path / MANIFEST_NAME, lambda f: f.write(payload))
+    for stale in path.glob("part-*.ndjson"):  # the previous write's shards, now unreferenced
+        if stale.name not in files:
+            stale.unlink(missing_ok=True)
+    return manifest
+
+
+def split(json_path: Union[str, Path], out_path: Union[str, Path], n_shards: Optional[int] = None,
+          workers: Optional[int] = None) -> Dict:
+    """Convert a ``{pid: paragraph}`` JSON file to a sharded file."""
+    from src.core.streaming import iter_paragraphs
+
+    return write_shards(dict(iter_paragraphs(str(json_path))), out_path, n_shards=n_shards, workers=workers)
+
+
+def join(path: Union[str, Path], json_path: Union[str, Path]):
+    """Convert a sharded file back to pretty-printed JSON (the bytes ``save_json`` would write)."""
+    atomic_write(json_path, lambda f: write_json_items(f, iter_shards(path)))
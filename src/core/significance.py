@@ -0,0 +1,239 @@
+#src/core/significance.py
+# -------------------------------------------------------------
+"""Bootstrap confidence intervals and paired significance tests.
+
+``metrics_v2.evaluate`` gives point estimates; to tell whether agentA and
+agentB really differ, documents (paragraphs) are resampled thousands of times.
+Re-running the pipeline per resample is not needed: every ``evaluate()``
+number is a ratio of sums over documents, so each system is reduced once to a
+``(documents x STATISTICS)`` matrix of per-document sums
+
+    n_gold, n_system, n_mapped_gold      event and mapped-gold counts
+    span_tp                              best Dice per mapped gold mention
+    type, subtype, modality, polarity,   Σ 1/|MG| over matching pairs
+    realis                               (Algorithm 3 numerators)
+    combined_tp                          Σ Dice/|MG| over all-attribute matches
+
+and a resample is one matrix product: ``weights @ statistics`` with
+``weights[b, d]`` the number of times document ``d`` was drawn.
+
+*   Paired bootstrap: the same document draws are applied to every system.
+    Percentile intervals per system and for each pairwise difference; the
+    p-value follows Berg-Kirkpatrick et al. (2012): the share of resamples
+    whose difference exceeds twice the observed one.
+*   Approximate randomization: per document, the two systems' statistics are
+    swapped with probability 1/2; p = (1 + #{|Δ*| ≥ |Δ|}) / (1 + R).
+
+Resamples are cut into chunks of at most ``CHUNK_ELEMENTS`` (resample x
+document) cells — the draw / weight matrices a chunk materializes — each
+seeded with its own child of ``np.random.SeedSequence(seed)``, and spread over
+a ``ProcessPoolExecutor``.  Chunking depends on the document count only, not
+on the worker count, so a given seed gives the same numbers with 1 or 16
+workers.
+"""
+from __future__ import annotations
+
+import multiprocessing as mp
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.core import metric_kernel as kernel
+from src.core.event_store import EventTable
+from src.core.metric_kernel import Mapping
+from src.core.telemetry import Telemetry, get_telemetry
+
+STATISTICS = ("n_gold", "n_system", "n_mapped_gold", "span_tp",
+              "type", "subtype", "modality", "polarity", "realis", "combined_tp")
+METRICS = ("Span_Precision", "Span_Recall", "Span_F1",
+           "Type_Accuracy", "Subtype_Accuracy", "Modality_Accuracy", "Polarity_Accuracy", "Realis_Accuracy",
+           "Combined_Precision", "Combined_Recall", "Combined_F1")
+CHUNK_ELEMENTS = 1 << 20  # cap on the (resamples x documents) matrices of one chunk
+
+_STATS: Optional[np.ndarray] = None  # (systems, documents, STATISTICS); set in the parent or by _init_worker
+
+
+def _init_worker(stats: np.ndarray):
+    global _STATS
+    _STATS = stats
+
+
+# ----- Sufficient statistics -----
+def document_statistics(gold: EventTable, system: EventTable, mapping: Mapping, docs: np.ndarray) -> np.ndarray:
+    """Per-document sums (rows follow ``docs``, columns ``STATISTICS``).
+
+    ``system`` must share ``gold``'s vocabs; ``docs`` is the sorted array of
+    doc-id codes to report on and must contain every document of both tables.
+    """
+    n_docs = len(docs)
+    g_doc = np.searchsorted(docs, gold.columns["doc_id"])
+    s_doc = np.searchsorted(docs, system.columns["doc_id"])
+    pairs = kernel.pair_columns(mapping)
+    gold_cols, sys_cols = kernel.encode_attributes(gold, system)
+    matches = {attr: kernel.attribute_matches(pairs, gold_cols, sys_cols, (attr,)) for attr in kernel.ATTRIBUTES}
+    matches["realis"] = matches["modality"] & matches["polarity"]
+    all_match = matches["realis"] & matches["type"] & matches["subtype"]
+    pair_doc = g_doc[pairs["gid"]]
+
+    best = np.zeros(len(gold), dtype=np.float64)
+    np.maximum.at(best, pairs["gid"], pairs["dice"])
+    stats = np.zeros((n_docs, len(STATISTICS)), dtype=np.float64)
+    stats[:, 0] = np.bincount(g_doc, minlength=n_docs)
+    stats[:, 1] = np.bincount(s_doc, minlength=n_docs)
+    stats[:, 2] = np.bincount(g_doc[np.unique(pairs["gid"])], minlength=n_docs)
+    stats[:, 3] = np.bincount(g_doc, weights=best, minlength=n_docs)
+    for col, attr in enumerate(("type", "subtype", "modality", "polarity", "realis"), start=4):
+        stats[:, col] = np.bincount(pair_doc, weights=matches[attr] * pairs["weight"], minlength=n_docs)
+    stats[:, 9] = np.bincount(pair_doc, weights=all_match * pairs["dice"] * pairs["weight"], minlength=n_docs)
+    return stats
+
+
+def metrics_from_sums(sums: np.ndarray) -> Dict[str, np.ndarray]:
+    """``METRICS`` (percent, unrounded) from summed statistics; any leading shape is kept."""
+    col = {name: sums[..., i] for i, name in enumerate(STATISTICS)}
+
+    def ratio(num, den):
+        return np.divide(num, den, out=np.zeros(np.shape(num)), where=den > 0) * 100
+
+    def f1(p, r):
+        return np.divide(2 * p * r, p + r, out=np.zeros(np.shape(p)), where=(p + r) > 0)
+
+    out = {}
+    for prefix, tp in (("Span", col["span_tp"]), ("Combined", col["combined_tp"])):
+        p, r = ratio(tp, col["n_system"]), ratio(tp, col["n_gold"])
+        out[f"{prefix}_Precision"], out[f"{prefix}_Recall"], out[f"{prefix}_F1"] = p, r, f1(p, r)
+    for attr in ("type", "subtype", "modality", "polarity", "realis"):
+        out[f"{attr.capitalize()}_Accuracy"] = ratio(col[attr], col["n_mapped_gold"])
+    return {name: out[name] for name in METRICS}
+
+
+def paired_statistics(gold: EventTable, systems: Sequence[EventTable],
+                      threshold: float = 0.0) -> Tuple[np.ndarray, np.ndarray]:
+    """``(doc codes, stats)`` with ``stats`` shaped ``(systems, documents, STATISTICS)``.
+
+    Documents are the union of all tables' paragraphs, so system-only
+    paragraphs still count towards ``n_system`` as they do in ``evaluate``.
+    """
+    from src.core.metrics_v2 import mention_mapping  # metrics_v2 imports this module's helpers
+
+    systems = [s.recode(gold.vocabs) for s in systems]
+    docs = np.unique(np.concatenate([gold.doc_codes] + [s.doc_codes for s in systems]))
+    stats = np.stack([document_statistics(gold, s, mention_mapping(gold, s, threshold=threshold), docs)
+                      for s in systems])
+    return docs, stats
+
+
+# ----- Resampling -----
+def _bootstrap_chunk(seed: np.random.SeedSequence, size: int) -> np.ndarray:
+    """Summed statistics of ``size`` paired resamples: ``(systems, size, STATISTICS)``."""
+    n_docs = _STATS.shape[1]
+    rng = np.random.default_rng(seed)
+    draws = rng.integers(0, n_docs, size=(size, n_docs)) + np.arange(size)[:, None] * n_docs
+    weights = np.bincount(draws.ravel(), minlength=size * n_docs).reshape(size, n_docs)
+    return weights.astype(np.float64) @ _STATS
+
+
+def _randomization_chunk(seed: np.random.SeedSequence, size: int, a: int, b: int) -> np.ndarray:
+    """System ``a``'s summed statistics after random per-document swaps with ``b``: ``(size, STATISTICS)``."""
+    rng = np.random.default_rng(seed)
+    swap = rng.random((size, _STATS.shape[1])) < 0.5
+    return _STATS[a].sum(axis=0) + swap.astype(np.float64) @ (_STATS[b] - _STATS[a])
+
+
+def _chunks(n_resamples: int, n_docs: int) -> List[int]:
+    step = max(1, CHUNK_ELEMENTS // max(n_docs, 1))
+    return [min(step, n_resamples - lo) for lo in range(0, n_resamples, step)]
+
+
+def _run_chunks(pool: Optional[ProcessPoolExecutor], fn, tasks: List[Tuple]) -> List[np.ndarray]:
+    if pool is None:
+        return [fn(*task) for task in tasks]
+    return [future.result() for future in [pool.submit(fn, *task) for task in tasks]]
+
+
+def _interval(samples: np.ndarray, confidence: float) -> Tuple[float, float]:
+    tail = (1 - confidence) / 2 * 100
+    low, high = np.percentile(samples, [tail, 100 - tail])
+    return round(float(low), 1), round(float(high), 1)
+
+
+def significance(stats: np.ndarray, names: Sequence[str], n_resamples: int = 1000, confidence: float = 0.95,
+                 seed: int = 0, workers: Optional[int] = None,
+                 telemetry: Optional[Telemetry] = None) -> Dict:
+    """Bootstrap intervals for every system and paired tests for every pair of systems.
+
+    ``stats`` comes from ``paired_statistics``; ``names`` labels its first axis.
+    """
+    global _STATS
+    telemetry = get_telemetry(telemetry)
+    n_systems, n_docs, _ = stats.shape
+    observed = metrics_from_sums(stats.sum(axis=1))  # (systems,) per metric
+    sizes = _chunks(n_resamples, n_docs)
+    pairs = list(combinations(range(n_systems), 2))
+    root = np.random.SeedSequence(seed)
+    boot_seeds, *pair_seeds = root.spawn(1 + len(pairs))
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(sizes) * (1 + len(pairs))))
+    pool = None
+    _STATS = stats
+    try:
+        if workers > 1:
+            methods = mp.get_all_start_methods()
+            context = mp.get_context("fork" if "fork" in methods else None)
+            pool = ProcessPoolExecutor(workers, mp_context=context, initializer=_init_worker, initargs=(stats,))
+        with telemetry.phase("bootstrap") as counts:
+            tasks = list(zip(boot_seeds.spawn(len(sizes)), sizes))
+            boot = metrics_from_sums(np.concatenate(_run_chunks(pool, _bootstrap_chunk, tasks), axis=1))
+            counts["resamples"] = n_resamples
+            counts["documents"] = n_docs
+        with telemetry.phase("randomization") as counts:
+            randomized = []
+            for (a, b), pair_seed in zip(pairs, pair_seeds):
+                tasks = [(s, size, a, b) for s, size in zip(pair_seed.spawn(len(sizes)), sizes)]
+                sums_a = np.concatenate(_run_chunks(pool, _randomization_chunk, tasks))
+                sums_b = stats[a].sum(axis=0) + stats[b].sum(axis=0) - sums_a
+                randomized.append((metrics_from_sums(sums_a), metrics_from_sums(sums_b)))
+            counts["pairs"] = len(pairs)
+            counts["resamples"] = n_resamples * len(pairs)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        _STATS = None
+
+    report = {"n_documents": n_docs, "n_resamples": n_resamples, "confidence": confidence, "seed": seed,
+              "systems": {}, "comparisons": {}}
+    for i, name in enumerate(names):
+        report["systems"][name] = {}
+        for metric in METRICS:
+            low, high = _interval(boot[metric][i], confidence)
+            report["systems"][name][metric] = {"estimate": round(float(observed[metric][i]), 1),
+                                               "low": low, "high": high}
+    for (a, b), (perm_a, perm_b) in zip(pairs, randomized):
+        comparison = {}
+        for metric in METRICS:
+            delta = float(observed[metric][a] - observed[metric][b])
+            boot_delta = boot[metric][a] - boot[metric][b]
+            perm_delta = perm_a[metric] - perm_b[metric]
+            low, high = _interval(boot_delta, confidence)
+            p_boot = float(np.mean(np.sign(delta) * boot_delta > 2 * abs(delta))) if delta else 1.0
+            p_rand = float((1 + np.sum(np.abs(perm_delta) >= abs(delta) - 1e-9)) / (1 + n_resamples))
+            comparison[metric] = {"delta": round(delta, 1), "low": low, "high": high,
+                                  "p_bootstrap": round(p_boot, 4), "p_randomization": round(p_rand, 4)}
+        report["comparisons"][f"{names[a]} vs {names[b]}"] = comparison
+    return report
+
+
+def compare_systems(gold: EventTable, systems: Dict[str, EventTable], n_resamples: int = 1000,
+                    confidence: float = 0.95, seed: int = 0, workers: Optional[int] = None,
+                    threshold: float = 0.0, telemetry: Optional[Telemetry] = None) -> Dict:
+    """``paired_statistics`` + ``significance`` for ``{name: system table}`` against ``gold``."""
+    telemetry = get_telemetry(telemetry)
+    with telemetry.phase("statistics") as counts:
+        docs, stats = paired_statistics(gold, list(systems.values()), threshold=threshold)
+        counts["documents"] = len(docs)
+        counts["systems"] = len(systems)
+    return significance(stats, list(systems), n_resamples=n_resamples, confidence=confidence, seed=seed,
+                        workers=workers, telemetry=telemetry)
@@ -0,0 +1,274 @@
+#src/core/span_alignment.py
+# -------------------------------------------------------------
+"""Token-offset span alignment for triggers.
+
+Trigger matching elsewhere compares whitespace-split token *strings*
+(``extract_all_trigger_tokens``): two annotations of the same word at
+different places in a paragraph look identical, and a discontiguous trigger
+loses the order of its pieces.  This module resolves every trigger — main
+span plus ``extra_trigger_spans`` — to half-open token intervals
+``[start, end)`` within its paragraph and compares *position sets*.
+
+Resolution, per trigger (or extra span) in annotation order:
+
+1.  explicit offsets: ``{"start": s, "end": e}`` token indices on the
+    trigger / extra-span dict;
+2.  otherwise the paragraph's tokens (``paragraph["tokens"]`` or
+    ``paragraph["text"].split()``; the files are already word-segmented):
+    the k-th annotation of a surface string in the paragraph takes the
+    string's k-th occurrence, and an extra span takes the first occurrence
+    after the main span (else the nearest one before it), so order is kept;
+3.  otherwise the span is *unresolved* (``SpanTable.resolved`` is False).
+    The shipped ``tokenized_data_*`` files carry neither offsets nor paragraph
+    tokens, so callers must keep the token-set fallback for them.
+
+``metrics_v2.mention_mapping(spans=...)`` (``evaluate(positions=True)``,
+``score --positions``) scores a candidate pair with ``position_scores`` when
+both mentions resolve and with token-set Dice otherwise.
+
+``SpanTable`` stores the intervals row-aligned with ``EventTable`` (same
+paragraph / mention order).  ``IntervalIndex`` answers "which mentions
+overlap [s, e)" in O(log n + k) per paragraph, via intervals sorted by start
+and a max-end segment tree.
+"""
+from __future__ import annotations
+
+from array import array
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from src.core.event_store import gather_csr
+
+Span = Tuple[int, int]
+
+
+# ----- Resolution -----
+def paragraph_tokens(paragraph: Dict) -> Optional[List[str]]:
+    if "tokens" in paragraph:
+        return list(paragraph["tokens"])
+    if "text" in paragraph:
+        return paragraph["text"].split()
+    return None
+
+
+class _Occurrences:
+    """Start positions of each token sequence in a paragraph, found lazily."""
+
+    def __init__(self, tokens: Sequence[str]):
+        self.tokens = tokens
+        self.by_first = defaultdict(list)
+        for pos, tok in enumerate(tokens):
+            self.by_first[tok].append(pos)
+        self.cache: Dict[Tuple[str, ...], List[int]] = {}
+
+    def __call__(self, words: Tuple[str, ...]) -> List[int]:
+        if words not in self.cache:
+            n = len(words)
+            self.cache[words] = [p for p in self.by_first.get(words[0], ())
+                                 if tuple(self.tokens[p:p + n]) == words]
+        return self.cache[words]
+
+
+def _explicit(span) -> Optional[Span]:
+    if isinstance(span, dict) and "start" in span and "end" in span:
+        return int(span["start"]), int(span["end"])
+    return None
+
+
+def resolve_trigger_spans(paragraph: Dict) -> List[Optional[List[Span]]]:
+    """Per mention of ``paragraph``: its trigger intervals in annotation order, or ``None``."""
+    tokens = paragraph_tokens(paragraph)
+    occurrences = _Occurrences(tokens) if tokens is not None else None
+    seen: Dict[Tuple[str, ...], int] = defaultdict(int)  # k-th annotation of a surface string
+    resolved: List[Optional[List[Span]]] = []
+
+    for mention in paragraph.get("event_mentions", []):
+        trigger = mention["trigger"]
+        main = _explicit(trigger)
+        if main is None and occurrences is not None:
+            words = tuple(trigger["text"].split())
+            starts = occurrences(words) if words else []
+            if starts:
+                start = starts[min(seen[words], len(starts) - 1)]
+                seen[words] += 1
+                main = (start, start + len(words))
+        if main is None:
+            resolved.append(None)
+            continue
+
+        spans = [main]
+        for extra in trigger.get("extra_trigger_spans", []):
+            span = _explicit(extra)
+            if span is None and occurrences is not None:
+                text = extra if isinstance(extra, str) else extra.get("text", "")
+                words = tuple(text.split())
+                starts = occurrences(words) if words else []
+                after = [s for s in starts if s >= main[1]]
+                if after:
+                    span = (after[0], after[0] + len(words))
+                elif starts:
+                    span = (starts[-1], starts[-1] + len(words))
+            if span is not None:
+                spans.append(span)
+        resolved.append(spans)
+    return resolved
+
+
+# ----- Columnar storage -----
+class SpanTable:
+    """Trigger intervals of every mention, row-aligned with ``EventTable``.
+
+    Row ``i`` owns intervals ``span_ptr[i]:span_ptr[i+1]`` (annotation order)
+    and the sorted, unique token positions ``pos_ptr[i]:pos_ptr[i+1]``.
+    """
+
+    __slots__ = ("doc_ptr", "span_ptr", "starts", "ends", "pos_ptr", "positions", "resolved")
+
+    def __init__(self, doc_ptr, span_ptr, starts, ends, pos_ptr, positions, resolved):
+        self.doc_ptr = doc_ptr
+        self.span_ptr = span_ptr
+        self.starts = starts
+        self.ends = ends
+        self.pos_ptr = pos_ptr
+        self.positions = positions
+        self.resolved = resolved
+
+    def __len__(self) -> int:
+        return len(self.span_ptr) - 1
+
+    def spans(self, i: int) -> List[Span]:
+        lo, hi = self.span_ptr[i], self.span_ptr[i + 1]
+        return list(zip(self.starts[lo:hi].tolist(), self.ends[lo:hi].tolist()))
+
+    def positions_of(self, i: int) -> np.ndarray:
+        return self.positions[self.pos_ptr[i]:self.pos_ptr[i + 1]]
+
+    def index(self, doc: int) -> "IntervalIndex":
+        """Interval index over the resolved mentions of paragraph ``doc``."""
+        first, last = self.doc_ptr[doc], self.doc_ptr[doc + 1]
+        rows = np.repeat(np.arange(first, last), np.diff(self.span_ptr[first:last + 1]))
+        lo, hi = self.span_ptr[first], self.span_ptr[last]
+        return IntervalIndex(self.starts[lo:hi], self.ends[lo:hi], rows)
+
+
+def build_span_table(json_data: Union[Dict, Iterable[Tuple[str, Dict]]]) -> SpanTable:
+    """Resolve every trigger of a ``{pid: paragraph}`` dict or ``(pid, paragraph)`` pairs."""
+    doc_ptr, span_ptr, pos_ptr = array("q", [0]), array("q", [0]), array("q", [0])
+    starts, ends, positions, resolved = array("q"), array("q"), array("q"), array("b")
+    items = json_data.items() if isinstance(json_data, dict) else json_data
+    for _, paragraph in items:
+        for spans in resolve_trigger_spans(paragraph):
+            resolved.append(spans is not None)
+            spans = spans or []
+            for s, e in spans:
+                starts.append(s)
+                ends.append(e)
+            pos = sorted({p for s, e in spans for p in range(s, e)})
+            positions.extend(pos)
+            span_ptr.append(len(starts))
+            pos_ptr.append(len(positions))
+        doc_ptr.append(len(span_ptr) - 1)
+    return SpanTable(_np(doc_ptr), _np(span_ptr), _np(starts), _np(ends), _np(pos_ptr), _np(positions),
+                     _np(resolved, np.int8).astype(bool))
+
+
+def _np(buf: array, dtype=np.int64) -> np.ndarray:
+    return np.frombuffer(buf, dtype=dtype).copy() if len(buf) else np.zeros(0, dtype=dtype)
+
+
+# ----- Interval index -----
+class IntervalIndex:
+    """Static overlap index over half-open intervals, each labelled with a row id.
+
+    Intervals are sorted by start; a segment tree keeps the max end of every
+    block.  ``overlapping(s, e)`` only walks blocks whose start can be < e and
+    whose max end is > s: O(log n + k) for k hits.
+    """
+
+    def __init__(self, starts: np.ndarray, ends: np.ndarray, rows: np.ndarray):
+        order = np.argsort(starts, kind="stable")
+        self.starts = np.asarray(starts)[order]
+        self.ends = np.asarray(ends)[order]
+        self.rows = np.asarray(rows)[order]
+        n = len(self.starts)
+        self.size = 1 << max(n - 1, 0).bit_length()
+        tree = np.full(2 * self.size, np.iinfo(np.int64).min, dtype=np.int64)
+        tree[self.size:self.size + n] = self.ends
+        level = self.size
+        while level > 1:  # fill one tree level at a time, leaves upwards
+            tree[level // 2:level] = np.maximum(tree[level:2 * level:2], tree[level + 1:2 * level:2])
+            level //= 2
+        self.max_end = tree
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def overlapping(self, start: int, end: int) -> np.ndarray:
+        """Row ids of intervals overlapping ``[start, end)``."""
+        limit = int(np.searchsorted(self.starts, end, side="left"))  # only starts < end qualify
+        if limit == 0:
+            return np.zeros(0, dtype=self.rows.dtype)
+        hits, stack = [], [(1, 0, self.size)]
+        max_end = self.max_end
+        while stack:
+            node, lo, hi = stack.pop()
+            if lo >= limit or max_end[node] <= start:
+                continue
+            if hi - lo == 1:
+                hits.append(lo)
+                continue
+            mid = (lo + hi) // 2
+            stack.append((2 * node + 1, mid, hi))
+            stack.append((2 * node, lo, mid))
+        return np.unique(self.rows[hits])
+
+
+# ----- Position-set scores -----
+def position_dice(a: np.ndarray, b: np.ndarray) -> float:
+    """Dice of two sorted, unique position arrays."""
+    total = len(a) + len(b)
+    if total == 0:
+        return 0.0
+    return 2 * len(np.intersect1d(a, b, assume_unique=True)) / total
+
+
+def position_dice_many(gold: SpanTable, system: SpanTable, gids: np.ndarray, sids: np.ndarray) -> np.ndarray:
+    """Position-set Dice of every ``(gids[k], sids[k])`` pair, vectorized like ``dice_many``."""
+    n_pairs = len(gids)
+    if n_pairs == 0:
+        return np.zeros(0, dtype=np.float64)
+    g_owner, g_pos, g_len = gather_csr(gold.pos_ptr, gold.positions, gids)
+    s_owner, s_pos, s_len = gather_csr(system.pos_ptr, system.positions, sids)
+    width = np.int64(max(int(g_pos.max(initial=0)), int(s_pos.max(initial=0))) + 1)
+    common = np.intersect1d(g_owner * width + g_pos, s_owner * width + s_pos, assume_unique=True)
+    inter = np.bincount(common // width, minlength=n_pairs)
+    total = g_len + s_len
+    return np.divide(2 * inter, total, out=np.zeros(n_pairs, dtype=np.float64), where=total > 0)
+
+
+def position_scores(gold: SpanTable, system: SpanTable, gids: np.ndarray, sids: np.ndarray) -> np.ndarray:
+    """Pair scores on positions: 1.0 for exact matches (``exact_match_many``), position-set Dice for the rest.
+
+    All pairs must be resolved on both sides.
+    """
+    scores = np.ones(len(gids), dtype=np.float64)
+    rest = ~exact_match_many(gold, system, gids, sids)
+    scores[rest] = position_dice_many(gold, system, gids[rest], sids[rest])
+    return scores
+
+
+def exact_match_many(gold: SpanTable, system: SpanTable, gids: np.ndarray, sids: np.ndarray) -> np.ndarray:
+    """True where both mentions are resolved and cover the same intervals in the same order."""
+    n_spans = np.diff(gold.span_ptr)[gids]
+    rows = np.flatnonzero(gold.resolved[gids] & system.resolved[sids] & (n_spans == np.diff(system.span_ptr)[sids]))
+    # Equal interval counts on the selected rows, so the gathered arrays line up element by element.
+    owner, g_start, _ = gather_csr(gold.span_ptr, gold.starts, gids[rows])
+    _, g_end, _ = gather_csr(gold.span_ptr, gold.ends, gids[rows])
+    _, s_start, _ = gather_csr(system.span_ptr, system.starts, sids[rows])
+    _, s_end, _ = gather_csr(system.span_ptr, system.ends, sids[rows])
+    mismatched = np.bincount(owner, weights=(g_start != s_start) | (g_end != s_end), minlength=len(rows))
+    result = np.zeros(len(gids), dtype=bool)
+    result[rows] = mismatched == 0
+    return result
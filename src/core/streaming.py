@@ -0,0 +1,116 @@
+#src/core/streaming.py
+# -------------------------------------------------------------
+"""Streaming reader for ``{pid: {event_mentions: [...]}}`` files.
+
+``json.load`` materialises the whole tree before ``parse_events`` copies the
+events out of it, so peak memory is several times the file size.  The reader
+below tokenizes only the top-level object incrementally: it keeps a bounded
+text buffer, decodes one ``pid: paragraph`` member at a time with
+``json.JSONDecoder.raw_decode`` and drops it as soon as the caller moves on.
+Peak memory is therefore bounded by the largest paragraph, not the file.
+
+A sharded ``.shards`` directory (``src/core/shards.py``) is read line by line
+instead.
+"""
+from __future__ import annotations
+
+import json
+import os
+from json.decoder import scanstring
+from typing import Dict, Iterator, Tuple
+
+CHUNK_SIZE = 1 << 16
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+
+
+class _Buffer:
+    """Sliding text window over a file; ``pos`` is relative to ``text``."""
+
+    def __init__(self, fh, chunk_size: int):
+        self.fh = fh
+        self.chunk_size = chunk_size
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self, size: int = 0) -> bool:
+        """Drop consumed text and append one more chunk; False once the file is exhausted."""
+        if self.eof:
+            return False
+        chunk = self.fh.read(size or self.chunk_size)
+        self.text = self.text[self.pos:] + chunk
+        self.pos = 0
+        if not chunk:
+            self.eof = True
+        return bool(chunk)
+
+    def next_char(self) -> str:
+        """Skip whitespace and return the next significant character ('' at EOF)."""
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, char: str):
+        found = self.next_char()
+        if found != char:
+            raise json.JSONDecodeError(f"Expecting {char!r}, found {found!r}", self.text, self.pos)
+        self.pos += 1
+
+    def decode_key(self) -> str:
+        self.expect('"')
+        while True:
+            try:
+                key, end = scanstring(self.text, self.pos)
+                self.pos = end
+                return key
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+
+    def decode_value(self):
+        self.next_char()
+        # Grow the read size geometrically so a value larger than one chunk
+        # is re-scanned O(log n) times rather than O(n / chunk_size).
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.text, self.pos)
+                # A scalar ending exactly at the buffer edge may be truncated.
+                if end < len(self.text) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self.fill(size)
+            size *= 2
+
+
+def iter_paragraphs(path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[Tuple[str, Dict]]:
+    """Yield ``(pid, paragraph)`` pairs from a top-level JSON object, one at a time."""
+    if os.path.isdir(path):
+        from src.core.shards import iter_shards  # shards imports gold_store, which is heavier
+
+        yield from iter_shards(path)
+        return
+    with open(path, "r", encoding="utf-8") as fh:
+        buf = _Buffer(fh, chunk_size)
+        buf.expect("{")
+        if buf.next_char() == "}":
+            return
+        while True:
+            pid = buf.decode_key()
+            buf.expect(":")
+            yield pid, buf.decode_value()
+            sep = buf.next_char()
+            buf.pos += 1
+            if sep == "}":
+                return
+            if sep != ",":
+                raise json.JSONDecodeError(f"Expecting ',' or '}}', found {sep!r}", buf.text, buf.pos - 1)
@@ -0,0 +1,212 @@
+#src/core/telemetry.py
+# -------------------------------------------------------------
+"""Per-phase instrumentation for the evaluation pipeline.
+
+``metrics_v2`` used to wrap its loops in ``tqdm`` and ``print`` every step.
+Instead, each pipeline phase (parse, index, dice, match, metrics) now runs
+inside ``telemetry.phase(name)``, which records
+
+*   wall time (``perf_counter``) and CPU time (``process_time``);
+*   peak memory: the process high-water RSS (``resource``, where available),
+    plus the phase's own traced peak when ``trace_memory=True``
+    (``tracemalloc`` — accurate but slows allocation, so off by default);
+*   item counts filled in by the phase (events, candidate pairs, ...).
+
+Records and free-form notes go to a pluggable sink:
+
+*   ``SilentSink`` — library mode (the default): nothing is written, the
+    records stay available in ``Telemetry.records``;
+*   ``LoggingSink`` — one log line per phase;
+*   ``JsonSink`` — one JSON object per line (batch jobs, dashboards);
+*   ``ConsoleSink`` — the human-readable CLI output.
+
+Progress bars are off unless ``progress=True``; when on, they are throttled
+to one redraw per ``progress_interval`` seconds and check the clock only every
+``PROGRESS_STRIDE`` items.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, TextIO, Union
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+LOGGER = logging.getLogger(__name__)
+
+PROGRESS_STRIDE = 256
+
+
+def peak_rss_kb() -> Optional[int]:
+    """Process high-water resident set size in KiB (``None`` where unsupported)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # bytes on macOS, KiB on Linux
+
+
+# ----- Sinks -----
+class SilentSink:
+    def record(self, record: Dict):
+        pass
+
+    def note(self, message: str):
+        pass
+
+
+class LoggingSink:
+    def __init__(self, logger: logging.Logger = LOGGER, level: int = logging.INFO):
+        self.logger = logger
+        self.level = level
+
+    def record(self, record: Dict):
+        self.logger.log(self.level, "phase %s: %.3fs wall, %.3fs cpu, peak RSS %s KiB, %s",
+                        record["phase"], record["wall_s"], record["cpu_s"], record["peak_rss_kb"], record["counts"])
+
+    def note(self, message: str):
+        self.logger.log(self.level, message)
+
+
+class JsonSink:
+    """JSON lines to a path (appended) or an open text stream."""
+
+    def __init__(self, target: Union[str, Path, TextIO] = sys.stderr):
+        self.target = target
+
+    def _write(self, obj: Dict):
+        line = json.dumps(obj, ensure_ascii=False) + "\n"
+        if isinstance(self.target, (str, Path)):
+            with open(self.target, "a", encoding="utf-8") as f:
+                f.write(line)
+        else:
+            self.target.write(line)
+
+    def record(self, record: Dict):
+        self._write(record)
+
+    def note(self, message: str):
+        self._write({"note": message})
+
+
+class ConsoleSink:
+    def __init__(self, stream: TextIO = sys.stdout):
+        self.stream = stream
+
+    def record(self, record: Dict):
+        counts = ", ".join(f"{k}={v:,}" if isinstance(v, int) else f"{k}={v}" for k, v in record["counts"].items())
+        print(f"⏱️  {record['phase']:<8s} {record['wall_s']:7.3f}s wall {record['cpu_s']:7.3f}s cpu"
+              f"{'  ' + counts if counts else ''}", file=self.stream)
+
+    def note(self, message: str):
+        print(message, file=self.stream)
+
+
+# ----- Progress -----
+class Progress:
+    """Throttled ``done/total`` line on stderr."""
+
+    def __init__(self, total: Optional[int], desc: str, interval: float, stream: TextIO = sys.stderr):
+        self.total, self.desc, self.interval, self.stream = total, desc, interval, stream
+        self.n = 0
+        self._next_check = PROGRESS_STRIDE
+        self._last = time.monotonic()
+
+    def update(self, n: int = 1):
+        self.n += n
+        if self.n >= self._next_check:
+            self._next_check = self.n + PROGRESS_STRIDE
+            now = time.monotonic()
+            if now - self._last >= self.interval:
+                self._last = now
+                self._render()
+
+    def _render(self, end: str = "\r"):
+        of = f"/{self.total:,}" if self.total is not None else ""
+        self.stream.write(f"{self.desc}: {self.n:,}{of}{end}")
+        self.stream.flush()
+
+    def close(self):
+        self._render(end="\n")
+
+
+class _NullProgress:
+    def update(self, n: int = 1):
+        pass
+
+    def close(self):
+        pass
+
+
+NULL_PROGRESS = _NullProgress()
+
+
+# ----- Telemetry -----
+class Telemetry:
+    def __init__(self, sink=None, progress: bool = False, progress_interval: float = 0.5,
+                 trace_memory: bool = False):
+        self.sink = sink if sink is not None else SilentSink()
+        self.show_progress = progress
+        self.progress_interval = progress_interval
+        self.trace_memory = trace_memory
+        self.records: List[Dict] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[Dict]:
+        """Time the ``with`` body; the yielded dict collects the phase's item counts."""
+        counts: Dict = {}
+        started_tracing = False
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            tracemalloc.reset_peak()
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield counts
+        finally:
+            record = {
+                "phase": name,
+                "wall_s": time.perf_counter() - wall,
+                "cpu_s": time.process_time() - cpu,
+                "peak_rss_kb": peak_rss_kb(),
+                "counts": counts,
+            }
+            if self.trace_memory:
+                record["traced_peak_bytes"] = tracemalloc.get_traced_memory()[1]
+                if started_tracing:
+                    tracemalloc.stop()
+            self.records.append(record)
+            self.sink.record(record)
+
+    def note(self, message: str):
+        self.sink.note(message)
+
+    def progress(self, total: Optional[int], desc: str):
+        if not self.show_progress:
+            return NULL_PROGRESS
+        return Progress(total, desc, self.progress_interval)
+
+    def summary(self) -> Dict[str, Dict]:
+        """``{phase: {wall_s, cpu_s, peak_rss_kb, counts}}``; repeated phases are summed."""
+        out: Dict[str, Dict] = {}
+        for record in self.records:
+            entry = out.setdefault(record["phase"], {"wall_s": 0.0, "cpu_s": 0.0, "counts": {}})
+            entry["wall_s"] += record["wall_s"]
+            entry["cpu_s"] += record["cpu_s"]
+            entry["peak_rss_kb"] = record["peak_rss_kb"]
+            for key, value in record["counts"].items():
+                entry["counts"][key] = entry["counts"].get(key, 0) + value
+        return out
+
+
+def get_telemetry(telemetry: Optional[Telemetry]) -> Telemetry:
+    """The caller's telemetry, or a fresh silent one (library mode)."""
+    return telemetry if telemetry is not None else Telemetry()
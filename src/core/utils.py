@@ -1,41 +1,78 @@
+from __future__ import annotations
 import json
 from pathlib import Path
-from typing import Dict, Set, Tuple
-from sklearn.metrics import cohen_kappa_score
+from typing import TYPE_CHECKING, Dict, Optional, Set, Tuple, Union
+from src.core.shards import SHARD_SUFFIX, is_sharded, read_shards, write_shards
 
-def load_json(fp: str) -> dict:
+# The JSON helpers are used by every CLI, including ones that never touch NumPy
+# (update-gold); the event-table / κ backends are imported where they are used.
+if TYPE_CHECKING:
+    from src.core.event_store import EventTable
+
+def load_json(fp: str, workers: Optional[int] = None) -> dict:
+    """JSON file, or a ``.shards`` directory parsed by ``workers`` processes (see ``shards.py``)."""
+    if is_sharded(fp):
+        return read_shards(fp, workers=workers)
     return json.loads(Path(fp).read_text(encoding="utf-8"))
 
-def save_json(data: dict, fp: str):
+def save_json(data: dict, fp: str, shards: Optional[int] = None):
+    """Pretty-printed JSON, or ``shards`` NDJSON shards when ``fp`` ends in ``.shards``."""
+    if Path(fp).suffix == SHARD_SUFFIX:
+        write_shards(data, fp, n_shards=shards)
+        return
     Path(fp).parent.mkdir(parents=True, exist_ok=True)
     with open(fp, "w", encoding="utf-8") as f:
         json.dump(data, f, indent=2, ensure_ascii=False)
 
-def extract_trigger_labels(data: Dict) -> Dict[str, Set[Tuple[str, str]]]:
+def load_config(fp: str) -> dict:
+    """Pipeline config from YAML (``.yaml`` / ``.yml``) or JSON."""
+    if Path(fp).suffix in (".yaml", ".yml"):
+        import yaml
+        return yaml.safe_load(Path(fp).read_text(encoding="utf-8")) or {}
+    return load_json(fp)
+
+def extract_trigger_labels(data: Union[Dict, str, Path, EventTable]) -> Dict[str, Set[Tuple[str, str]]]:
+    """Return ``{pid: {(lower-cased trigger text, event_type)}}``.
+
+    ``data`` may be the loaded JSON, an ``EventTable``, or a file path; paths go
+    through the parsed-event cache (``cache.load_events``) instead of ``json.load``.
+    """
+    from src.core.cache import load_events
+    from src.core.event_store import EventTable
+
+    if isinstance(data, (str, Path)):
+        data = load_events(data)
+    if isinstance(data, EventTable):
+        return _trigger_labels_from_table(data)
     return {
         pid: {(e["trigger"]["text"].lower(), e["event_type"]) for e in para.get("event_mentions", [])}
         for pid, para in data.items()
     }
 
+def _trigger_labels_from_table(table: EventTable) -> Dict[str, Set[Tuple[str, str]]]:
+    lowered = [s.lower() for s in table.vocabs["trigger"].strings]
+    types = table.vocabs["type"].strings
+    triggers = [lowered[c] for c in table.columns["trigger"].tolist()]
+    event_types = [types[c] for c in table.columns["type"].tolist()]
+    ptr = table.doc_ptr.tolist()
+    return {
+        pid: set(zip(triggers[ptr[d]:ptr[d + 1]], event_types[ptr[d]:ptr[d + 1]]))
+        for d, pid in enumerate(table.doc_ids())
+    }
+
 def safe_kappa(a_vec, b_vec) -> float:
     # Handle empty or uniform vectors
     if sum(a_vec) + sum(b_vec) == 0 or len(set(a_vec + b_vec)) < 2:
         return 1.0  # Perfect agreement assumed on no-label case
-    return cohen_kappa_score(a_vec, b_vec, labels=[0, 1])
-
-def compute_paragraph_kappa(agent_a: dict, agent_b: dict, threshold: float = 0.65):
-    a_labels = extract_trigger_labels(agent_a)
-    b_labels = extract_trigger_labels(agent_b)
+    from src.core.kappa import binary_kappa
 
-    low_kappa_pids = []
-    all_pids = list(set(a_labels) & set(b_labels))
+    # Binary κ from the 2×2 counts (same value as sklearn's cohen_kappa_score, labels=[0, 1])
+    pairs = list(zip(a_vec, b_vec))
+    return float(binary_kappa(pairs.count((1, 1)), pairs.count((1, 0)), pairs.count((0, 1)), pairs.count((0, 0))))
 
-    for pid in all_pids:
-        all_keys = list(a_labels[pid] | b_labels[pid])
-        a_vec = [1 if k in a_labels[pid] else 0 for k in all_keys]
-        b_vec = [1 if k in b_labels[pid] else 0 for k in all_keys]
-        kappa = safe_kappa(a_vec, b_vec)
-        if kappa < threshold:
-            low_kappa_pids.append(pid)
+def compute_paragraph_kappa(agent_a, agent_b, threshold: float = 0.65):
+    """Pids whose trigger κ between the agents is below ``threshold`` (batched, see ``kappa.py``)."""
+    from src.core.kappa import paragraph_kappas
 
-    return set(low_kappa_pids)
\ No newline at end of file
+    pids, kappas = paragraph_kappas(agent_a, agent_b)
+    return {pid for pid, kappa in zip(pids, kappas.tolist()) if kappa < threshold}
\ No newline at end of file
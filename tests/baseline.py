@@ -0,0 +1,148 @@
+#tests/baseline.py
+# -------------------------------------------------------------
+"""The original dict-based scorer and kappa, kept as a reference for the tests.
+
+Copied from ``src/core/metrics_v2.py`` and ``src/core/utils.py`` as they were
+before the columnar rewrite (progress bars and prints removed): Algorithm 1 is
+the O(P²) max / pop loop, attribute accuracies and combined F1 are plain
+Python loops, and kappa goes through sklearn's ``cohen_kappa_score``.
+"""
+from typing import Dict, List, Set, Tuple
+
+from sklearn.metrics import cohen_kappa_score
+
+ATTRIBUTES = ["type", "subtype", "modality", "polarity"]
+
+
+# ===================PRE-PROCESSING===================
+def extract_all_trigger_tokens(trigger: Dict) -> Set[str]:
+    tokens = set(trigger["text"].split())
+    for extra in trigger.get("extra_trigger_spans", []):
+        if isinstance(extra, str):
+            tokens.update(extra.split())
+        elif isinstance(extra, dict):
+            tokens.update(extract_all_trigger_tokens(extra))
+    return tokens
+
+def parse_events(json_data: Dict) -> List[Dict]:
+    events = []
+    for doc_id, doc in json_data.items():
+        for e in doc["event_mentions"]:
+            events.append({
+                "doc_id": doc_id,
+                "event_id": e["id"],
+                "tokens": extract_all_trigger_tokens(e["trigger"]),
+                "type": e["event_type"],
+                "subtype": e["event_subtype"],
+                "modality": e["factuality"]["modality"],
+                "polarity": e["factuality"]["polarity"],
+            })
+    return events
+
+
+# ===================METRICS===================
+def dice_coefficient(set1: Set[str], set2: Set[str]) -> float:
+    intersection = len(set1 & set2)
+    return 2 * intersection / (len(set1) + len(set2)) if (set1 or set2) else 0.0
+
+def mention_mapping(gold: List[Dict], system: List[Dict], threshold) -> Dict[int, List[Tuple[int, float]]]:
+    system_index: Dict[Tuple[str, str], List[int]] = {}
+    for sid, s in enumerate(system):
+        system_index.setdefault((s["doc_id"], s["event_id"]), []).append(sid)
+
+    score_list = []
+    for gid, g in enumerate(gold):
+        for sid in system_index.get((g["doc_id"], g["event_id"]), []):
+            score = dice_coefficient(g["tokens"], system[sid]["tokens"])
+            if score > 0:
+                score_list.append((gid, sid, score))
+
+    mapping: Dict[int, List[Tuple[int, float]]] = {}
+    used_sys = set()
+    while score_list:
+        best_idx = max(range(len(score_list)), key=lambda i: score_list[i][2])
+        gm, sn, best_score = score_list[best_idx]
+        if sn not in used_sys and best_score >= threshold:
+            mapping.setdefault(gm, []).append((sn, best_score))
+            used_sys.add(sn)
+        score_list.pop(best_idx)
+    return mapping
+
+def compute_span_f1(gold, system, mapping):
+    TP = sum(max(score for _, score in mapping[gid]) for gid in range(len(gold)) if mapping.get(gid))
+    precision = TP / len(system) if system else 0.0
+    recall = TP / len(gold) if gold else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if (precision + recall) > 0 else 0.0
+    return round(precision * 100, 1), round(recall * 100, 1), round(f1 * 100, 1)
+
+def _accuracy(gold, system, mapping, matches) -> float:
+    if not mapping:
+        return 0.0
+    total = 0.0
+    for gid, mapped in mapping.items():
+        for sid, _ in mapped:
+            if matches(gold[gid], system[sid]):
+                total += 1.0 / len(mapped)
+    return round(total / len(mapping) * 100, 1)
+
+def compute_attribute_acc(gold, system, mapping, attr):
+    return _accuracy(gold, system, mapping, lambda g, s: g[attr] == s[attr])
+
+def compute_realis_acc(gold, system, mapping):
+    return _accuracy(gold, system, mapping,
+                     lambda g, s: g["modality"] == s["modality"] and g["polarity"] == s["polarity"])
+
+def compute_combined_f1(gold, system, mapping, attributes: List[str]) -> Tuple[float, float, float]:
+    total_tp = 0.0
+    for gid, mapped in mapping.items():
+        for sid, score in mapped:
+            if all(gold[gid][attr] == system[sid][attr] for attr in attributes):
+                total_tp += score / len(mapped)
+    precision = total_tp / len(system) if system else 0.0
+    recall = total_tp / len(gold) if gold else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if (precision + recall) > 0 else 0.0
+    return round(precision * 100, 1), round(recall * 100, 1), round(f1 * 100, 1)
+
+def evaluate(gold_json: Dict, sys_json: Dict, threshold: float = 0.0) -> Dict[str, float]:
+    gold = parse_events(gold_json)
+    system = parse_events(sys_json)
+    mapping = mention_mapping(gold, system, threshold=threshold)
+    span_p, span_r, span_f1 = compute_span_f1(gold, system, mapping)
+    comb_p, comb_r, comb_f1 = compute_combined_f1(gold, system, mapping, ATTRIBUTES)
+    return {
+        "Span_Precision": span_p,
+        "Span_Recall": span_r,
+        "Span_F1": span_f1,
+        "Type_Accuracy": compute_attribute_acc(gold, system, mapping, "type"),
+        "Subtype_Accuracy": compute_attribute_acc(gold, system, mapping, "subtype"),
+        "Modality_Accuracy": compute_attribute_acc(gold, system, mapping, "modality"),
+        "Polarity_Accuracy": compute_attribute_acc(gold, system, mapping, "polarity"),
+        "Realis_Accuracy": compute_realis_acc(gold, system, mapping),
+        "Combined_Precision": comb_p,
+        "Combined_Recall": comb_r,
+        "Combined_F1": comb_f1,
+    }
+
+
+# ===================KAPPA===================
+def extract_trigger_labels(data: Dict) -> Dict[str, Set[Tuple[str, str]]]:
+    return {
+        pid: {(e["trigger"]["text"].lower(), e["event_type"]) for e in para.get("event_mentions", [])}
+        for pid, para in data.items()
+    }
+
+def safe_kappa(a_vec, b_vec) -> float:
+    if sum(a_vec) + sum(b_vec) == 0 or len(set(a_vec + b_vec)) < 2:
+        return 1.0
+    return cohen_kappa_score(a_vec, b_vec, labels=[0, 1])
+
+def paragraph_kappa(agent_a: Dict, agent_b: Dict) -> Dict[str, float]:
+    a_labels = extract_trigger_labels(agent_a)
+    b_labels = extract_trigger_labels(agent_b)
+    result = {}
+    for pid in set(a_labels) & set(b_labels):
+        all_keys = list(a_labels[pid] | b_labels[pid])
+        a_vec = [1 if k in a_labels[pid] else 0 for k in all_keys]
+        b_vec = [1 if k in b_labels[pid] else 0 for k in all_keys]
+        result[pid] = safe_kappa(a_vec, b_vec)
+    return result
@@ -0,0 +1,25 @@
+#tests/conftest.py
+# -------------------------------------------------------------
+"""Shared paths to the data bundled with the repository."""
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+DATA = ROOT / "data"
+
+# (gold, system) pairs scored by the tests, smallest first
+PAIRS = [
+    (ROOT / "src/core/test_gold.json", ROOT / "src/core/test_system.json"),
+    (DATA / "final/tokenized_data_500_accepted.json", DATA / "processed/agentA/tokenized_data_500.json"),
+    (DATA / "final/tokenized_data_500_accepted.json", DATA / "processed/agentB/tokenized_data_500.json"),
+    (DATA / "processed/agentA/tokenized_data_500.json", DATA / "processed/agentB/tokenized_data_500.json"),
+    (DATA / "processed/agentA/tokenized_data_1000.json", DATA / "processed/agentB/tokenized_data_1000.json"),
+]
+BATCHES = ["tokenized_data_500", "tokenized_data_1000"]
+GOLD = DATA / "gold/master.json"
+
+
+@pytest.fixture(params=PAIRS, ids=lambda pair: f"{pair[0].stem}-vs-{pair[1].parent.name}-{pair[1].stem}")
+def pair(request):
+    return request.param
@@ -0,0 +1,93 @@
+#tests/test_agreement.py
+# -------------------------------------------------------------
+"""Batch κ and the QA gates built on it."""
+import numpy as np
+import pytest
+from sklearn.metrics import cohen_kappa_score
+
+from src.core.agreement import UNITS, agreement_kappas, cohen_kappa, fleiss_kappa, label_matrix
+from src.core.event_store import build_table
+from src.core.metrics import compute_agreement, qa_failures
+from src.core.utils import load_json
+from tests.conftest import BATCHES, DATA
+
+GATES = {"metrics": {"trigger_kappa_min": 0.75, "arg_kappa_min": 0.65}}
+
+
+@pytest.mark.parametrize("metrics, expected", [
+    ({"trigger_kappa": 0.9, "arg_kappa": 0.7}, []),
+    ({"trigger_kappa": 0.5, "arg_kappa": 0.7}, ["trigger_kappa 0.500 < 0.75"]),
+    ({"trigger_kappa": None, "arg_kappa": float("nan")},
+     ["trigger_kappa unavailable (need ≥2 annotators)", "arg_kappa unavailable (need ≥2 annotators)"]),
+])
+def test_kappa_gates(metrics, expected):
+    assert qa_failures(metrics, GATES) == expected
+
+
+def test_unconfigured_gates_are_skipped():
+    assert qa_failures({"trigger_kappa": None, "arg_kappa": None}, {"metrics": {}}) == []
+
+
+def test_missing_annotators_fail_the_gate(tmp_path):
+    config = {**GATES, "paths": {"annotator_roots": [str(tmp_path / "a"), str(tmp_path / "b")], "cache_root": None}}
+    metrics = compute_agreement({}, "no-such-batch", config=config, gold={})
+    assert metrics["trigger_kappa"] is None
+    assert qa_failures(metrics, config) == ["trigger_kappa unavailable (need ≥2 annotators)",
+                                            "arg_kappa unavailable (need ≥2 annotators)"]
+
+
+# ----- κ on label matrices -----
+@pytest.mark.parametrize("batch", BATCHES)
+@pytest.mark.parametrize("unit", UNITS)
+def test_cohen_kappa_matches_sklearn(batch, unit):
+    tables = [build_table(load_json(DATA / f"processed/{agent}/{batch}.json")) for agent in ("agentA", "agentB")]
+    matrix, n_categories = label_matrix(tables, unit)
+    assert matrix.shape[1] == 2 and len(matrix)
+    expected = cohen_kappa_score(matrix[:, 0], matrix[:, 1], labels=list(range(n_categories)))
+    assert cohen_kappa(matrix, n_categories) == pytest.approx(expected, abs=1e-12)
+
+
+@pytest.mark.parametrize("batch", BATCHES)
+def test_trigger_items_are_the_union_over_shared_paragraphs(batch):
+    agents = [load_json(DATA / f"processed/{agent}/{batch}.json") for agent in ("agentA", "agentB")]
+    matrix, _ = label_matrix([build_table(a) for a in agents], "trigger")
+    shared = agents[0].keys() & agents[1].keys()
+    items = {(pid, m["trigger"]["text"].lower()) for a in agents for pid in shared for m in a[pid]["event_mentions"]}
+    assert len(matrix) == len(items)
+
+
+# Fleiss (1971) via Wikipedia's worked example: 10 items, 14 raters, 5 categories, κ ≈ 0.210
+FLEISS_COUNTS = [
+    [0, 0, 0, 0, 14], [0, 2, 6, 4, 2], [0, 0, 3, 5, 6], [0, 3, 9, 2, 0], [2, 2, 8, 1, 1],
+    [7, 7, 0, 0, 0], [3, 2, 6, 3, 0], [2, 5, 3, 2, 2], [6, 5, 2, 1, 0], [0, 2, 2, 3, 7],
+]
+
+
+def test_fleiss_kappa_textbook_example():
+    matrix = np.array([np.repeat(np.arange(5), counts) for counts in FLEISS_COUNTS])
+    assert matrix.shape == (10, 14)
+    assert fleiss_kappa(matrix, 5) == pytest.approx(0.20993, abs=1e-5)
+
+
+def test_degenerate_matrices():
+    assert fleiss_kappa(np.ones((4, 3), dtype=np.int64), 2) == 1.0  # everyone agrees on one category
+    assert np.isnan(fleiss_kappa(np.zeros((0, 3), dtype=np.int64), 2))
+    assert np.isnan(cohen_kappa(np.zeros((0, 2), dtype=np.int64), 2))
+
+
+def _paragraph(*args):
+    return {"event_mentions": [{
+        "id": "e1", "trigger": {"text": "Tăng"}, "event_type": "A", "event_subtype": "s",
+        "factuality": {"modality": "ASSERTED", "polarity": "POSITIVE"}, "arguments": list(args),
+    }]}
+
+
+def test_arguments_without_text_or_role():
+    a = build_table({"p1": _paragraph({"role": "Item"}, {"text": "Giá vàng", "role": "Item"})})
+    b = build_table({"p1": _paragraph({"role": "Item"}, {"text": "giá vàng"})})
+    matrix, n_categories = label_matrix([a, b], "argument")
+    # The text-less arguments are one item with the same role; "giá vàng" is one item, role-less for b
+    assert len(matrix) == 2 and n_categories == 3
+    assert sorted(map(tuple, matrix.tolist())) == [(1, 1), (1, 2)]  # 1 = "Item", 2 = no role
+    kappas = agreement_kappas([a, b])
+    assert kappas["n_argument_items"] == 2 and kappas["trigger_kappa"] == 1.0
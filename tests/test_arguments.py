@@ -0,0 +1,66 @@
+#tests/test_arguments.py
+# -------------------------------------------------------------
+"""Argument alignment: enumerated assignments against scipy, and role-less arguments."""
+from itertools import permutations
+
+import numpy as np
+import pytest
+from scipy.optimize import linear_sum_assignment
+
+from src.core import arguments
+from src.core.arguments import NO_ROLE, _solve_group, align_arguments
+from src.core.metrics_v2 import evaluate_tables, mention_mapping, parse_events, print_results
+from src.core.utils import load_json
+from tests.conftest import PAIRS
+
+
+def _optimum(scores):
+    rows, cols = linear_sum_assignment(scores, maximize=True)
+    return scores[rows, cols].sum()
+
+
+@pytest.mark.parametrize("m, n", [(1, 1), (1, 4), (2, 3), (3, 3), (4, 5), (5, 5)])
+def test_enumeration_matches_scipy(m, n):
+    rng = np.random.default_rng(m * 10 + n)
+    # Dice-like scores with plenty of ties and zeros
+    scores = rng.integers(0, 4, size=(200, m, n)) / 3
+    cols = _solve_group(scores)
+    chosen = scores[np.arange(len(scores))[:, None], np.arange(m), cols].sum(axis=1)
+    assert (np.sort(cols, axis=1)[:, 1:] != np.sort(cols, axis=1)[:, :-1]).all()  # injective
+    assert chosen == pytest.approx([_optimum(s) for s in scores], abs=1e-12)
+
+
+def test_large_shapes_fall_back_to_scipy():
+    scores = np.random.default_rng(0).random((3, 6, 6))
+    cols = _solve_group(scores)  # 6! assignments > MAX_ENUMERATION
+    for s, c in zip(scores, cols):
+        best = max(s[np.arange(6), list(p)].sum() for p in permutations(range(6)))
+        assert s[np.arange(6), c].sum() == pytest.approx(best, abs=1e-12)
+
+
+def test_alignment_total_matches_scipy_on_data(monkeypatch):
+    gold_path, sys_path = PAIRS[-1]
+    gold = parse_events(load_json(gold_path))
+    system = parse_events(load_json(sys_path), vocabs=gold.vocabs)
+    mapping = mention_mapping(gold, system, 0.0)
+    _, _, dice = align_arguments(gold, system, mapping)
+    monkeypatch.setattr(arguments, "MAX_ENUMERATION", 0)  # every event through linear_sum_assignment
+    _, _, scipy_dice = align_arguments(gold, system, mapping)
+    assert len(dice) and dice.sum() == pytest.approx(scipy_dice.sum(), abs=1e-9)
+
+
+def _paragraph(*args):
+    return {"event_mentions": [{
+        "id": "e1", "trigger": {"text": "tăng"}, "event_type": "A", "event_subtype": "s",
+        "factuality": {"modality": "ASSERTED", "polarity": "POSITIVE"}, "arguments": list(args),
+    }]}
+
+
+def test_arguments_without_role_are_labelled(capsys):
+    gold = parse_events({"p1": _paragraph({"text": "giá vàng", "role": "Item"}, {"text": "hôm nay"})})
+    system = parse_events({"p1": _paragraph({"text": "giá vàng"}, {"text": "hôm nay"})}, vocabs=gold.vocabs)
+    results = evaluate_tables(gold, system, arguments=True)
+    assert results["Arg_Identification_F1"] == 100.0 and results["Arg_Classification_F1"] == 50.0
+    assert results["Arg_Per_Role"][NO_ROLE]["support"] == 1 and set(results["Arg_Per_Role"]) == {"Item", NO_ROLE}
+    print_results(results)
+    assert NO_ROLE in capsys.readouterr().out
@@ -0,0 +1,82 @@
+#tests/test_cli.py
+# -------------------------------------------------------------
+"""``python -m src`` commands and the root-script wrappers."""
+import json
+import subprocess
+import sys
+
+import pytest
+
+from src.core.cli import build_parser, main
+from src.core.metrics_v2 import evaluate
+from src.core.utils import load_json
+from tests.conftest import GOLD, PAIRS, ROOT
+
+WRAPPERS = {
+    "prepare_QC_samples.py": "qc-sample",
+    "update_gold_from_human.py": "update-gold",
+    "evaluate_batch.py": "evaluate",
+    "run_batches.py": "run-batches",
+    "evaluate_systems.py": "evaluate-systems",
+    "compare_systems.py": "compare-systems",
+}
+
+
+@pytest.mark.parametrize("script, command", WRAPPERS.items())
+def test_wrappers_forward_to_the_cli(script, command):
+    # Importing a wrapper configures nothing; running it parses the command's own flags
+    code = f"import logging, {script[:-3]}; print(len(logging.getLogger().handlers))"
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True, capture_output=True, text=True).stdout
+    assert out.strip() == "0"
+    wrapper = subprocess.run([sys.executable, script, "--help"], cwd=ROOT, check=True, capture_output=True, text=True)
+    cli = subprocess.run([sys.executable, "-m", "src", command, "--help"], cwd=ROOT, check=True,
+                         capture_output=True, text=True)
+    assert wrapper.stdout == cli.stdout
+
+
+def test_every_command_parses():
+    parser = build_parser()
+    for argv in (["run-batches", "--batches", "x"], ["evaluate-systems", "--systems", "a", "b"],
+                 ["compare-systems", "--systems", "a", "b"], ["incremental", "--system", "a", "--store", "s"],
+                 ["shards", "split", "a.json"], ["shards", "join", "a.shards"],
+                 ["columnar", "export", "--systems", "a", "--out", "o"], ["columnar", "score", "o"], ["serve"]):
+        assert callable(parser.parse_args(argv).run)
+
+
+def test_shards_commands_round_trip(tmp_path, capsys):
+    main(["shards", "split", str(GOLD), str(tmp_path / "master.shards"), "--shards", "3", "--workers", "1"])
+    main(["shards", "join", str(tmp_path / "master.shards"), str(tmp_path / "master.json")])
+    assert (tmp_path / "master.json").read_bytes() == GOLD.read_bytes()
+    assert "50 paragraphs" in capsys.readouterr().out
+
+
+def test_columnar_commands(tmp_path, capsys, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # the event cache goes under the working directory
+    gold, system = PAIRS[1]
+    main(["columnar", "export", "--gold", str(gold), "--systems", str(system), "--config",
+          str(ROOT / "config/pipeline.yaml"), "--out", str(tmp_path / "batch.cols")])
+    capsys.readouterr()
+    main(["columnar", "score", str(tmp_path / "batch.cols"), "--workers", "1"])
+    (_, scores), = json.loads(capsys.readouterr().out).items()
+    expected = evaluate(str(gold), str(system), cache_dir=None)
+    assert scores == {name: expected[name] for name in scores}
+
+
+def test_run_batches_command(tmp_path, monkeypatch):
+    monkeypatch.chdir(ROOT)
+    main(["run-batches", "--batches", "tokenized_data_500", "--workers", "1", "--out", str(tmp_path / "report.json")])
+    report = load_json(tmp_path / "report.json")
+    assert list(report["batches"]) == ["tokenized_data_500"] and "error" not in report["batches"]["tokenized_data_500"]
+
+
+@pytest.mark.parametrize("command", [["evaluate-systems", "--workers", "1"], ["compare-systems", "--resamples", "10"],
+                                     ["columnar", "export"]])
+def test_commands_use_the_configured_cache(tmp_path, monkeypatch, command):
+    monkeypatch.chdir(tmp_path)
+    config = tmp_path / "pipeline.json"
+    config.write_text(json.dumps({"paths": {"cache_root": str(tmp_path / "configured")}}), encoding="utf-8")
+    gold, system_a = PAIRS[1]
+    system_b = PAIRS[2][1]
+    main([*command, "--gold", str(gold), "--systems", str(system_a), str(system_b), "--config", str(config),
+          "--out", str(tmp_path / "out")])
+    assert any((tmp_path / "configured").iterdir()) and not (tmp_path / ".cache").exists()
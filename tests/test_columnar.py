@@ -0,0 +1,54 @@
+#tests/test_columnar.py
+# -------------------------------------------------------------
+"""Scores from a mapped columnar file against ``evaluate_tables``."""
+import numpy as np
+import pytest
+
+from src.core.columnar import GOLD, doc_slice, export_columnar, open_columnar, score_mapped
+from src.core.metrics_v2 import evaluate_tables, parse_events
+from src.core.utils import load_json
+from tests.conftest import PAIRS
+
+
+@pytest.fixture(scope="module")
+def exported(tmp_path_factory):
+    """The 500-paragraph gold with agentA and agentB as systems, exported once."""
+    gold_path = PAIRS[1][0]
+    gold = parse_events(load_json(gold_path))
+    systems = {sys_path.parent.name: parse_events(load_json(sys_path), vocabs=gold.vocabs)
+               for _, sys_path in PAIRS[1:3]}  # both scored against gold_path
+    path = export_columnar({GOLD: gold, **systems}, tmp_path_factory.mktemp("columnar") / "batch.cols")
+    return gold, systems, path
+
+
+@pytest.mark.parametrize("matching", ["id", "overlap"])
+@pytest.mark.parametrize("workers", [1, 3])
+def test_score_mapped_matches_evaluate_tables(exported, matching, workers):
+    gold, systems, path = exported
+    scores = score_mapped(path, workers=workers, matching=matching)
+    assert list(scores) == list(systems)
+    for name, system in systems.items():
+        expected = evaluate_tables(gold, system, matching=matching)
+        assert scores[name] == {metric: expected[metric] for metric in scores[name]}
+
+
+def test_open_columnar_round_trips_the_columns(exported):
+    gold, systems, path = exported
+    tables = open_columnar(path)
+    assert list(tables) == [GOLD, *systems]
+    for name, table in ((GOLD, gold), *systems.items()):
+        mapped = tables[name]
+        assert len(mapped) == len(table) and sorted(mapped.doc_codes.tolist()) == sorted(table.doc_codes.tolist())
+        assert np.array_equal(np.sort(mapped.columns["type"]), np.sort(table.columns["type"]))
+
+
+def test_doc_slice_of_an_empty_range(exported):
+    _, _, path = exported
+    table = open_columnar(path)[GOLD]
+    lo = int(table.doc_codes[len(table.doc_codes) // 2])
+    for start, stop in ((lo, lo), (int(table.doc_codes.max()) + 1, int(table.doc_codes.max()) + 5)):
+        empty = doc_slice(table, start, stop)
+        assert len(empty) == 0 and len(empty.doc_codes) == 0
+        assert empty.doc_ptr.tolist() == [0] and empty.token_ptr.tolist() == [0] and len(empty.token_ids) == 0
+    whole = doc_slice(table, 0, int(table.doc_codes.max()) + 1)
+    assert len(whole) == len(table) and np.array_equal(whole.token_ids, table.token_ids)
@@ -0,0 +1,110 @@
+#tests/test_coreference.py
+# -------------------------------------------------------------
+"""Coreference measures on hand-computed clusterings, and the union-find clusters."""
+import numpy as np
+import pytest
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+
+from src.core.coreference import cluster_labels, coreference_scores
+from src.core.metrics_v2 import mention_mapping, parse_events
+from src.core.utils import load_json
+from tests.conftest import GOLD
+
+IDS = ["a", "b", "c", "d", "e"]
+
+
+def _paragraph(clusters):
+    """One paragraph with a mention per id in ``IDS``, linked to the other mentions of its cluster."""
+    cluster_of = {event_id: cluster for cluster in clusters for event_id in cluster}
+    return {"event_mentions": [
+        {"id": event_id, "trigger": {"text": f"t_{event_id}"}, "event_type": "A", "event_subtype": "s",
+         "factuality": {"modality": "ASSERTED", "polarity": "POSITIVE"},
+         "coreferent_event_triggers": [other for other in cluster_of[event_id] if other != event_id]}
+        for event_id in IDS
+    ]}
+
+
+def _scores(gold_clusters, system_clusters):
+    gold = parse_events({"p1": _paragraph(gold_clusters)})
+    system = parse_events({"p1": _paragraph(system_clusters)}, vocabs=gold.vocabs)
+    results = coreference_scores(gold, system, mention_mapping(gold, system, 0.0))
+    return {measure: tuple(results[f"Coref_{measure}_{part}"] for part in ("Precision", "Recall", "F1"))
+            for measure in ("MUC", "B3", "CEAFe", "BLANC")}, results["Coref_CoNLL_F1"]
+
+
+SINGLETONS = [[event_id] for event_id in IDS]
+SPLIT_GOLD = [["a", "b", "c", "d"], ["e"]]
+SPLIT_SYSTEM = [["a", "b"], ["c", "d"], ["e"]]
+# Worked out by hand for SPLIT_GOLD vs SPLIT_SYSTEM:
+#   MUC    R = (4 - 2) / 3,  P = 2 / 2
+#   B3     R = (4 * 2/4 + 1) / 5,  P = 1
+#   CEAFe  φ4(abcd, ab) = 2/3 + φ4(e, e) = 1  →  5/3 over 3 system / 2 gold clusters
+#   BLANC  coref: P = 2/2, R = 2/6;  non-coref: P = 4/8, R = 4/4
+SPLIT = {"MUC": (100.0, 66.7, 80.0), "B3": (100.0, 60.0, 75.0), "CEAFe": (55.6, 83.3, 66.7),
+         "BLANC": (75.0, 66.7, 58.3)}
+
+
+def test_identical_clusters():
+    scores, conll = _scores(SPLIT_GOLD, SPLIT_GOLD)
+    assert all(value == (100.0, 100.0, 100.0) for value in scores.values()) and conll == 100.0
+
+
+def test_all_singletons():
+    scores, conll = _scores(SINGLETONS, SINGLETONS)
+    assert scores["MUC"] == (0.0, 0.0, 0.0)  # no links to recover
+    assert scores["B3"] == scores["CEAFe"] == scores["BLANC"] == (100.0, 100.0, 100.0)
+    assert conll == 66.7
+
+
+def test_split():
+    scores, conll = _scores(SPLIT_GOLD, SPLIT_SYSTEM)
+    assert scores == SPLIT and conll == 73.9
+
+
+def test_merge_swaps_precision_and_recall():
+    scores, conll = _scores(SPLIT_SYSTEM, SPLIT_GOLD)
+    assert scores == {measure: (r, p, f1) for measure, (p, r, f1) in SPLIT.items()} and conll == 73.9
+
+
+def test_cluster_labels_match_connected_components():
+    rng = np.random.default_rng(0)
+    n = 500
+    links = rng.integers(0, n, size=(300, 2))
+    labels = cluster_labels(n, links)
+    _, expected = connected_components(coo_matrix((np.ones(len(links)), links.T), shape=(n, n)), directed=False)
+    # Same partition, each component labelled by its smallest row
+    assert len(np.unique(labels)) == len(np.unique(expected))
+    assert (labels[labels] == labels).all() and (labels <= np.arange(n)).all()
+    assert len(np.unique(labels * n + expected)) == len(np.unique(labels))
+
+
+def test_cluster_labels_follow_coreferent_event_triggers():
+    data = load_json(GOLD)
+    table = parse_events(data)
+    labels = cluster_labels(len(table), table.coref_links)
+    start, n_linked = 0, 0
+    for doc in data.values():
+        mentions = doc["event_mentions"]
+        rows = {}
+        for offset, mention in enumerate(mentions):
+            rows.setdefault(mention["id"], start + offset)
+        # Undirected id links, then components by depth-first search from the smallest row
+        neighbours = {start + offset: set() for offset in range(len(mentions))}
+        for offset, mention in enumerate(mentions):
+            for other in mention.get("coreferent_event_triggers") or ():
+                if other in rows:
+                    neighbours[start + offset].add(rows[other])
+                    neighbours[rows[other]].add(start + offset)
+        expected = {}
+        for root in sorted(neighbours):
+            stack = [root]
+            while stack:
+                row = stack.pop()
+                if row not in expected:
+                    expected[row] = root
+                    stack.extend(neighbours[row])
+        assert labels[start:start + len(mentions)].tolist() == [expected[row] for row in sorted(neighbours)]
+        n_linked += sum(expected[row] != row for row in expected)
+        start += len(mentions)
+    assert start == len(table) and n_linked  # master.json does have coreference links
@@ -0,0 +1,49 @@
+#tests/test_error_analysis.py
+# -------------------------------------------------------------
+"""Per-type precision / recall of the error report."""
+from src.core.error_analysis import error_report
+from src.core.metrics_v2 import evaluate, mention_mapping, parse_events
+from src.core.utils import load_json
+from tests.conftest import PAIRS
+
+
+def _paragraph(*mentions):
+    return {"event_mentions": [
+        {"id": event_id, "trigger": {"text": text}, "event_type": event_type, "event_subtype": "s",
+         "factuality": {"modality": "ASSERTED", "polarity": "POSITIVE"}}
+        for event_id, text, event_type in mentions
+    ]}
+
+
+def _report(gold_json, sys_json):
+    gold = parse_events(gold_json)
+    system = parse_events(sys_json, vocabs=gold.vocabs)
+    return error_report(gold, system, mention_mapping(gold, system, 0.0))
+
+
+def test_split_gold_mention_keeps_full_precision():
+    # One gold Deal mention mapped to two system Deal mentions: every system mention is right
+    gold = {"p1": _paragraph(("e1", "mua lại", "Deal"))}
+    system = {"p1": _paragraph(("e1", "mua lại", "Deal"), ("e1", "mua", "Deal"))}
+    deal = _report(gold, system)["per_type"]["Deal"]
+    assert (deal["precision"], deal["recall"], deal["f1"]) == (100.0, 100.0, 100.0)
+
+
+def test_wrong_twin_and_spurious_mentions():
+    gold = {"p1": _paragraph(("e1", "mua lại", "Deal"), ("e2", "lãi", "FinancialReport"))}
+    system = {"p1": _paragraph(("e1", "mua lại", "Deal"), ("e1", "mua", "Financing"),
+                               ("e2", "lãi", "Deal"), ("e3", "vay", "Financing"))}
+    per_type = _report(gold, system)["per_type"]
+    # Deal: 2 system mentions, 1 with a Deal twin; recall 0.5 (1/|MG| of the one gold Deal)
+    assert (per_type["Deal"]["precision"], per_type["Deal"]["recall"]) == (50.0, 50.0)
+    assert (per_type["Financing"]["precision"], per_type["Financing"]["recall"]) == (0.0, 0.0)
+    assert (per_type["FinancialReport"]["precision"], per_type["FinancialReport"]["recall"]) == (0.0, 0.0)
+
+
+def test_report_counts_on_bundled_data():
+    gold_path, sys_path = PAIRS[2]
+    report = evaluate(str(gold_path), str(sys_path), errors=True, cache_dir=None)["Errors"]
+    n_system = len(parse_events(load_json(sys_path)))
+    assert sum(row["n_system"] for row in report["per_type"].values()) == n_system == report["n_system"]
+    for row in report["per_type"].values():
+        assert 0.0 <= row["precision"] <= 100.0 and 0.0 <= row["recall"] <= 100.0
@@ -0,0 +1,99 @@
+#tests/test_gold_store.py
+# -------------------------------------------------------------
+"""GoldStore round-trips, crash recovery and the update-gold guard."""
+import json
+import os
+import stat
+
+import pytest
+
+from src.core.gold_store import LOG_NAME, GoldStore, atomic_write
+from src.core.gold_update import GoldFileChanged, update_gold
+from src.core.utils import load_json, save_json
+from tests.conftest import GOLD, PAIRS
+
+
+def _saved_bytes(data, path):
+    save_json(data, str(path))
+    return path.read_bytes()
+
+
+@pytest.mark.parametrize("source", [GOLD, PAIRS[0][0]], ids=lambda p: p.stem)
+def test_export_is_save_json_bytes(source, tmp_path):
+    data = load_json(source)
+    store = GoldStore.from_json(source, tmp_path / "store")
+    assert dict(store.items()) == data and store.pids() == list(data)
+    store.export_json(tmp_path / "master.json")
+    assert (tmp_path / "master.json").read_bytes() == _saved_bytes(data, tmp_path / "expected.json")
+    assert store.export_matches(tmp_path / "master.json") is True
+
+
+def test_upsert_delete_compact(tmp_path):
+    data = load_json(GOLD)
+    pids = list(data)
+    store = GoldStore.from_json(GOLD, tmp_path / "store")
+    store.upsert({pids[0]: {"event_mentions": []}, "new": {"event_mentions": []}})
+    assert store.delete([pids[1], "missing"]) == 1
+    expected = dict(data)
+    expected[pids[0]] = {"event_mentions": []}
+    del expected[pids[1]]
+    expected["new"] = {"event_mentions": []}
+
+    for reopened in (store, GoldStore(tmp_path / "store")):  # replayed past the checkpoint on open
+        assert list(reopened.items()) == list(expected.items())
+    store.compact()
+    assert list(GoldStore(tmp_path / "store").items()) == list(expected.items())
+    assert store.log_path.stat().st_size == sum(length for _, length in store.offsets.values())
+
+
+def test_torn_tail_is_skipped_then_truncated(tmp_path):
+    store = GoldStore.from_json(PAIRS[0][0], tmp_path / "store")
+    log = tmp_path / "store" / LOG_NAME
+    size = log.stat().st_size
+    with open(log, "ab") as f:
+        f.write(b'{"pid": "torn", "doc": {')
+    reader = GoldStore(tmp_path / "store")
+    assert "torn" not in reader and log.stat().st_size > size  # readers never truncate
+    reader.upsert({"after": {"event_mentions": []}})
+    assert list(GoldStore(tmp_path / "store").items())[-1] == ("after", {"event_mentions": []})
+    assert "torn" not in GoldStore(tmp_path / "store")
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX file modes")
+def test_atomic_write_keeps_mode(tmp_path):
+    target = tmp_path / "file.json"
+    atomic_write(target, lambda f: f.write(b"{}"))
+    umask = os.umask(0)
+    os.umask(umask)
+    assert stat.S_IMODE(target.stat().st_mode) == 0o666 & ~umask
+    target.chmod(0o640)
+    atomic_write(target, lambda f: f.write(b"[]"))
+    assert stat.S_IMODE(target.stat().st_mode) == 0o640 and target.read_bytes() == b"[]"
+
+
+def _qc_round(tmp_path, gold):
+    pid = next(iter(gold))
+    qc = tmp_path / "qc.json"
+    qc.write_text(json.dumps({pid: {"event_mentions": []}}), encoding="utf-8")
+    return qc, pid
+
+
+def test_update_gold_refuses_hand_edits(tmp_path):
+    master = tmp_path / "gold" / "master.json"
+    gold = load_json(GOLD)
+    save_json(gold, str(master))
+    qc, pid = _qc_round(tmp_path, gold)
+
+    result = update_gold(qc, master)
+    assert result["seeded"] == len(gold) and load_json(master)[pid] == {"event_mentions": []}
+    update_gold(qc, master)  # our own export is not an edit
+
+    edited = load_json(master)
+    edited["by-hand"] = {"event_mentions": []}
+    save_json(edited, str(master))
+    with pytest.raises(GoldFileChanged):
+        update_gold(qc, master)
+    assert load_json(master) == edited
+
+    result = update_gold(qc, master, reseed_from_gold=True)
+    assert result["reseeded"] == 1 and "by-hand" in load_json(master)
@@ -0,0 +1,75 @@
+#tests/test_gold_versions.py
+# -------------------------------------------------------------
+"""Gold versions: deterministic ids, checkout, diff and missing objects."""
+import copy
+
+import pytest
+
+from src.core import gold_versions
+from src.core.gold_store import GoldStore
+from src.core.gold_versions import GoldVersions, content_hash
+from src.core.utils import load_json
+from tests.conftest import GOLD
+
+
+def _edit(data):
+    """A copy of ``data`` with the first event of the first paragraph retyped and the second paragraph dropped."""
+    edited = copy.deepcopy(data)
+    pids = list(edited)
+    first = next(pid for pid in pids if edited[pid].get("event_mentions"))
+    edited[first]["event_mentions"][0]["event_type"] = "Retyped"
+    del edited[next(pid for pid in pids if pid != first)]
+    return edited, first
+
+
+def _record(tmp_path, name, data, edited, message):
+    store = GoldStore.from_json(GOLD, tmp_path / name)
+    versions = GoldVersions(tmp_path / name)
+    first = versions.commit(store, message=message)
+    store.upsert(edited)
+    store.delete([pid for pid in data if pid not in edited])
+    return versions, first, versions.commit(store, message=message)
+
+
+def test_ids_ignore_time_and_message(tmp_path, monkeypatch):
+    data = load_json(GOLD)
+    edited, _ = _edit(data)
+    a = _record(tmp_path, "a", data, edited, "round 1")
+    monkeypatch.setattr(gold_versions.time, "strftime", lambda fmt: "2000-01-01T00:00:00")
+    b = _record(tmp_path, "b", data, edited, "another message")
+    assert a[1:] == b[1:] and a[1] != a[2]
+    assert a[0].history[-1]["created"] != b[0].history[-1]["created"]
+
+
+def test_checkout_and_diff(tmp_path):
+    data = load_json(GOLD)
+    edited, retyped = _edit(data)
+    versions, first, second = _record(tmp_path, "store", data, edited, "")
+    assert versions.load(first) == data and versions.load("1") == data
+    assert versions.load() == edited and versions.version_id() == second
+    assert list(versions.manifest()) == list(edited)
+
+    diff = versions.diff(first)
+    assert diff["from"] == first and diff["to"] == second
+    assert diff["paragraphs"]["removed"] == [pid for pid in data if pid not in edited]
+    assert diff["paragraphs"]["changed"] == 1 and diff["paragraphs"]["added"] == []
+    assert diff["attributes"] == {"event_type": 1}
+    assert list(diff["changed"]) == [retyped]
+
+
+def test_commit_without_changes_keeps_latest(tmp_path):
+    store = GoldStore.from_json(GOLD, tmp_path / "store")
+    versions = GoldVersions(tmp_path / "store")
+    first = versions.commit(store)
+    assert versions.commit(store) == first and len(versions) == 1
+
+
+def test_missing_object_raises(tmp_path):
+    data = load_json(GOLD)
+    store = GoldStore.from_json(GOLD, tmp_path / "store")
+    versions = GoldVersions(tmp_path / "store")
+    versions.commit(store)
+    pid = list(data)[len(data) // 2]
+    versions.objects.delete([content_hash(data[pid])])
+    with pytest.raises(ValueError, match="missing"):
+        versions.load()
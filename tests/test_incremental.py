@@ -0,0 +1,46 @@
+#tests/test_incremental.py
+# -------------------------------------------------------------
+"""Incremental re-evaluation gives the numbers of a full re-evaluation."""
+import copy
+
+import pytest
+
+from src.core.incremental import IncrementalEvaluator
+from src.core.metrics import per_type_precision
+from src.core.metrics_v2 import evaluate
+from src.core.utils import load_json, save_json
+from tests.conftest import PAIRS
+
+
+def _full(gold, system, tmp_path, threshold):
+    save_json(gold, str(tmp_path / "gold.json"))
+    save_json(system, str(tmp_path / "system.json"))
+    return evaluate(str(tmp_path / "gold.json"), str(tmp_path / "system.json"), threshold=threshold, cache_dir=None)
+
+
+def _check(evaluator, gold, system, tmp_path, threshold):
+    results = evaluator.evaluate(gold, system)
+    expected = _full(gold, system, tmp_path, threshold)
+    assert {name: results[name] for name in results if name != "Per_Type_Precision"} == \
+        {name: expected[name] for name in results if name != "Per_Type_Precision"}
+    assert results["Per_Type_Precision"] == pytest.approx(per_type_precision(system, gold))
+
+
+@pytest.mark.parametrize("threshold", [0.0, 0.5])
+def test_incremental_matches_full(threshold, tmp_path):
+    gold, system = load_json(PAIRS[1][0]), load_json(PAIRS[1][1])
+    evaluator = IncrementalEvaluator(tmp_path / "store", threshold=threshold)
+    _check(evaluator, gold, system, tmp_path, threshold)
+
+    pids = list(system)
+    system = copy.deepcopy(system)
+    system[pids[0]]["event_mentions"] = system[pids[0]]["event_mentions"][1:]   # changed paragraph
+    del system[pids[1]]                                                         # dropped from one side
+    gold = dict(gold)
+    gold.pop(pids[2], None)                                                     # dropped from gold
+    _check(evaluator, gold, system, tmp_path, threshold)
+
+    # A fresh evaluator on the same store picks the totals up from disk
+    reopened = IncrementalEvaluator(tmp_path / "store", threshold=threshold)
+    assert reopened.results() == evaluator.results()
+    _check(reopened, load_json(PAIRS[1][0]), load_json(PAIRS[1][1]), tmp_path, threshold)
@@ -0,0 +1,45 @@
+#tests/test_kappa.py
+# -------------------------------------------------------------
+"""Batched paragraph kappa against sklearn's ``cohen_kappa_score`` (``tests/baseline.py``)."""
+import pytest
+
+from src.core.kappa import paragraph_kappas
+from src.core.qc import compute_kappa_sorted
+from src.core.utils import compute_paragraph_kappa, load_json, safe_kappa
+from tests import baseline
+from tests.conftest import BATCHES, DATA
+
+
+def _agents(batch):
+    return (load_json(DATA / f"processed/agentA/{batch}.json"), load_json(DATA / f"processed/agentB/{batch}.json"))
+
+
+@pytest.mark.parametrize("batch", BATCHES)
+def test_paragraph_kappas_match_sklearn(batch):
+    agent_a, agent_b = _agents(batch)
+    expected = baseline.paragraph_kappa(agent_a, agent_b)
+    pids, kappas = paragraph_kappas(agent_a, agent_b)
+    assert sorted(pids) == sorted(expected)
+    assert dict(zip(pids, kappas.tolist())) == pytest.approx(expected, abs=1e-12)
+
+
+@pytest.mark.parametrize("batch", BATCHES)
+def test_kappa_sorted_and_threshold(batch):
+    agent_a, agent_b = _agents(batch)
+    expected = baseline.paragraph_kappa(agent_a, agent_b)
+    ranked = compute_kappa_sorted(agent_a, agent_b)
+    values = [kappa for _, kappa in ranked]
+    assert values == sorted(values)
+    assert dict(ranked) == pytest.approx(expected, abs=1e-12)
+    assert compute_paragraph_kappa(agent_a, agent_b, 0.65) == {pid for pid, kappa in expected.items() if kappa < 0.65}
+
+
+@pytest.mark.parametrize("a_vec, b_vec", [
+    ([1, 0, 1, 1], [1, 1, 0, 1]),
+    ([1, 1, 0], [0, 0, 1]),
+    ([0, 0], [0, 0]),
+    ([1, 1], [1, 1]),
+    ([1, 0, 0, 0, 1], [1, 0, 0, 0, 1]),
+])
+def test_safe_kappa_matches_sklearn(a_vec, b_vec):
+    assert safe_kappa(a_vec, b_vec) == pytest.approx(baseline.safe_kappa(a_vec, b_vec), abs=1e-12)
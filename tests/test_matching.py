@@ -0,0 +1,56 @@
+#tests/test_matching.py
+# -------------------------------------------------------------
+"""Overlap matching against a brute-force same-document Dice plus ``greedy_match``."""
+import pytest
+
+from src.core.matching import GoldIndex, greedy_match, overlap_candidates
+from src.core.metrics_v2 import mention_mapping, parse_events
+from src.core.utils import load_json
+from tests import baseline
+
+
+def _brute_force(gold_json, sys_json):
+    """Every same-document pair with a positive token-set Dice, gold-major then by system row."""
+    gold, system = baseline.parse_events(gold_json), baseline.parse_events(sys_json)
+    rows_of_doc = {}
+    for sid, s in enumerate(system):
+        rows_of_doc.setdefault(s["doc_id"], []).append(sid)
+    pairs = []
+    for gid, g in enumerate(gold):
+        for sid in rows_of_doc.get(g["doc_id"], []):
+            shared = len(g["tokens"] & system[sid]["tokens"])
+            if shared:
+                pairs.append((gid, sid, shared, baseline.dice_coefficient(g["tokens"], system[sid]["tokens"])))
+    return pairs
+
+
+@pytest.mark.parametrize("threshold", [0.0, 0.5])
+def test_overlap_matching_matches_brute_force(pair, threshold):
+    gold_json, sys_json = load_json(pair[0]), load_json(pair[1])
+    gold = parse_events(gold_json)
+    system = parse_events(sys_json, vocabs=gold.vocabs)
+    pairs = _brute_force(gold_json, sys_json)
+    expected = greedy_match([(gid, sid, dice) for gid, sid, _, dice in pairs], threshold)
+    assert mention_mapping(gold, system, threshold, matching="overlap") == expected
+    assert mention_mapping(gold, system, threshold, matching="overlap", index=GoldIndex(gold)) == expected
+
+
+def test_overlap_candidates_and_index(pair):
+    gold_json, sys_json = load_json(pair[0]), load_json(pair[1])
+    gold = parse_events(gold_json)
+    system = parse_events(sys_json, vocabs=gold.vocabs)
+    expected = [(gid, sid, shared) for gid, sid, shared, _ in _brute_force(gold_json, sys_json)]
+    for gids, sids, shared in (overlap_candidates(gold, system), GoldIndex(gold).overlaps(system)):
+        assert list(zip(gids.tolist(), sids.tolist(), shared.tolist())) == expected
+
+
+def test_index_ignores_codes_interned_after_it():
+    paragraph = {"event_mentions": [{"id": "e1", "trigger": {"text": "tăng giá"}, "event_type": "A",
+                                     "event_subtype": "s", "factuality": {"modality": "M", "polarity": "P"}}]}
+    gold = parse_events({"p1": paragraph})
+    index = GoldIndex(gold)
+    # Same tokens in an unknown document, and new tokens in the known one: no candidate
+    system = parse_events({"p2": paragraph, "p1": {"event_mentions": [
+        {**paragraph["event_mentions"][0], "trigger": {"text": "giảm lãi"}}]}}, vocabs=gold.vocabs)
+    gids, _, _ = index.overlaps(system)
+    assert len(gids) == 0
@@ -0,0 +1,51 @@
+#tests/test_metrics.py
+# -------------------------------------------------------------
+"""The columnar scorer against the original dict-based one (``tests/baseline.py``)."""
+import pytest
+
+from src.core.metrics_v2 import evaluate, evaluate_tables, mention_mapping, parse_events
+from src.core.utils import load_json
+from tests import baseline
+
+
+@pytest.mark.parametrize("threshold", [0.0, 0.5])
+def test_mapping_matches_algorithm_1(pair, threshold):
+    gold_json, sys_json = load_json(pair[0]), load_json(pair[1])
+    gold = parse_events(gold_json)
+    system = parse_events(sys_json, vocabs=gold.vocabs)
+    expected = baseline.mention_mapping(baseline.parse_events(gold_json), baseline.parse_events(sys_json), threshold)
+    # Same gold ids, same system ids in the same order (tie order included), same scores
+    assert mention_mapping(gold, system, threshold) == expected
+
+
+@pytest.mark.parametrize("threshold", [0.0, 0.5])
+def test_evaluate_matches_baseline(pair, threshold):
+    expected = baseline.evaluate(load_json(pair[0]), load_json(pair[1]), threshold)
+    results = evaluate(str(pair[0]), str(pair[1]), threshold=threshold, cache_dir=None)
+    assert {name: results[name] for name in expected} == expected
+    assert evaluate(str(pair[0]), str(pair[1]), threshold=threshold, stream=True, cache_dir=None) == results
+
+
+def test_evaluate_with_cache(pair, tmp_path):
+    uncached = evaluate(str(pair[0]), str(pair[1]), cache_dir=None)
+    assert evaluate(str(pair[0]), str(pair[1]), cache_dir=str(tmp_path)) == uncached
+    assert evaluate(str(pair[0]), str(pair[1]), cache_dir=str(tmp_path)) == uncached  # served from the cache
+
+
+def _paragraph(*mentions):
+    return {"event_mentions": [
+        {"id": event_id, "trigger": {"text": text}, "event_type": event_type, "event_subtype": "s",
+         "factuality": {"modality": "ASSERTED", "polarity": "POSITIVE"}}
+        for event_id, text, event_type in mentions
+    ]}
+
+
+def test_ties_keep_the_original_order():
+    # Every candidate pair scores the same: the first listed wins, as with max() over the score list
+    gold_json = {"p1": _paragraph(("e1", "tăng giá", "A"), ("e1", "tăng giá", "B"))}
+    sys_json = {"p1": _paragraph(("e1", "tăng giá", "B"), ("e1", "tăng giá", "A"), ("e1", "tăng giá", "A"))}
+    gold = parse_events(gold_json)
+    system = parse_events(sys_json, vocabs=gold.vocabs)
+    expected = baseline.mention_mapping(baseline.parse_events(gold_json), baseline.parse_events(sys_json), 0.0)
+    assert mention_mapping(gold, system, 0.0) == expected == {0: [(0, 1.0), (1, 1.0), (2, 1.0)]}
+    assert evaluate_tables(gold, system)["Type_Accuracy"] == baseline.evaluate(gold_json, sys_json)["Type_Accuracy"]
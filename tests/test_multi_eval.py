@@ -0,0 +1,33 @@
+#tests/test_multi_eval.py
+# -------------------------------------------------------------
+"""Multi-system evaluation: pooled vs in-process runs, and each system vs a standalone ``evaluate``."""
+import pytest
+
+from src.core.metrics_v2 import evaluate
+from src.core.multi_eval import evaluate_systems
+from tests.conftest import PAIRS
+
+GOLD_PATH = PAIRS[1][0]
+SYSTEM_PATHS = [sys_path for gold_path, sys_path in PAIRS if gold_path == GOLD_PATH]  # agentA, agentB
+OPTIONS = {"arguments": True, "coreference": True}
+
+
+def _outcome(report):
+    """A system report without its timings."""
+    return {key: value for key, value in report.items() if key not in ("phases", "seconds")}
+
+
+@pytest.mark.parametrize("matching", ["id", "overlap"])
+def test_pooled_run_matches_in_process_and_evaluate(matching):
+    in_process = evaluate_systems(GOLD_PATH, SYSTEM_PATHS, workers=1, cache_dir=None, matching=matching, **OPTIONS)
+    pooled = evaluate_systems(GOLD_PATH, SYSTEM_PATHS, workers=2, cache_dir=None, matching=matching, **OPTIONS)
+    assert in_process["workers"] == 1 and pooled["workers"] == 2
+    assert list(pooled["systems"]) == list(in_process["systems"]) == ["agentA", "agentB"]
+    for name, report in in_process["systems"].items():
+        assert _outcome(pooled["systems"][name]) == _outcome(report)
+
+    for path, report in zip(SYSTEM_PATHS, in_process["systems"].values()):
+        expected = evaluate(str(GOLD_PATH), str(path), cache_dir=None, breakdown=True, matching=matching, **OPTIONS)
+        assert report["per_type"] == expected.pop("Per_Type")
+        assert report["per_document"] == expected.pop("Per_Document")
+        assert report["results"] == expected
@@ -0,0 +1,41 @@
+#tests/test_qc.py
+# -------------------------------------------------------------
+"""QC sampling: ``run-batches`` and ``qc-sample`` pick the same paragraphs."""
+import shutil
+
+import pytest
+
+from src.core.cli import main
+from src.core.qc import qc_budget
+from src.core.utils import load_json
+from tests.conftest import DATA, ROOT
+
+BATCH = "tokenized_data_500"
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """A copy of the batch's annotator files and the config, as the working directory."""
+    for agent in ("agentA", "agentB"):
+        (tmp_path / f"data/processed/{agent}").mkdir(parents=True)
+        shutil.copy(DATA / f"processed/{agent}/{BATCH}.json", tmp_path / f"data/processed/{agent}")
+    shutil.copytree(ROOT / "config", tmp_path / "config")
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.mark.parametrize("n, expected", [(0, 1), (9, 1), (10, 1), (19, 1), (500, 50), (1000, 100), (1234, 123)])
+def test_budget_is_a_tenth(n, expected):
+    assert qc_budget(n) == expected == max(1, n // 10)
+
+
+@pytest.mark.parametrize("mode, strata", [("worst", "event_type"), ("stratified", "event_type"),
+                                          ("stratified", "prefix")])
+def test_run_batches_and_qc_sample_select_the_same_pids(workdir, mode, strata):
+    main(["qc-sample", "--batch", BATCH, "--mode", mode, "--strata", strata])
+    sampled = list(load_json(workdir / f"data/processed/human/{BATCH}_sample.json"))
+    main(["run-batches", "--batches", BATCH, "--workers", "1", "--mode", mode, "--strata", strata,
+          "--out", str(workdir / "report.json")])
+    qc = load_json(workdir / "report.json")["batches"][BATCH]["qc"]
+    assert qc["budget"] == len(sampled) == 50 and qc["mode"] == mode
+    assert qc["pids"] == sampled
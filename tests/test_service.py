@@ -0,0 +1,92 @@
+#tests/test_service.py
+# -------------------------------------------------------------
+"""The evaluation service over HTTP, on a free localhost port."""
+import copy
+import threading
+
+import pytest
+
+from src.core.event_store import build_table
+from src.core.metrics_v2 import evaluate_tables
+from src.core.service import EvaluationState, call, make_server
+from src.core.utils import load_json
+from tests.conftest import DATA, GOLD, ROOT
+
+
+@pytest.fixture(scope="module")
+def service():
+    state = EvaluationState(ROOT / "config/pipeline.yaml", GOLD)
+    server = make_server(state, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield state, "http://%s:%d" % server.server_address[:2]
+    server.shutdown()
+    server.server_close()
+
+
+def test_health(service):
+    state, url = service
+    health = call("/health", url=url)
+    assert health["gold_paragraphs"] == len(load_json(GOLD)) and health["gold_events"] == len(state.table)
+
+
+def test_evaluate_scores_against_the_same_pids(service):
+    state, url = service
+    gold = load_json(GOLD)
+    system = load_json(DATA / "processed/agentB/tokenized_data_1000.json")
+    system = {**{pid: system[pid] for pid in list(system)[:20]}, **{pid: gold[pid] for pid in list(gold)[:10]}}
+    vocab_sizes = {field: len(vocab) for field, vocab in state.table.vocabs.items()}
+
+    result = call("/evaluate", {"system": system, "errors": True}, url=url)
+    expected_gold = build_table({pid: doc for pid, doc in gold.items() if pid in system})
+    expected = evaluate_tables(expected_gold, build_table(system, vocabs=expected_gold.vocabs), errors=True)
+    assert result["n_gold_paragraphs"] == 10
+    assert {name: result[name] for name in expected if name != "Errors"} == \
+        {name: expected[name] for name in expected if name != "Errors"}
+    # Nothing from the request was interned into the resident gold vocabs
+    assert {field: len(vocab) for field, vocab in state.table.vocabs.items()} == vocab_sizes
+
+
+@pytest.mark.parametrize("endpoint, key", [("/evaluate", "system"), ("/precision", "paragraphs"),
+                                           ("/agreement", "reviewed")])
+@pytest.mark.parametrize("breakage", ["trigger", "text", "factuality", "event_mentions"])
+def test_malformed_paragraphs_are_400(service, endpoint, key, breakage):
+    _, url = service
+    paragraph = copy.deepcopy(next(iter(load_json(GOLD).values())))
+    if breakage == "trigger":
+        del paragraph["event_mentions"][0]["trigger"]
+    elif breakage == "text":
+        del paragraph["event_mentions"][0]["trigger"]["text"]
+    elif breakage == "factuality":
+        paragraph["event_mentions"][0]["factuality"] = {"modality": "ASSERTED"}
+    else:
+        paragraph["event_mentions"] = {"not": "a list"}
+    with pytest.raises(RuntimeError, match="HTTP 400"):
+        call(endpoint, {key: {"p1": paragraph}}, url=url)
+
+
+def test_arguments_without_text_or_role_are_scored(service):
+    _, url = service
+    gold = load_json(GOLD)
+    pid = next(pid for pid, doc in gold.items() if any(m.get("arguments") for m in doc["event_mentions"]))
+    paragraph = copy.deepcopy(gold[pid])
+    for mention in paragraph["event_mentions"]:
+        for arg in mention.get("arguments", []):
+            arg.pop("text", None)
+            arg.pop("role", None)
+    assert call("/evaluate", {"system": {pid: paragraph}, "arguments": True}, url=url)["Span_F1"] == 100.0
+
+
+def test_unknown_scope_is_400(service):
+    _, url = service
+    with pytest.raises(RuntimeError, match="HTTP 400"):
+        call("/evaluate", {"system": {}, "scope": "gold"}, url=url)
+
+
+def test_agreement_without_annotators_fails_the_kappa_gate(service):
+    _, url = service
+    gold = load_json(GOLD)
+    reviewed = {pid: gold[pid] for pid in list(gold)[:5]}
+    metrics = call("/agreement", {"reviewed": reviewed, "batch": "no-such-batch"}, url=url)
+    assert metrics["trigger_kappa"] is None and metrics["passed"] is False
+    assert "trigger_kappa unavailable (need ≥2 annotators)" in metrics["qa_failures"]
@@ -0,0 +1,58 @@
+#tests/test_shards.py
+# -------------------------------------------------------------
+"""Sharded NDJSON files round-trip to the same paragraphs, tables and bytes."""
+from pathlib import Path
+
+import pytest
+
+from src.core.event_store import build_table
+from src.core.gold_store import atomic_write
+from src.core.shards import join, read_shards, shard_files, split, write_shards
+from src.core.utils import load_json, save_json
+from tests.conftest import GOLD, PAIRS
+
+
+@pytest.mark.parametrize("source", [GOLD, PAIRS[-1][0]], ids=lambda p: p.stem)
+@pytest.mark.parametrize("workers", [1, 2])
+def test_split_join_round_trip(source, workers, tmp_path):
+    data = load_json(source)
+    manifest = split(source, tmp_path / "data.shards", n_shards=3, workers=workers)
+    assert manifest["paragraphs"] == len(data) and len(shard_files(tmp_path / "data.shards")) == 3
+    assert list(read_shards(tmp_path / "data.shards", workers=workers).items()) == list(data.items())
+    assert load_json(str(tmp_path / "data.shards")) == data
+
+    join(tmp_path / "data.shards", tmp_path / "joined.json")
+    save_json(data, str(tmp_path / "expected.json"))
+    assert (tmp_path / "joined.json").read_bytes() == (tmp_path / "expected.json").read_bytes()
+
+
+def test_rewrite_never_touches_the_current_shards(tmp_path, monkeypatch):
+    import src.core.shards as shards
+
+    data = load_json(GOLD)
+    write_shards(data, tmp_path / "gold.shards", n_shards=4, workers=1)
+    old = shard_files(tmp_path / "gold.shards")
+    old_bytes = [fp.read_bytes() for fp in old]
+
+    # Until the new manifest is in place, the old one still points at intact shards
+    def check_then_write(fp, write, fsync=True):
+        if Path(fp).name == shards.MANIFEST_NAME:
+            assert shard_files(tmp_path / "gold.shards") == old
+            assert [fp.read_bytes() for fp in old] == old_bytes
+        return atomic_write(fp, write, fsync=fsync)
+
+    monkeypatch.setattr(shards, "atomic_write", check_then_write)
+    write_shards(dict(list(data.items())[:5]), tmp_path / "gold.shards", n_shards=2, workers=1)
+    new = shard_files(tmp_path / "gold.shards")
+    assert not set(new) & set(old) and sorted((tmp_path / "gold.shards").glob("*.ndjson")) == sorted(new)
+    assert list(read_shards(tmp_path / "gold.shards", workers=1)) == list(data)[:5]
+
+
+def test_sharded_table_matches_json(tmp_path):
+    from src.core.shards import build_sharded_table
+
+    source = PAIRS[-1][1]
+    split(source, tmp_path / "system.shards", n_shards=3, workers=1)
+    expected, table = build_table(load_json(source)), build_sharded_table(tmp_path / "system.shards", workers=2)
+    assert table.doc_ids() == expected.doc_ids()
+    assert [table.row(i) for i in range(len(table))] == [expected.row(i) for i in range(len(expected))]
@@ -0,0 +1,32 @@
+#tests/test_significance.py
+# -------------------------------------------------------------
+"""Bootstrap / randomization chunking and point estimates."""
+import pytest
+
+from src.core import significance
+from src.core.metrics_v2 import evaluate, parse_events
+from src.core.utils import load_json
+from tests.conftest import PAIRS
+
+
+@pytest.mark.parametrize("n_resamples, n_docs", [(1000, 50), (1000, 5000), (7, 1 << 21), (0, 10)])
+def test_chunks_are_bounded_by_elements(n_resamples, n_docs):
+    sizes = significance._chunks(n_resamples, n_docs)
+    assert sum(sizes) == n_resamples
+    assert all(size >= 1 and (size == 1 or size * n_docs <= significance.CHUNK_ELEMENTS) for size in sizes)
+
+
+def test_workers_do_not_change_results(monkeypatch):
+    gold_path, sys_a, sys_b = PAIRS[1][0], PAIRS[1][1], PAIRS[2][1]
+    gold = parse_events(load_json(gold_path))
+    systems = {"agentA": parse_events(load_json(sys_a), vocabs=gold.vocabs),
+               "agentB": parse_events(load_json(sys_b), vocabs=gold.vocabs)}
+    monkeypatch.setattr(significance, "CHUNK_ELEMENTS", 64 * 100)  # several chunks on the 50-paragraph batch
+    serial = significance.compare_systems(gold, systems, n_resamples=300, workers=1)
+    parallel = significance.compare_systems(gold, systems, n_resamples=300, workers=2)
+    assert serial == parallel
+
+    for name, path in (("agentA", sys_a), ("agentB", sys_b)):
+        expected = evaluate(str(gold_path), str(path), cache_dir=None)
+        assert {metric: cell["estimate"] for metric, cell in serial["systems"][name].items()} == \
+            {metric: expected[metric] for metric in significance.METRICS}
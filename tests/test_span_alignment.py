@@ -0,0 +1,91 @@
+#tests/test_span_alignment.py
+# -------------------------------------------------------------
+"""Trigger position resolution and position-based scoring (``--positions``)."""
+import numpy as np
+import pytest
+
+from src.core.metrics_v2 import evaluate, evaluate_tables, mention_mapping, parse_events
+from src.core.span_alignment import (IntervalIndex, build_span_table, position_dice, position_dice_many,
+                                     position_scores, resolve_trigger_spans)
+from tests.conftest import PAIRS
+
+
+def _mention(event_id, trigger, event_type="Price"):
+    return {"id": event_id, "trigger": trigger, "event_type": event_type, "event_subtype": "s",
+            "factuality": {"modality": "ASSERTED", "polarity": "POSITIVE"}}
+
+
+def test_resolution_order():
+    paragraph = {"tokens": "giá vàng tăng mạnh rồi giá vàng tăng tiếp".split(), "event_mentions": [
+        _mention("e1", {"text": "tăng"}),
+        _mention("e2", {"text": "tăng"}),                                       # second annotation → second occurrence
+        _mention("e3", {"text": "giá", "extra_trigger_spans": ["tăng"]}),        # extra span after the main one
+        _mention("e4", {"text": "giảm"}),                                       # not in the paragraph
+        _mention("e5", {"text": "vàng", "start": 6, "end": 7}),                 # explicit offsets win
+    ]}
+    assert resolve_trigger_spans(paragraph) == [[(2, 3)], [(7, 8)], [(0, 1), (2, 3)], None, [(6, 7)]]
+    assert resolve_trigger_spans({"event_mentions": [_mention("e1", {"text": "tăng"})]}) == [None]
+
+
+def _pair(gold_trigger, sys_trigger, tokens=None):
+    gold = {"p1": {"event_mentions": [_mention("e1", gold_trigger)]}}
+    system = {"p1": {"event_mentions": [_mention("e1", sys_trigger)]}}
+    if tokens is not None:
+        gold["p1"]["tokens"] = system["p1"]["tokens"] = tokens
+    gold_t = parse_events(gold)
+    sys_t = parse_events(system, vocabs=gold_t.vocabs)
+    return gold_t, sys_t, (build_span_table(gold), build_span_table(system))
+
+
+def test_same_word_elsewhere_is_not_a_match():
+    gold_t, sys_t, spans = _pair({"text": "tăng", "start": 2, "end": 3}, {"text": "tăng", "start": 7, "end": 8})
+    assert mention_mapping(gold_t, sys_t, 0.0) == {0: [(0, 1.0)]}    # token strings agree
+    assert mention_mapping(gold_t, sys_t, 0.0, spans=spans) == {}    # positions do not
+    assert evaluate_tables(gold_t, sys_t, spans=spans)["Span_Recall"] == 0.0
+
+
+def test_repeated_token_overlap():
+    # "tăng ... tăng" as one trigger vs the first "tăng" only: token sets are equal, positions half overlap
+    tokens = "giá tăng rồi lại tăng".split()
+    gold_t, sys_t, spans = _pair({"text": "tăng", "extra_trigger_spans": ["tăng"]}, {"text": "tăng"}, tokens)
+    assert mention_mapping(gold_t, sys_t, 0.0) == {0: [(0, 1.0)]}
+    assert mention_mapping(gold_t, sys_t, 0.0, spans=spans) == {0: [(0, 2 / 3)]}
+
+
+def test_unresolved_side_falls_back_to_token_dice():
+    gold_t, sys_t, spans = _pair({"text": "tăng mạnh", "start": 2, "end": 4}, {"text": "tăng"})
+    assert not spans[1].resolved[0]
+    assert mention_mapping(gold_t, sys_t, 0.0, spans=spans) == mention_mapping(gold_t, sys_t, 0.0) == {0: [(0, 2 / 3)]}
+
+
+def test_position_scores_match_scalar_dice():
+    rng = np.random.default_rng(0)
+    paragraph = {"event_mentions": []}
+    for i in range(40):
+        start = int(rng.integers(0, 30))
+        extra = [{"start": start + 5, "end": start + 7}] if i % 3 == 0 else []
+        paragraph["event_mentions"].append(
+            _mention(f"e{i}", {"text": "x", "start": start, "end": start + int(rng.integers(1, 4)),
+                               "extra_trigger_spans": extra}))
+    table = build_span_table({"p1": paragraph})
+    gids, sids = np.repeat(np.arange(40), 40), np.tile(np.arange(40), 40)
+    expected = [position_dice(table.positions_of(g), table.positions_of(s)) for g, s in zip(gids, sids)]
+    assert position_dice_many(table, table, gids, sids) == pytest.approx(expected)
+    scores = position_scores(table, table, gids, sids)
+    assert scores[gids == sids] == pytest.approx(1.0)
+    assert scores[gids != sids] == pytest.approx(np.array(expected)[gids != sids])
+
+    index = table.index(0)
+    for s, e in [(0, 1), (3, 9), (29, 40), (50, 60)]:
+        brute = sorted({row for row in range(40) for a, b in table.spans(row) if a < e and s < b})
+        assert index.overlapping(s, e).tolist() == brute
+
+
+def test_interval_index_empty():
+    assert IntervalIndex(np.zeros(0, np.int64), np.zeros(0, np.int64), np.zeros(0, np.int64)).overlapping(0, 5).size == 0
+
+
+def test_positions_change_nothing_on_shipped_files():
+    # The bundled files carry no offsets or paragraph text: every pair keeps the token-set Dice
+    gold, system = PAIRS[1]
+    assert evaluate(str(gold), str(system), positions=True, cache_dir=None) == evaluate(str(gold), str(system), cache_dir=None)